@@ -5,7 +5,7 @@ For production deployment, use WSGI server (Gunicorn) instead.
 """
 
 import os
-from app import create_app, db
+from app import create_app, init_db
 
 # Determine configuration environment from .env file
 config_name = os.environ.get('FLASK_ENV', 'development')
@@ -14,12 +14,12 @@ config_name = os.environ.get('FLASK_ENV', 'development')
 app = create_app(config_name)
 
 if __name__ == '__main__':
-    # Ensure database tables are created
+    # Create/migrate the tables and seed sample data (workers run `flask init-db` once instead)
     with app.app_context():
-        db.create_all()
+        init_db()
     
     # Run development server
-    # In production, use: gunicorn -w 4 -b 0.0.0.0:5000 app:app
+    # In production, use: flask --app app init-db && gunicorn -w 4 -b 0.0.0.0:5000 app:app
     app.run(
         host='0.0.0.0',      # Allow external connections
         port=5000,           # Default Flask port
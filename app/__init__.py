@@ -11,8 +11,10 @@ import logging
 from logging.handlers import RotatingFileHandler
 import os
 
+from app.routing_session import RoutingSession
+
 # Initialize extensions (without binding to app yet)
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 
 
@@ -42,6 +44,14 @@ def create_app(config_name='default'):
     db.init_app(app)
     login_manager.init_app(app)
     
+    # SQLite PRAGMA profile (WAL, busy timeout, mmap) on every new connection
+    from app.utils.engine_profile import configure_engines
+    configure_engines(app)
+    
+    # Read-only replica connections and read-your-writes pinning (if replicas are configured)
+    from app.utils.replicas import register_replicas
+    register_replicas(app)
+    
     # Configure Flask-Login
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -51,6 +61,30 @@ def create_app(config_name='default'):
     from app.models.user import User
     from app.models.incident import Incident
     
+    # Keep the duplicate-detection indexes in sync with incident writes
+    from app.utils.token_index import register_index_listeners
+    from app.utils.lsh_index import register_lsh_listeners
+    register_index_listeners()
+    register_lsh_listeners()
+    
+    # Keep the dashboard counters in step with incident writes
+    from app.utils.incident_counters import register_counter_listeners
+    register_counter_listeners()
+    
+    # Invalidate cached dashboard data on incident, audit log and user writes
+    from app.utils.response_cache import register_generation_listeners, register_response_cache
+    register_generation_listeners()
+    register_response_cache(app)
+    
+    # Importing the FTS5 module registers its create/drop hooks on the incidents table
+    from app.utils.fts_index import FullTextIndex  # noqa: F401
+    
+    # Priority and routing rules are loaded from a data file and hot-reloaded
+    # (checked once per request, so triage calls themselves never stat the file)
+    from app.utils.triage_rules import check_rules, configure_rules
+    configure_rules(app.config['TRIAGE_RULES_PATH'], app.config['TRIAGE_RULES_RELOAD_INTERVAL'])
+    app.before_request(check_rules)
+    
     # User loader for Flask-Login
     @login_manager.user_loader
     def load_user(user_id):
@@ -66,13 +100,24 @@ def create_app(config_name='default'):
     # Register error handlers
     register_error_handlers(app)
     
+    # Per-request SQL, template and latency instrumentation (opt-in)
+    from app.utils.request_metrics import register_request_metrics
+    register_request_metrics(app)
+    
+    # Prometheus metrics for /metrics
+    if app.config.get('METRICS_ENABLED'):
+        from app.utils.metrics import register_metrics
+        register_metrics(app)
+    
     # Configure logging
     configure_logging(app)
     
-    # Create database tables and seed data
-    with app.app_context():
-        db.create_all()
-        initialize_database()
+    # Schema creation, migrations and seeding run from `flask init-db`; the
+    # factory itself never touches the database, so workers start quickly
+    register_commands(app)
+    if app.config.get('INIT_DB_ON_STARTUP'):
+        with app.app_context():
+            init_db()
     
     app.logger.info('Incident Management System startup complete')
     
@@ -100,6 +145,38 @@ def register_error_handlers(app):
         return f"<h1>500 Internal Server Error</h1><p>Something went wrong.</p>", 500
 
 
+def register_commands(app):
+    """Register the application's CLI commands."""
+    import click
+    
+    @app.cli.command('init-db')
+    @click.option('--no-seed', is_flag=True, help='Create and migrate the schema without sample data.')
+    def init_db_command(no_seed):
+        """Create the database tables, apply migrations and seed sample data."""
+        applied = init_db(seed=not no_seed)
+        click.echo(f"✅ Database ready ({len(applied)} migration(s) applied)")
+
+
+def init_db(seed=True):
+    """
+    Create missing tables, apply pending migrations and seed an empty database.
+    
+    Args:
+        seed (bool): Add the sample users and incidents if there are no users
+    
+    Returns:
+        list: Names of the migrations applied
+    """
+    from app.utils.migrations import upgrade
+    
+    # Primary only: replica binds are copies synced from it
+    db.create_all(bind_key=None)
+    applied = upgrade()
+    if seed:
+        initialize_database()
+    return applied
+
+
 def configure_logging(app):
     """Configure application logging for audit trail and debugging."""
     
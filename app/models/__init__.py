@@ -6,5 +6,10 @@ Imports all models for easy access.
 from app.models.user import User
 from app.models.incident import Incident
 from app.models.audit_log import AuditLog
+from app.models.incident_token import IncidentToken
+from app.models.incident_lsh_bucket import IncidentLshBucket
+from app.models.incident_counter import IncidentCounter
+from app.models.data_generation import DataGeneration
 
-__all__ = ['User', 'Incident', 'AuditLog']
\ No newline at end of file
+__all__ = ['User', 'Incident', 'AuditLog', 'IncidentToken', 'IncidentLshBucket', 'IncidentCounter',
+           'DataGeneration']
\ No newline at end of file
@@ -14,6 +14,11 @@ class AuditLog(db.Model):
     """
     
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        # Audit log page (newest first) and per-incident history lookups
+        db.Index('ix_audit_logs_changed_at_id', 'changed_at', 'id'),
+        db.Index('ix_audit_logs_incident_changed_at', 'incident_id', 'changed_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
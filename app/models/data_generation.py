@@ -0,0 +1,22 @@
+"""
+Data generation model for the versioned response cache.
+Holds one row per cached data set with a number that changes on every write.
+"""
+
+from app import db
+
+
+class DataGeneration(db.Model):
+    """
+    Generation number of one data set (e.g. 'incidents').
+    Bumped automatically by app.utils.response_cache on every flush that
+    writes the data set, in the same transaction as the change.
+    """
+
+    __tablename__ = 'data_generations'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f'<DataGeneration {self.name}: {self.value}>'
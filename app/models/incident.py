@@ -5,11 +5,23 @@ Stores incident details with foreign key to User (creator).
 
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 class Incident(db.Model):
     """Incident model for helpline support tickets."""
     
     __tablename__ = 'incidents'
+    __table_args__ = (
+        # Keyset pagination of the incident list: ORDER BY created_at, id
+        # optionally filtered by one equality column (see app.utils.pagination)
+        db.Index('ix_incidents_created_id', 'created_at', 'id'),
+        db.Index('ix_incidents_priority_created_id', 'priority', 'created_at', 'id'),
+        db.Index('ix_incidents_status_created_id', 'status', 'created_at', 'id'),
+        db.Index('ix_incidents_platform_created_id', 'platform', 'created_at', 'id'),
+        db.Index('ix_incidents_team_created_id', 'assigned_team', 'created_at', 'id'),
+        # Open incidents on one platform (duplicate detection full scans)
+        db.Index('ix_incidents_platform_status_created', 'platform', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -25,6 +37,12 @@ class Incident(db.Model):
     predicted_team = db.Column(db.String(50), nullable=False)
     duplicate_flag = db.Column(db.Boolean, default=False, nullable=False)
     duplicate_score = db.Column(db.Float, nullable=True)  # Optional: highest similarity score
+    minhash_signature = db.Column(db.LargeBinary, nullable=True)  # Packed MinHasher signature
+    
+    # ===== Cached NLP representation (space-separated TextProcessor tokens) =====
+    # Written whenever title/description change, so duplicate scoring never re-tokenises
+    title_tokens = db.Column(db.Text, nullable=True)
+    description_tokens = db.Column(db.Text, nullable=True)
     
     # ===== Classification =====
     priority = db.Column(db.String(10), nullable=False)  # High, Medium, Low
@@ -35,6 +53,9 @@ class Incident(db.Model):
     
     status = db.Column(db.String(20), default='Open', nullable=False)  # Open, In Progress, Resolved
     
+    # Near-duplicate cluster (lowest incident id in the cluster), set by cluster_incidents.py
+    cluster_id = db.Column(db.Integer, nullable=True, index=True)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -43,5 +64,52 @@ class Incident(db.Model):
     # Foreign key to user who created the incident
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
+    # Inverted index postings (maintained by app.utils.token_index)
+    index_tokens = db.relationship(
+        'IncidentToken',
+        backref='incident',
+        cascade='all, delete-orphan'
+    )
+    lsh_buckets = db.relationship(
+        'IncidentLshBucket',
+        backref='incident',
+        cascade='all, delete-orphan'
+    )
+    
     def __repr__(self):
-        return f'<Incident {self.id}: {self.title[:30]}>'
\ No newline at end of file
+        return f'<Incident {self.id}: {self.title[:30]}>'
+    
+    @staticmethod
+    def tokenise(text):
+        """Preprocess text into the space-separated form stored in *_tokens columns."""
+        # Imported here to avoid a circular import through app.utils
+        from app.utils.text_processor import TextProcessor
+        return ' '.join(TextProcessor.preprocess_text(text or ''))
+    
+    @property
+    def title_token_list(self):
+        """Preprocessed title tokens, from the cached column when available."""
+        if self.title_tokens is None:
+            return Incident.tokenise(self.title).split()  # Row not backfilled yet
+        return self.title_tokens.split()
+    
+    @property
+    def description_token_list(self):
+        """Preprocessed description tokens, from the cached column when available."""
+        if self.description_tokens is None:
+            return Incident.tokenise(self.description).split()  # Row not backfilled yet
+        return self.description_tokens.split()
+
+
+@event.listens_for(Incident.title, 'set')
+def _retokenise_title(target, value, oldvalue, initiator):
+    """Refresh the cached title tokens only when the title text actually changes."""
+    if value != oldvalue or target.title_tokens is None:
+        target.title_tokens = Incident.tokenise(value)
+
+
+@event.listens_for(Incident.description, 'set')
+def _retokenise_description(target, value, oldvalue, initiator):
+    """Refresh the cached description tokens only when the description text actually changes."""
+    if value != oldvalue or target.description_tokens is None:
+        target.description_tokens = Incident.tokenise(value)
@@ -0,0 +1,26 @@
+"""
+Materialised incident counters for dashboards and filter badges.
+Holds one row per (priority, status, platform, assigned_team) combination.
+"""
+
+from app import db
+
+
+class IncidentCounter(db.Model):
+    """
+    Number of incidents with one combination of the counted fields.
+    Rows are maintained automatically by app.utils.incident_counters on every
+    flush, in the same transaction as the incident change.
+    """
+
+    __tablename__ = 'incident_counters'
+
+    priority = db.Column(db.String(10), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    platform = db.Column(db.String(50), primary_key=True)
+    assigned_team = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (f'<IncidentCounter {self.priority}/{self.status}/{self.platform}/'
+                f'{self.assigned_team}: {self.count}>')
@@ -0,0 +1,26 @@
+"""
+LSH bucket model for MinHash near-duplicate detection.
+Each open incident has one row per signature band.
+"""
+
+from app import db
+
+
+class IncidentLshBucket(db.Model):
+    """
+    One (band bucket, incident) entry in the locality-sensitive hash table.
+    Rows are maintained automatically by app.utils.lsh_index on every flush.
+    """
+
+    __tablename__ = 'incident_lsh_buckets'
+    __table_args__ = (
+        db.Index('ix_incident_lsh_buckets_bucket_incident', 'bucket', 'incident_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Band number and band hash packed into one integer (see MinHasher.band_keys)
+    bucket = db.Column(db.BigInteger, nullable=False)
+    incident_id = db.Column(db.Integer, db.ForeignKey('incidents.id'), nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IncidentLshBucket {self.bucket} -> Incident #{self.incident_id}>'
@@ -0,0 +1,26 @@
+"""
+Inverted token index model for duplicate detection.
+Maps each preprocessed token to the open incidents that contain it.
+"""
+
+from app import db
+
+
+class IncidentToken(db.Model):
+    """
+    One (token, incident) posting in the inverted index.
+    Rows are maintained automatically by app.utils.token_index on every flush.
+    """
+
+    __tablename__ = 'incident_tokens'
+    __table_args__ = (
+        # Covers the candidate lookup: WHERE token IN (...) GROUP BY incident_id
+        db.Index('ix_incident_tokens_token_incident', 'token', 'incident_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(100), nullable=False)
+    incident_id = db.Column(db.Integer, db.ForeignKey('incidents.id'), nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<IncidentToken {self.token!r} -> Incident #{self.incident_id}>'
@@ -3,60 +3,201 @@ Incident management routes (CRUD operations).
 Handles incident creation, viewing, editing, and deletion.
 """
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
 from app import db
 from app.models.incident import Incident
 from app.utils.decorators import admin_required
+from app.utils.replicas import read_replica
 
 bp = Blueprint('incidents', __name__, url_prefix='/incidents')
 
 
+def _triage_form(form):
+    """
+    Predict priority and team for a submitted incident form.
+
+    Records the triage latency for /metrics once per request, keeping the
+    histogram out of triage_incident itself.
+
+    Returns:
+        tuple: (priority, team)
+    """
+    from time import perf_counter
+    from app.utils.classifier import triage_incident
+    from app.utils.metrics import TRIAGE_LATENCY
+    
+    started = perf_counter()
+    result = triage_incident(
+        platform=form.platform.data,
+        journey=form.journey.data,
+        clients_affected=form.clients_affected.data,
+        description=form.description.data
+    )
+    TRIAGE_LATENCY.observe(perf_counter() - started, 'triage_incident')
+    return result
+
+
 @bp.route('/')
 @bp.route('/list')
 @login_required
+@read_replica
 def list_incidents():
     """
-    Display list of all incidents with optional filtering.
+    Display one page of incidents, newest first, with optional filtering.
+    Uses keyset pagination on (created_at, id), so every page costs the same.
     Accessible to all authenticated users.
     """
-    # Get filter parameter from URL (e.g., ?priority=High)
-    priority_filter = request.args.get('priority', None)
-    
-    # Query incidents
-    if priority_filter:
-        incidents = Incident.query.filter_by(priority=priority_filter).order_by(
-            Incident.created_at.desc()
-        ).all()
-    else:
-        incidents = Incident.query.order_by(Incident.created_at.desc()).all()
-    
-    # Get count by priority for filter badges
-    high_count = Incident.query.filter_by(priority='High').count()
-    medium_count = Incident.query.filter_by(priority='Medium').count()
-    low_count = Incident.query.filter_by(priority='Low').count()
+    from flask import current_app
+    from app.utils.pagination import incident_filters, paginate_incidents
+    from app.utils.response_cache import cached
+    from app.utils.stats import get_incident_stats
+    
+    # Get filters from URL (e.g., ?priority=High&status=Open&date_from=2025-01-01)
+    filters, criteria = incident_filters(request.args)
+    
+    # Fetch a single page seeking from the cursor
+    page = paginate_incidents(
+        Incident.query.filter(*criteria),
+        per_page=current_app.config['INCIDENTS_PER_PAGE'],
+        after=request.args.get('after'),
+        before=request.args.get('before')
+    )
+    
+    # Get count by priority for filter badges (one grouped query, cached until the next write)
+    stats = cached('incident_stats', get_incident_stats)
     
     return render_template(
         'incidents/list.html',
-        incidents=incidents,
-        priority_filter=priority_filter,
-        high_count=high_count,
-        medium_count=medium_count,
-        low_count=low_count,
+        incidents=page.items,
+        page=page,
+        filters=filters,
+        priority_filter=filters.get('priority'),
+        high_count=stats.high,
+        medium_count=stats.medium,
+        low_count=stats.low,
         title='All Incidents'
     )
 
 
+@bp.route('/search')
+@login_required
+def search_incidents():
+    """
+    Full-text search over incident titles and descriptions.
+    Uses the SQLite FTS5 index, or LIKE matching when FTS5 is unavailable.
+    """
+    from flask import current_app
+    from app.utils.fts_index import FullTextIndex
+    
+    query = request.args.get('q', '').strip()
+    platform_filter = request.args.get('platform', None)
+    
+    incidents = FullTextIndex.search(
+        query,
+        platform=platform_filter,
+        limit=current_app.config['SEARCH_RESULTS_LIMIT']
+    ) if query else []
+    
+    return render_template(
+        'incidents/search.html',
+        incidents=incidents,
+        query=query,
+        platform_filter=platform_filter,
+        limit=current_app.config['SEARCH_RESULTS_LIMIT'],
+        title='Search Incidents'
+    )
+
+
+@bp.route('/duplicates/suggest', methods=['POST'])
+@login_required
+@read_replica
+def suggest_duplicates():
+    """
+    Open incidents resembling the incident being typed, as JSON.
+    Called by the create form after each pause in typing. POST because a
+    full description does not fit in a request line.
+    
+    Request body: {"title", "description", "platform"}
+    """
+    from app.utils.duplicate_suggestions import suggest_duplicates as run_suggest_duplicates
+    
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    
+    platform = payload.get('platform')
+    if platform not in ('Additiv', 'Avaloq'):
+        return jsonify({'error': 'Expected platform Additiv or Avaloq'}), 400
+    title = payload.get('title', '')
+    description = payload.get('description', '')
+    if not isinstance(title, str) or not isinstance(description, str):
+        return jsonify({'error': 'title and description must be strings'}), 400
+    
+    # Same length limits as the create form
+    result = run_suggest_duplicates(title[:200], description[:2000], platform)
+    
+    return jsonify({
+        'partial': result['partial'],
+        'suggestions': [
+            {
+                'id': incident_id,
+                'title': incident_title,
+                'similarity': round(score, 3),
+                'url': url_for('incidents.view_incident', id=incident_id)
+            }
+            for incident_id, incident_title, score in result['matches']
+        ]
+    })
+
+
+@bp.route('/triage/batch', methods=['POST'])
+@login_required
+def triage_batch():
+    """
+    Predict priority and team for many incidents in one JSON request.
+    Nothing is stored; used to re-triage backlogs after rule changes.
+    
+    Request body: {"incidents": [{"platform", "journey", "clients_affected", "description"}, ...]}
+    """
+    from flask import current_app
+    from app.utils.batch_triage import triage_batch as run_triage_batch
+    
+    payload = request.get_json(silent=True) or {}
+    rows = payload.get('incidents')
+    if not isinstance(rows, list):
+        return jsonify({'error': 'Expected a JSON object with an "incidents" list'}), 400
+    
+    max_rows = current_app.config['TRIAGE_BATCH_MAX_ROWS']
+    if len(rows) > max_rows:
+        return jsonify({'error': f'At most {max_rows} incidents per request'}), 400
+    if not all(isinstance(row, dict) for row in rows):
+        return jsonify({'error': 'Each incident must be a JSON object'}), 400
+    
+    try:
+        results = run_triage_batch(rows)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'count': len(results), 'results': results})
+
+
 @bp.route('/<int:id>')
 @login_required
+@read_replica
 def view_incident(id):
     """
     View detailed information about a specific incident.
     Accessible to all authenticated users.
     """
     from flask_wtf import FlaskForm
+    from sqlalchemy.orm import joinedload
+    from app.models.user import User
     
-    incident = Incident.query.get_or_404(id)
+    # Join the creator in the same query (the template shows their username)
+    incident = Incident.query.options(
+        joinedload(Incident.creator).load_only(User.id, User.username)
+    ).filter_by(id=id).first_or_404()
     form = FlaskForm()  # Create empty form just for CSRF token
     
     return render_template(
@@ -74,42 +215,41 @@ def create_incident():
     Checks for potential duplicates before creation.
     """
     from app.forms.incident_forms import IncidentForm
-    from app.utils.classifier import predict_priority
-    from app.utils.router import assign_team
     from app.utils.duplicate_detector import DuplicateDetector
+    from app.utils.duplicate_tokens import recall_duplicate_check, remember_duplicate_check
     
     form = IncidentForm()
     
     # Check for duplicates on form submission
     duplicates = None
+    duplicate_token = None
     if form.validate_on_submit():
-        # Check for similar existing incidents
-        duplicate_check = DuplicateDetector.check_for_duplicates(
-            title=form.title.data,
-            description=form.description.data,
-            platform=form.platform.data,
-            threshold=0.50
-        )
+        confirmed = request.form.get('confirm_create') == 'yes'
+        
+        # On confirmation, reuse the check behind the warning if nothing has changed since
+        duplicate_check = recall_duplicate_check(
+            request.form.get('duplicate_token'),
+            form.title.data, form.description.data, form.platform.data
+        ) if confirmed else None
+        
+        if duplicate_check is None:
+            # Check for similar existing incidents
+            duplicate_check = DuplicateDetector.check_for_duplicates(
+                title=form.title.data,
+                description=form.description.data,
+                platform=form.platform.data,
+                threshold=0.50
+            )
         
         # If duplicates found, show warning but allow creation
         if duplicate_check['is_duplicate']:
             duplicates = duplicate_check['similar_incidents']
             
             # If user confirmed creation despite warning
-            if request.form.get('confirm_create') == 'yes':
+            if confirmed:
                 # Proceed with creation
-                predicted_priority = predict_priority(
-                    platform=form.platform.data,
-                    journey=form.journey.data,
-                    clients_affected=form.clients_affected.data,
-                    description=form.description.data
-                )
-                
-                assigned_team = assign_team(
-                    platform=form.platform.data,
-                    journey=form.journey.data,
-                    description=form.description.data
-                )
+                # Keywords are only scanned if a priority or routing rule needs them
+                predicted_priority, assigned_team = _triage_form(form)
 
                 duplicate_flag = duplicate_check['is_duplicate']
                 duplicate_score = duplicate_check['similar_incidents'][0][1] if duplicate_flag and len(duplicate_check['similar_incidents']) > 0 else None
@@ -141,21 +281,14 @@ def create_incident():
             
             # Show duplicate warning (will render the form with warnings)
             flash('Potential duplicate incidents detected. Please review before creating.', 'warning')
+            duplicate_token = remember_duplicate_check(
+                duplicate_check, form.title.data, form.description.data, form.platform.data
+            )
         
         else:
             # No duplicates - create incident immediately
-            predicted_priority = predict_priority(
-                platform=form.platform.data,
-                journey=form.journey.data,
-                clients_affected=form.clients_affected.data,
-                description=form.description.data
-            )
-            
-            assigned_team = assign_team(
-                platform=form.platform.data,
-                journey=form.journey.data,
-                description=form.description.data
-            )
+            # Keywords are only scanned if a priority or routing rule needs them
+            predicted_priority, assigned_team = _triage_form(form)
             
             incident = Incident(
                 title=form.title.data,
@@ -186,6 +319,7 @@ def create_incident():
         'incidents/create.html',
         form=form,
         duplicates=duplicates,
+        duplicate_token=duplicate_token,
         title='Create New Incident'
     )
 
@@ -197,8 +331,6 @@ def edit_incident(id):
     Users can edit their own incidents, admins can edit any incident.
     """
     from app.forms.incident_forms import IncidentForm
-    from app.utils.classifier import predict_priority
-    from app.utils.router import assign_team
     
     incident = Incident.query.get_or_404(id)
     
@@ -218,18 +350,7 @@ def edit_incident(id):
         incident.description = form.description.data
         
         # Recalculate priority and team based on updated data
-        incident.priority = predict_priority(
-            platform=form.platform.data,
-            journey=form.journey.data,
-            clients_affected=form.clients_affected.data,
-            description=form.description.data
-        )
-        
-        incident.assigned_team = assign_team(
-            platform=form.platform.data,
-            journey=form.journey.data,
-            description=form.description.data
-        )
+        incident.priority, incident.assigned_team = _triage_form(form)
         
         db.session.commit()
         
@@ -340,18 +461,30 @@ def override_incident(id):
 @bp.route('/audit-log')
 @login_required
 @admin_required
+@read_replica
 def audit_log():
     """
-    View audit log of all override actions (admin only).
+    View audit log of all override actions (admin only), one page at a time.
     Provides governance and traceability.
     """
+    from flask import current_app
+    from sqlalchemy.orm import joinedload
     from app.models.audit_log import AuditLog
+    from app.models.user import User
+    from app.utils.pagination import paginate_keyset
     
-    # Get all audit logs, newest first
-    logs = AuditLog.query.order_by(AuditLog.changed_at.desc()).all()
+    # One page of audit logs, newest first, with each admin's username joined in
+    page = paginate_keyset(
+        AuditLog.query.options(joinedload(AuditLog.changed_by).load_only(User.id, User.username)),
+        AuditLog.changed_at, AuditLog.id,
+        per_page=current_app.config['AUDIT_LOG_PER_PAGE'],
+        after=request.args.get('after'),
+        before=request.args.get('before')
+    )
     
     return render_template(
         'incidents/audit_log.html',
-        logs=logs,
+        logs=page.items,
+        page=page,
         title='Audit Log - Override History'
     )
\ No newline at end of file
@@ -2,8 +2,11 @@
 Main application routes (homepage, dashboard, admin).
 """
 
-from flask import Blueprint, render_template, abort
+import hmac
+
+from flask import Blueprint, Response, current_app, render_template, request, abort
 from flask_login import login_required, current_user
+from app.utils.replicas import read_replica
 
 bp = Blueprint('main', __name__)
 
@@ -17,70 +20,77 @@ def index():
 
 @bp.route('/dashboard')
 @login_required
+@read_replica
 def dashboard():
     """User dashboard - requires login."""
-    from app.models.incident import Incident
+    from app.utils.response_cache import cached
+    from app.utils.stats import get_incident_stats
     
-    # Get incident counts by priority
-    total_incidents = Incident.query.count()
-    high_priority = Incident.query.filter_by(priority='High').count()
-    medium_priority = Incident.query.filter_by(priority='Medium').count()
-    low_priority = Incident.query.filter_by(priority='Low').count()
+    # Get incident counts by priority (one grouped query, cached until the next write)
+    stats = cached('incident_stats', get_incident_stats)
     
     return render_template(
         'dashboard.html',
         title='Dashboard',
-        total_incidents=total_incidents,
-        high_priority=high_priority,
-        medium_priority=medium_priority,
-        low_priority=low_priority
+        total_incidents=stats.total,
+        high_priority=stats.high,
+        medium_priority=stats.medium,
+        low_priority=stats.low
     )
 
 @bp.route('/admin')
 @login_required
+@read_replica
 def admin_dashboard():
     """Admin dashboard - requires admin privileges."""
     
     if not current_user.is_admin:
         abort(403)
 
-    from app.models.incident import Incident
-    from app.models.user import User
-    
-    # Get comprehensive statistics for admin
-    total_incidents = Incident.query.count()
-    high_priority = Incident.query.filter_by(priority='High').count()
-    medium_priority = Incident.query.filter_by(priority='Medium').count()
-    low_priority = Incident.query.filter_by(priority='Low').count()
-    
-    # Get status counts
-    open_incidents = Incident.query.filter_by(status='Open').count()
-    in_progress = Incident.query.filter_by(status='In Progress').count()
-    resolved = Incident.query.filter_by(status='Resolved').count()
-    closed = Incident.query.filter_by(status='Closed').count()
+    from app.utils.response_cache import cached
+    from app.utils.stats import get_incident_stats, get_recent_incidents, get_user_stats
     
-    # Get user counts
-    total_users = User.query.count()
-    admin_users = User.query.filter_by(is_admin=True).count()
-    regular_users = User.query.filter_by(is_admin=False).count()
-    
-    # Get recent incidents
-    recent_incidents = Incident.query.order_by(Incident.created_at.desc()).limit(10).all()
+    # Get comprehensive statistics (one grouped query per table) and the
+    # recent incidents, all cached until the next write
+    stats, user_stats, recent_incidents = cached(
+        'admin_dashboard',
+        lambda: (get_incident_stats(), get_user_stats(), get_recent_incidents())
+    )
     
     return render_template(
         'admin_dashboard.html',
         title='Admin Dashboard',
-        total_incidents=total_incidents,
-        high_priority=high_priority,
-        medium_priority=medium_priority,
-        low_priority=low_priority,
-        open_incidents=open_incidents,
-        in_progress=in_progress,
-        resolved=resolved,
-        closed=closed,
-        total_users=total_users,
-        admin_users=admin_users,
-        regular_users=regular_users,
+        total_incidents=stats.total,
+        high_priority=stats.high,
+        medium_priority=stats.medium,
+        low_priority=stats.low,
+        open_incidents=stats.open,
+        in_progress=stats.in_progress,
+        resolved=stats.resolved,
+        closed=stats.closed,
+        total_users=user_stats.total,
+        admin_users=user_stats.admins,
+        regular_users=user_stats.regular,
         recent_incidents=recent_incidents,
         is_admin_dashboard=True
-    )
\ No newline at end of file
+    )
+
+
+@bp.route('/metrics')
+def metrics():
+    """
+    Prometheus metrics in the text exposition format.
+    Off unless METRICS_ENABLED; scrapers authenticate with a bearer token
+    when METRICS_TOKEN is set (no user login, which scrapers lack).
+    """
+    if not current_app.config.get('METRICS_ENABLED'):
+        abort(404)
+    
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        expected = f'Bearer {token}'.encode()
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+            abort(401)
+    
+    from app.utils.metrics import CONTENT_TYPE, REGISTRY
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
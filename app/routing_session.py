@@ -0,0 +1,24 @@
+"""
+Session class that can send reads to a read replica.
+Kept apart from app.utils so it can be imported before `db` is created.
+"""
+
+import sqlalchemy as sa
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy session that reads from the replica chosen for the
+    current view (see app.utils.replicas.read_replica). Flushes and
+    INSERT/UPDATE/DELETE statements always use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, sa.UpdateBase) \
+                and has_app_context():
+            replica = g.get('db_replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,194 @@
+"""
+Batch priority classification and team routing.
+Applies the active triage rules to whole columns at once with NumPy masks,
+so re-triaging a backlog after a rule change does not call the per-row
+functions (or touch the ORM) once per incident.
+"""
+
+import math
+import re
+
+import numpy as np
+
+from app.utils.triage_rules import get_rules
+
+# Input fields, in the order accepted for tuple rows
+TRIAGE_COLUMNS = ('platform', 'journey', 'clients_affected', 'description')
+
+WHOLE_NUMBER_PATTERN = re.compile(r'\s*[+-]?\d+\s*')
+
+
+def _whole_number(value):
+    """
+    Convert a client count to int without truncating.
+
+    Returns:
+        int: The count, or None if the value is not a whole number
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return int(value) if math.isfinite(value) and float(value).is_integer() else None
+    if isinstance(value, str) and WHOLE_NUMBER_PATTERN.fullmatch(value):
+        return int(value)
+    return None
+
+
+def _check_types(columns):
+    """
+    Validate every field of every row, converting clients_affected to int64.
+
+    Raises:
+        ValueError: Naming the first invalid row (0-based) and field
+    """
+    for name in ('platform', 'journey', 'description'):
+        allow_none = name == 'description'
+        for number, value in enumerate(columns[name]):
+            if not (isinstance(value, str) or (allow_none and value is None)):
+                raise ValueError(f'Row {number}: {name} must be a string')
+
+    clients = columns['clients_affected']
+    if clients.dtype.kind in 'iu':  # Integer DataFrame column: nothing to check
+        columns['clients_affected'] = clients.astype(np.int64)
+        return
+    counts = [_whole_number(value) for value in clients]
+    for number, count in enumerate(counts):
+        if count is None:
+            raise ValueError(f'Row {number}: clients_affected must be a whole number')
+    columns['clients_affected'] = np.array(counts, dtype=np.int64)
+
+
+def _columns(rows):
+    """
+    Split rows into one NumPy array per input field.
+
+    Args:
+        rows: pandas DataFrame, or a list of tuples/dicts with TRIAGE_COLUMNS
+
+    Returns:
+        dict: Field name -> array
+
+    Raises:
+        ValueError: If a row or the DataFrame is missing a field, or a field
+                    has the wrong type (the message names the row)
+    """
+    if hasattr(rows, 'columns'):
+        missing = [name for name in TRIAGE_COLUMNS if name not in rows.columns]
+        if missing:
+            raise ValueError(f'Missing columns: {", ".join(missing)}')
+        columns = {name: rows[name].to_numpy(dtype=object) for name in TRIAGE_COLUMNS}
+        columns['clients_affected'] = rows['clients_affected'].to_numpy()
+    else:
+        rows = list(rows)
+        for number, row in enumerate(rows):
+            if isinstance(row, dict):
+                missing = [name for name in TRIAGE_COLUMNS if name not in row]
+                if missing:
+                    raise ValueError(f'Row {number} is missing: {", ".join(missing)}')
+                rows[number] = tuple(row[name] for name in TRIAGE_COLUMNS)
+            elif len(row) != len(TRIAGE_COLUMNS):
+                raise ValueError(f'Row {number} must have {len(TRIAGE_COLUMNS)} fields')
+        fields = list(zip(*rows)) if rows else [()] * len(TRIAGE_COLUMNS)
+        columns = {}
+        for name, values in zip(TRIAGE_COLUMNS, fields):
+            columns[name] = np.empty(len(values), dtype=object)
+            columns[name][:] = values
+
+    _check_types(columns)
+    return columns
+
+
+def _keyword_masks(matcher, descriptions):
+    """One boolean mask per keyword category, scanning the whole column at once."""
+    masks = {}
+    for category, rows in matcher.match_many(descriptions).items():
+        mask = np.zeros(len(descriptions), dtype=bool)
+        mask[list(rows)] = True
+        masks[category] = mask
+    return masks
+
+
+def _select(rules, default, columns, keywords):
+    """
+    Evaluate one ordered rule section over every row.
+
+    np.select takes the first condition that holds, like the first-match
+    evaluation of RuleSet, so each rule becomes one mask.
+    """
+    conditions = []
+    results = []
+    for result, platforms, journeys, min_clients, keyword in rules:
+        mask = np.ones(len(columns['platform']), dtype=bool)
+        if platforms is not None:
+            mask &= np.isin(columns['platform'], list(platforms))
+        if journeys is not None:
+            mask &= np.isin(columns['journey'], list(journeys))
+        if min_clients is not None:
+            mask &= columns['clients_affected'] >= min_clients
+        if keyword is not None:
+            mask &= keywords[keyword]
+        conditions.append(mask)
+        results.append(result)
+    return np.select(conditions, results, default=default)
+
+
+def triage_columns(platforms, journeys, clients_affected, descriptions, rules=None):
+    """
+    Predict priority and assign team for column arrays.
+
+    Args:
+        platforms (ndarray): Platform names
+        journeys (ndarray): Customer journeys
+        clients_affected (ndarray): Integer client counts
+        descriptions (ndarray): Description texts
+        rules (RuleSet): Rules to apply (defaults to the active rules)
+
+    Returns:
+        tuple: (priorities, teams) arrays of strings
+    """
+    rules = rules or get_rules()
+    columns = {'platform': platforms, 'journey': journeys, 'clients_affected': clients_affected}
+    keywords = _keyword_masks(rules.matcher, descriptions)
+
+    priorities = _select(rules.priority_rules, rules.priority_default, columns, keywords)
+    teams = _select(rules.routing_rules, rules.routing_default, columns, keywords)
+    return priorities, teams
+
+
+def triage_batch(rows, rules=None):
+    """
+    Predict priority and assign team for many incidents in one call.
+
+    Args:
+        rows: pandas DataFrame with TRIAGE_COLUMNS, or a list of
+              (platform, journey, clients_affected, description) tuples
+              or dicts with those keys
+        rules (RuleSet): Rules to apply (defaults to the active rules)
+
+    Returns:
+        DataFrame with 'priority' and 'team' columns (same index) for DataFrame
+        input, otherwise a list of {'priority': ..., 'team': ...} dicts in row order
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type (e.g. a
+                    clients_affected that is not a whole number)
+    """
+    columns = _columns(rows)
+    if len(columns['platform']) == 0:
+        priorities = teams = np.array([], dtype=object)
+    else:
+        priorities, teams = triage_columns(
+            columns['platform'], columns['journey'],
+            columns['clients_affected'], columns['description'], rules
+        )
+
+    if hasattr(rows, 'columns'):
+        import pandas as pd
+        return pd.DataFrame({'priority': priorities, 'team': teams}, index=rows.index)
+
+    return [
+        {'priority': priority, 'team': team}
+        for priority, team in zip(priorities.tolist(), teams.tolist())
+    ]
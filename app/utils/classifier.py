@@ -1,10 +1,16 @@
 """
 Priority classification logic for incidents.
 Uses rule-based approach to predict incident priority (High/Medium/Low).
+The rules are data, defined in app/triage_rules.json (see triage_rules.py).
 """
 
+from time import perf_counter
 
-def predict_priority(platform, journey, clients_affected, description):
+from app.utils.metrics import TRIAGE_LATENCY
+from app.utils.triage_rules import get_rules
+
+
+def predict_priority(platform, journey, clients_affected, description, keyword_matches=None):
     """
     Predict incident priority based on business rules.
     
@@ -13,43 +19,42 @@ def predict_priority(platform, journey, clients_affected, description):
         journey (str): Customer journey affected
         clients_affected (int): Number of clients impacted
         description (str): Incident description text
+        keyword_matches (frozenset): Result of match_triage_keywords(description),
+                                     if the caller has already scanned it
     
     Returns:
         str: Priority level ('High', 'Medium', or 'Low')
     
-    Business Rules:
+    Business Rules (default rule table):
     - HIGH: Multiple clients (>10) OR critical journey with multiple clients (>3)
+      OR error keywords with more than 5 clients
     - MEDIUM: Critical journey OR 2-10 clients affected
     - LOW: Single client, non-critical journey
     """
-    
-    description_lower = description.lower()
-    
-    # Critical journeys that require immediate attention
-    critical_journeys = ['Login', 'Transfer', 'Payment', 'Balance View', 'Account Access']
-    
-    # Keywords indicating high severity
-    high_severity_keywords = ['error', 'timeout', 'crash', 'down', 'failure', 'unavailable']
-    
-    # HIGH PRIORITY: Multiple clients affected
-    if clients_affected > 10:
-        return 'High'
-    
-    # HIGH PRIORITY: Critical journey with multiple clients
-    if journey in critical_journeys and clients_affected > 3:
-        return 'High'
-    
-    # HIGH PRIORITY: Error keywords in description with multiple clients
-    if any(keyword in description_lower for keyword in high_severity_keywords) and clients_affected > 5:
-        return 'High'
-    
-    # MEDIUM PRIORITY: Critical journey (even single client)
-    if journey in critical_journeys:
-        return 'Medium'
-    
-    # MEDIUM PRIORITY: 2-10 clients affected
-    if clients_affected >= 2:
-        return 'Medium'
-    
-    # LOW PRIORITY: Everything else (single client, non-critical)
-    return 'Low'
\ No newline at end of file
+    started = perf_counter()
+    priority = get_rules().predict_priority(
+        platform, journey, clients_affected, description, keyword_matches
+    )
+    TRIAGE_LATENCY.observe(perf_counter() - started, 'predict_priority')
+    return priority
+
+
+def triage_incident(platform, journey, clients_affected, description):
+    """
+    Predict priority and assign a team for a new or edited incident.
+
+    The description is only searched for the keyword categories that the
+    rules on the path taken need, and lowercased at most once for both decisions.
+    Unlike predict_priority this records no latency itself: it runs on every
+    incident create and edit, so the views time it once per request instead.
+
+    Args:
+        platform (str): Platform name (Additiv, Avaloq)
+        journey (str): Customer journey affected
+        clients_affected (int): Number of clients impacted
+        description (str): Incident description text
+
+    Returns:
+        tuple: (priority, team)
+    """
+    return get_rules().triage(platform, journey, clients_affected, description)
@@ -0,0 +1,318 @@
+"""
+Offline near-duplicate clustering over the full incident history.
+Groups incidents whose similarity reaches a threshold into clusters with
+union-find, so one outage's tickets share a single cluster id.
+
+Candidate pairs come from LSH bands of the stored MinHash signatures,
+written to a job table so memory stays flat however large the history is.
+Pair scoring runs in a process pool. Progress is checkpointed to a small
+JSON file and matching pairs are appended to an edge log next to it, so an
+interrupted run resumes where it stopped. Both files are removed when a run
+completes, so the next run clusters the whole history again, including
+incidents added since.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import bindparam, text
+
+from app import db
+from app.models.incident import Incident
+from app.utils.lsh_index import LshIndex
+from app.utils.text_processor import MinHasher, TextProcessor
+
+
+class UnionFind:
+    """
+    Disjoint-set forest keyed by incident id.
+    Only incidents that joined a cluster are stored; the root is the smallest id.
+    """
+
+    def __init__(self, parents=None):
+        self.parents = dict(parents or {})
+
+    def find(self, item):
+        """Return the root of an item, compressing the path on the way."""
+        root = item
+        while self.parents.get(root, root) != root:
+            root = self.parents[root]
+        while item != root:
+            self.parents[item], item = root, self.parents.get(item, item)
+        return root
+
+    def union(self, a, b):
+        """Merge the sets containing a and b, keeping the smaller root."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parents[root_a] = root_a
+        self.parents[root_b] = root_a
+
+    def roots(self):
+        """Map every stored item to its cluster root."""
+        return {item: self.find(item) for item in list(self.parents)}
+
+
+def score_pairs(tasks, threshold):
+    """
+    Score candidate pairs (runs in worker processes).
+
+    Args:
+        tasks (list): (incident, candidates) tuples, where each incident is
+                      (id, title, description, title_tokens, description_tokens)
+        threshold (float): Minimum similarity for an edge
+
+    Returns:
+        list: (incident_id, candidate_id) pairs at or above the threshold
+    """
+    edges = []
+    for incident, candidates in tasks:
+        for candidate in candidates:
+            score = TextProcessor.weighted_similarity([
+                (0.25, incident[1], candidate[1], incident[3], candidate[3]),
+                (0.75, incident[2], candidate[2], incident[4], candidate[4]),
+            ], min_score=threshold)
+            if score is not None and score >= threshold:
+                edges.append((incident[0], candidate[0]))
+    return edges
+
+
+class ClusterJob:
+    """
+    Resumable clustering run: bucket phase, scoring phase, then write-back.
+    """
+
+    BUCKET_TABLE = 'cluster_job_buckets'
+
+    def __init__(self, checkpoint_path, threshold=0.75, chunk_size=1000,
+                 workers=None, max_candidates=200, log=print):
+        """
+        Args:
+            checkpoint_path (str): JSON checkpoint file
+            threshold (float): Similarity threshold for joining a cluster
+            chunk_size (int): Incidents processed per chunk
+            workers (int): Worker processes (1 scores in-process)
+            max_candidates (int): Cap on candidates scored per incident
+            log (callable): Progress output
+        """
+        self.checkpoint_path = checkpoint_path
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.max_candidates = max_candidates
+        self.log = log
+
+    # ----- Checkpointing -----
+
+    @property
+    def edges_path(self):
+        """Append-only log of matching pairs found by the scoring phase."""
+        return f'{self.checkpoint_path}.edges'
+
+    def load_checkpoint(self):
+        """Return saved progress, or a fresh state if there is none."""
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        return {'phase': 'buckets', 'last_id': 0, 'threshold': self.threshold}
+
+    def save_checkpoint(self, state):
+        """Write progress atomically so a crash never leaves a torn file."""
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def append_edges(self, edges):
+        """
+        Log matching pairs. Called before the checkpoint moves past a chunk,
+        so a crash in between only logs some pairs twice (unions are idempotent).
+        """
+        with open(self.edges_path, 'a') as f:
+            f.writelines(f'{a} {b}\n' for a, b in edges)
+
+    def load_union_find(self):
+        """Rebuild the union-find forest from the edge log."""
+        union_find = UnionFind()
+        if os.path.exists(self.edges_path):
+            with open(self.edges_path) as f:
+                for line in f:
+                    pair = line.split()
+                    if len(pair) == 2:  # Skip a line torn by a crash
+                        union_find.union(int(pair[0]), int(pair[1]))
+        return union_find
+
+    def reset(self):
+        """Forget any previous run's progress."""
+        for path in (self.checkpoint_path, self.edges_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ----- Phases -----
+
+    def _chunks(self, after_id):
+        """Yield incidents in id order, one chunk at a time."""
+        while True:
+            chunk = Incident.query.filter(
+                Incident.id > after_id
+            ).order_by(Incident.id).limit(self.chunk_size).all()
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+            db.session.expunge_all()
+
+    def write_buckets(self, state):
+        """Phase 1: write each incident's LSH band keys to the job table."""
+        hasher = LshIndex.get_hasher()
+        if state['last_id'] == 0:
+            if os.path.exists(self.edges_path):
+                os.remove(self.edges_path)
+            db.session.execute(text(f'DROP TABLE IF EXISTS {self.BUCKET_TABLE}'))
+            db.session.execute(text(
+                f'CREATE TABLE {self.BUCKET_TABLE} '
+                f'(bucket BIGINT NOT NULL, platform VARCHAR(50) NOT NULL, incident_id INTEGER NOT NULL)'
+            ))
+            db.session.execute(text(
+                f'CREATE INDEX ix_{self.BUCKET_TABLE}_lookup '
+                f'ON {self.BUCKET_TABLE} (bucket, platform, incident_id)'
+            ))
+            db.session.commit()
+
+        insert = text(
+            f'INSERT INTO {self.BUCKET_TABLE} (bucket, platform, incident_id) '
+            f'VALUES (:bucket, :platform, :incident_id)'
+        )
+        for chunk in self._chunks(state['last_id']):
+            rows = []
+            for incident in chunk:
+                if incident.minhash_signature:
+                    signature = MinHasher.from_bytes(incident.minhash_signature)
+                else:
+                    signature = LshIndex.signature_for_incident(incident)
+                if signature is None:
+                    continue
+                rows.extend(
+                    {'bucket': key, 'platform': incident.platform, 'incident_id': incident.id}
+                    for key in hasher.band_keys(signature)
+                )
+            if rows:
+                db.session.execute(insert, rows)
+            state['last_id'] = chunk[-1].id
+            db.session.commit()
+            self.save_checkpoint(state)
+            self.log(f'  buckets written up to incident #{state["last_id"]}')
+
+        state['phase'], state['last_id'] = 'scoring', 0
+        self.save_checkpoint(state)
+
+    def _candidates_for(self, incident_ids):
+        """Map each incident to earlier incidents sharing a band on the same platform."""
+        query = text(
+            f'SELECT DISTINCT a.incident_id, b.incident_id '
+            f'FROM {self.BUCKET_TABLE} a JOIN {self.BUCKET_TABLE} b '
+            f'ON b.bucket = a.bucket AND b.platform = a.platform AND b.incident_id < a.incident_id '
+            f'WHERE a.incident_id IN :ids'
+        ).bindparams(bindparam('ids', expanding=True))
+
+        candidates = {}
+        for incident_id, candidate_id in db.session.execute(query, {'ids': list(incident_ids)}):
+            found = candidates.setdefault(incident_id, [])
+            if len(found) < self.max_candidates:
+                found.append(candidate_id)
+        return candidates
+
+    @staticmethod
+    def _as_task_row(incident):
+        """Plain tuple sent to worker processes."""
+        return (incident.id, incident.title, incident.description,
+                incident.title_token_list, incident.description_token_list)
+
+    def score(self, state, executor):
+        """Phase 2: score candidate pairs chunk by chunk and log the matches."""
+        for chunk in self._chunks(state['last_id']):
+            candidates = self._candidates_for(incident.id for incident in chunk)
+            needed = {cid for ids in candidates.values() for cid in ids}
+            others = {
+                incident.id: self._as_task_row(incident)
+                for incident in Incident.query.filter(Incident.id.in_(needed)).all()
+            } if needed else {}
+
+            tasks = [
+                (self._as_task_row(incident), [others[cid] for cid in candidates[incident.id] if cid in others])
+                for incident in chunk if incident.id in candidates
+            ]
+
+            if executor is None:
+                edge_lists = [score_pairs(tasks, self.threshold)]
+            else:
+                # Split the chunk so every worker gets a share
+                step = max(1, len(tasks) // self.workers + 1)
+                parts = [tasks[i:i + step] for i in range(0, len(tasks), step)]
+                edge_lists = executor.map(score_pairs, parts, [self.threshold] * len(parts))
+
+            # Only this chunk's pairs are written, so a checkpoint costs O(chunk)
+            self.append_edges(edge for edges in edge_lists for edge in edges)
+
+            state['last_id'] = chunk[-1].id
+            self.save_checkpoint(state)
+            self.log(f'  scored up to incident #{state["last_id"]}')
+
+        state['phase'], state['last_id'] = 'write', 0
+        self.save_checkpoint(state)
+
+    def write_clusters(self):
+        """Phase 3: store cluster ids (singletons get their own id)."""
+        roots = self.load_union_find().roots()
+
+        table = Incident.__table__
+        db.session.execute(table.update().values(cluster_id=table.c.id))
+        update = table.update().where(table.c.id == bindparam('b_id')).values(
+            cluster_id=bindparam('b_cluster')
+        )
+        rows = [{'b_id': item, 'b_cluster': root} for item, root in roots.items() if item != root]
+        for start in range(0, len(rows), self.chunk_size):
+            db.session.execute(update, rows[start:start + self.chunk_size])
+        db.session.execute(text(f'DROP TABLE IF EXISTS {self.BUCKET_TABLE}'))
+        db.session.commit()
+
+        # Completed: the next run starts from scratch and picks up new incidents
+        self.reset()
+        return len(set(roots.values()))
+
+    def run(self):
+        """
+        Run the job, resuming an interrupted run if there is one.
+
+        Returns:
+            int: Number of multi-incident clusters found
+        """
+        state = self.load_checkpoint()
+        if state['phase'] == 'done':
+            # Finished checkpoint kept by earlier versions of the job: start a new run
+            self.reset()
+            state = self.load_checkpoint()
+        if state.get('threshold') != self.threshold:
+            raise ValueError(
+                f'Checkpoint was created with threshold {state.get("threshold")}; '
+                f'use the same threshold or start again with --reset'
+            )
+
+        if state['phase'] == 'buckets':
+            self.log('Phase 1/3: writing LSH buckets')
+            self.write_buckets(state)
+
+        if state['phase'] == 'scoring':
+            self.log(f'Phase 2/3: scoring candidate pairs with {self.workers} worker(s)')
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    self.score(state, executor)
+            else:
+                self.score(state, None)
+
+        self.log('Phase 3/3: writing cluster ids')
+        return self.write_clusters()
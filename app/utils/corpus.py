@@ -0,0 +1,333 @@
+"""
+Synthetic incident corpus for load and scale testing.
+Generates realistic incidents (weighted platforms and journeys, a long-tailed
+clients_affected distribution, templated descriptions with a controlled rate
+of near-duplicate re-reports, age-dependent statuses) plus users and override
+audit log entries, and writes them with Core bulk inserts in large batches.
+The derived tables the ORM hooks normally maintain are rebuilt afterwards.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.batch_triage import triage_columns
+
+PLATFORMS = (('Additiv', 55), ('Avaloq', 45))
+JOURNEYS = (('Login', 20), ('Transfer', 14), ('Payment', 14), ('Balance View', 10),
+            ('Account Access', 8), ('Data Sync', 12), ('Reporting', 12), ('Other', 10))
+TEAMS = ('LCM', 'DevOps', 'Additiv LCM', 'Avaloq Support', 'Platform Support')
+REASON_CODES = ('incorrect_platform_detection', 'keyword_misclassification',
+                'edge_case', 'business_impact', 'other')
+
+# (title, description) templates per journey; {slots} are filled from SLOTS
+TEMPLATES = {
+    'Login': [
+        ('Client cannot log in to {platform} {channel}',
+         'Client reports login failure on the {channel} with error {code}. {followup}'),
+        ('Account locked after password reset',
+         'Client locked out after resetting their password, {attempts} attempts failed. {followup}'),
+    ],
+    'Transfer': [
+        ('Transfer of {amount} failing',
+         'Transfer of {amount} between accounts times out after {seconds} seconds. {followup}'),
+        ('Transfer stuck in pending',
+         'Outgoing transfer of {amount} has been pending since {time}. {followup}'),
+    ],
+    'Payment': [
+        ('Payment rejected with {code}',
+         'Card payment of {amount} rejected with error {code} on the {channel}. {followup}'),
+        ('Duplicate payment taken',
+         'Client charged twice for a payment of {amount} at {time}. {followup}'),
+    ],
+    'Balance View': [
+        ('Balance showing incorrect value',
+         'Portfolio balance shows a {amount} discrepancy against the statement. {followup}'),
+    ],
+    'Account Access': [
+        ('Cannot access account on {channel}',
+         'Client gets {code} when opening their account on the {channel}. {followup}'),
+    ],
+    'Data Sync': [
+        ('Data sync mismatch between Additiv and Avaloq',
+         'Positions not syncing after the {time} batch, {count} accounts show a mismatch. {followup}'),
+        ('Overnight feed missing records',
+         'Custodian feed loaded {count} records fewer than expected at {time}. {followup}'),
+    ],
+    'Reporting': [
+        ('Monthly statement not generated',
+         'Statement run at {time} skipped {count} clients, reports are blank. {followup}'),
+        ('Report download slow',
+         'Valuation report takes {seconds} seconds to download on the {channel}. {followup}'),
+    ],
+    'Other': [
+        ('General query about {channel}',
+         'Client asked about the {channel} settings after the latest release. {followup}'),
+    ],
+}
+SLOTS = {
+    'channel': ['web portal', 'mobile app', 'api gateway', 'branch terminal'],
+    'code': ['AUTH_TIMEOUT', 'ERR_502', 'SESSION_EXPIRED', 'E1043', 'GATEWAY_DOWN', 'LIMIT_EXCEEDED'],
+    'followup': ['Multiple retry attempts failed.', 'Client escalated as urgent.',
+                 'Workaround applied manually.', 'Screenshot attached.', 'Started after the release.',
+                 'Issue is intermittent.', 'Client reports it is slow and frozen at times.'],
+}
+REWORDINGS = ['again', 'still', 'also', 'reported by phone', 'second report', 'same issue']
+
+
+def _weighted(options):
+    values, weights = zip(*options)
+    return list(values), list(weights)
+
+
+class CorpusGenerator:
+    """
+    Generates synthetic incident rows.
+
+    Args:
+        seed (int): Random seed (same seed and arguments give the same corpus)
+        near_duplicate_rate (float): Share of incidents that re-report an earlier one
+        days (int): Span of history the created_at timestamps cover
+        end (datetime): Newest created_at (defaults to now)
+    """
+
+    RECENT_POOL_SIZE = 5000  # Originals a near-duplicate may copy (a random sample)
+
+    def __init__(self, seed=42, near_duplicate_rate=0.1, days=365, end=None):
+        self.rng = random.Random(seed)
+        self.near_duplicate_rate = near_duplicate_rate
+        self.days = days
+        self.end = end or datetime.utcnow().replace(microsecond=0)
+        self.platforms = _weighted(PLATFORMS)
+        self.journeys = _weighted(JOURNEYS)
+        self.recent = []
+
+    def clients_affected(self):
+        """Long-tailed: most incidents hit one client, a few hit hundreds."""
+        return min(int(self.rng.paretovariate(1.3)), 500)
+
+    def _fill(self, template, platform):
+        rng = self.rng
+        return template.format(
+            platform=platform,
+            channel=rng.choice(SLOTS['channel']),
+            code=rng.choice(SLOTS['code']),
+            followup=rng.choice(SLOTS['followup']),
+            amount=f'£{rng.randint(1, 500) * 100:,}',
+            seconds=rng.choice([15, 30, 60, 120]),
+            attempts=rng.randint(2, 6),
+            count=rng.randint(2, 400),
+            time=f'{rng.randint(0, 23):02d}:{rng.choice(["00", "15", "30", "45"])}',
+        )
+
+    def _reword(self, text):
+        """Re-report of an incident: one word dropped, one phrase added."""
+        words = text.split()
+        if len(words) > 4:
+            words.pop(self.rng.randrange(1, len(words)))
+        words.insert(self.rng.randrange(len(words) + 1), self.rng.choice(REWORDINGS))
+        return ' '.join(words)
+
+    def _status(self, age_days):
+        """Older incidents are more likely to be resolved or closed."""
+        roll = self.rng.random()
+        if age_days < 2:
+            return 'Open' if roll < 0.7 else 'In Progress'
+        if age_days < 14:
+            return ('Open', 'In Progress', 'Resolved')[min(int(roll * 3), 2)]
+        if roll < 0.05:
+            return 'Open'
+        return 'Resolved' if roll < 0.45 else 'Closed'
+
+    def incident(self, incident_id, creator_ids):
+        """
+        Generate one incident row (without triage fields).
+
+        Returns:
+            tuple: (row dict, is_near_duplicate)
+        """
+        rng = self.rng
+        near_duplicate = bool(self.recent) and rng.random() < self.near_duplicate_rate
+        if near_duplicate:
+            # Re-reported within two days of the original
+            platform, journey, title, description, original_age = rng.choice(self.recent)
+            title, description = self._reword(title), self._reword(description)
+            age = max(original_age - rng.random() * 2, 0.0)
+        else:
+            platform = rng.choices(*self.platforms)[0]
+            journey = rng.choices(*self.journeys)[0]
+            title_template, description_template = rng.choice(TEMPLATES[journey])
+            title = self._fill(title_template, platform)
+            description = f'{self._fill(description_template, platform)} Ref {incident_id}.'
+            age = rng.random() * self.days
+            self.recent.append((platform, journey, title, description, age))
+            if len(self.recent) > self.RECENT_POOL_SIZE:
+                self.recent.pop(rng.randrange(len(self.recent)))
+
+        created_at = self.end - timedelta(days=age)
+        status = self._status(age)
+        resolved_at = None
+        updated_at = created_at
+        if status in ('Resolved', 'Closed'):
+            resolved_at = created_at + timedelta(hours=rng.expovariate(1 / 18))
+            updated_at = resolved_at
+        elif status == 'In Progress':
+            updated_at = created_at + timedelta(hours=rng.random() * min(age * 24, 48))
+
+        return {
+            'id': incident_id,
+            'title': title[:200],
+            'description': description,
+            'title_tokens': Incident.tokenise(title),
+            'description_tokens': Incident.tokenise(description),
+            'platform': platform,
+            'journey': journey,
+            'clients_affected': self.clients_affected(),
+            'duplicate_flag': near_duplicate,
+            'duplicate_score': round(rng.uniform(0.6, 0.95), 3) if near_duplicate else None,
+            'is_overridden': False,
+            'status': status,
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'resolved_at': resolved_at,
+            'created_by': rng.choice(creator_ids),
+        }, near_duplicate
+
+    def override(self, row, admin_ids):
+        """
+        Turn a triaged row into an admin override and return its audit log row.
+        """
+        rng = self.rng
+        field = rng.choice(('priority', 'team', 'both'))
+        new_priority = rng.choice([p for p in ('High', 'Medium', 'Low') if p != row['priority']])
+        new_team = rng.choice([t for t in TEAMS if t != row['assigned_team']])
+        audit = {
+            'incident_id': row['id'],
+            'field_changed': field,
+            'old_priority': row['priority'] if field != 'team' else None,
+            'new_priority': new_priority if field != 'team' else None,
+            'old_team': row['assigned_team'] if field != 'priority' else None,
+            'new_team': new_team if field != 'priority' else None,
+            'reason_code': rng.choice(REASON_CODES),
+            'comment': None,
+            'changed_by_user_id': rng.choice(admin_ids),
+            'changed_at': row['created_at'] + timedelta(minutes=rng.randint(5, 600)),
+        }
+        if field != 'team':
+            row['priority'] = new_priority
+        if field != 'priority':
+            row['assigned_team'] = new_team
+        row['is_overridden'] = True
+        return audit
+
+
+def create_users(count, admins, password, prefix='synthetic'):
+    """
+    Bulk-insert helpline users and admins sharing one password.
+
+    Returns:
+        tuple: (helpline user ids, admin user ids)
+    """
+    password_hash = generate_password_hash(password, method='pbkdf2:sha256')  # Hashed once
+    start = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+    now = datetime.utcnow()
+    rows = [
+        {
+            'id': start + number,
+            'username': f'{prefix}_{"admin" if number < admins else "user"}{start + number}',
+            'email': f'{prefix}{start + number}@example.com',
+            'password_hash': password_hash,
+            'is_admin': number < admins,
+            'created_at': now,
+        }
+        for number in range(count + admins)
+    ]
+    db.session.execute(User.__table__.insert(), rows)
+    db.session.commit()
+    admin_ids = [row['id'] for row in rows if row['is_admin']]
+    return [row['id'] for row in rows if not row['is_admin']], admin_ids
+
+
+def generate_corpus(incidents, users=50, admins=5, password='User123!', batch_size=20000,
+                    near_duplicate_rate=0.1, override_rate=0.03, days=365, seed=42,
+                    minhash=False, progress=None):
+    """
+    Bulk-insert a synthetic corpus and rebuild the derived tables.
+
+    Args:
+        incidents (int): Number of incidents to generate
+        users (int): Helpline users to create (incident creators)
+        admins (int): Admin users to create (audit log authors)
+        password (str): Password for every generated user
+        batch_size (int): Rows per bulk INSERT statement
+        near_duplicate_rate (float): Share of incidents re-reporting an earlier one
+        override_rate (float): Share of incidents overridden by an admin
+        days (int): Span of history covered by created_at
+        seed (int): Random seed
+        minhash (bool): Also rebuild MinHash signatures and LSH buckets (slow)
+        progress (callable): Called with the number of incidents written so far
+
+    Returns:
+        dict: Counts of users, incidents, near-duplicates and audit log entries
+    """
+    from app.utils.incident_counters import IncidentCounters
+    from app.utils.lsh_index import LshIndex
+    from app.utils.token_index import TokenIndex
+    from app.utils.response_cache import bump_generations
+
+    generator = CorpusGenerator(seed, near_duplicate_rate, days)
+    creator_ids, admin_ids = create_users(users, admins, password)
+    next_id = (db.session.query(func.max(Incident.id)).scalar() or 0) + 1
+    summary = {'users': users + admins, 'incidents': 0, 'near_duplicates': 0, 'audit_logs': 0}
+    platforms = set()
+
+    while summary['incidents'] < incidents:
+        size = min(batch_size, incidents - summary['incidents'])
+        rows = []
+        for offset in range(size):
+            row, near_duplicate = generator.incident(next_id + offset, creator_ids)
+            rows.append(row)
+            summary['near_duplicates'] += near_duplicate
+
+        # Vectorised triage of the whole batch with the active rule table
+        priorities, teams = triage_columns(
+            np.array([row['platform'] for row in rows], dtype=object),
+            np.array([row['journey'] for row in rows], dtype=object),
+            np.array([row['clients_affected'] for row in rows]),
+            [row['description'] for row in rows],
+        )
+        audits = []
+        for row, priority, team in zip(rows, priorities, teams):
+            row['predicted_priority'] = row['priority'] = str(priority)
+            row['predicted_team'] = row['assigned_team'] = str(team)
+            if generator.rng.random() < override_rate:
+                audits.append(generator.override(row, admin_ids))
+
+        db.session.execute(Incident.__table__.insert(), rows)
+        platforms.update(row['platform'] for row in rows)
+        if audits:
+            db.session.execute(AuditLog.__table__.insert(), audits)
+        db.session.commit()
+
+        next_id += size
+        summary['incidents'] += size
+        summary['audit_logs'] += len(audits)
+        if progress:
+            progress(summary['incidents'])
+
+    # Core inserts bypass the ORM flush hooks, so rebuild what they maintain
+    TokenIndex.rebuild()
+    IncidentCounters.rebuild()
+    if minhash:
+        LshIndex.rebuild()
+    # ...and invalidate cached dashboards and duplicate checks, as the flush hook would
+    bump_generations(db.session.connection(), platforms)
+    db.session.commit()
+    return summary
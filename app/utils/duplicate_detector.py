@@ -3,8 +3,18 @@ Duplicate incident detection using NLP similarity matching.
 Prevents creation of duplicate incidents by comparing text similarity.
 """
 
+import heapq
+from time import perf_counter
+
+from flask import current_app
+
 from app.models.incident import Incident
 from app.utils.text_processor import TextProcessor
+from app.utils.token_index import TokenIndex
+from app.utils.lsh_index import LshIndex
+from app.utils.fts_index import FullTextIndex
+from app.utils.metrics import DUPLICATE_CANDIDATES, DUPLICATE_CHECKS, DUPLICATE_LATENCY
+from app.utils.request_metrics import request_span
 
 
 class DuplicateDetector:
@@ -12,8 +22,80 @@ class DuplicateDetector:
     Detects potential duplicate incidents using fuzzy text matching.
     """
     
+    # Weight of SequenceMatcher in calculate_similarity: an incident sharing no
+    # tokens with the query can never score above this
+    NO_OVERLAP_MAX_SCORE = 0.3
+    
+    # Backends selectable through DUPLICATE_BACKEND. 'index', 'minhash' and
+    # 'fts' retrieve candidates for the pairwise scorer; 'tfidf' scores
+    # everything with sparse matrix products and reports weighted cosine similarity.
+    BACKENDS = ('index', 'minhash', 'fts', 'tfidf')
+    
+    @staticmethod
+    def resolve_backend(backend=None):
+        """
+        Validate a backend name, falling back to the DUPLICATE_BACKEND config.
+        
+        Raises:
+            ValueError: If the backend is not one of BACKENDS
+        """
+        backend = backend or current_app.config.get('DUPLICATE_BACKEND', 'index')
+        if backend not in DuplicateDetector.BACKENDS:
+            raise ValueError(f'Unknown duplicate detection backend: {backend}')
+        return backend
+    
+    @staticmethod
+    def get_candidates(title, description, platform, threshold, backend=None):
+        """
+        Load the open incidents worth scoring against the query.
+        
+        The 'index' backend returns incidents sharing tokens with the query;
+        the 'minhash' backend returns incidents sharing an LSH band, which is
+        a much smaller set with a bounded chance of missing a near-duplicate;
+        the 'fts' backend ranks token matches with SQLite FTS5 bm25.
+        Either way every open incident on the platform is considered regardless
+        of age. Thresholds low enough that a zero-overlap incident could still
+        match fall back to a full scan.
+        
+        Args:
+            title (str): Incident title
+            description (str): Incident description
+            platform (str): Platform name (Additiv/Avaloq)
+            threshold (float): Similarity threshold (0.0 to 1.0)
+            backend (str): Backend name (defaults to DUPLICATE_BACKEND config)
+            
+        Returns:
+            list: Candidate Incident objects
+        """
+        backend = DuplicateDetector.resolve_backend(backend)
+        
+        if threshold <= DuplicateDetector.NO_OVERLAP_MAX_SCORE:
+            return Incident.query.filter_by(
+                platform=platform,
+                status=TokenIndex.INDEXED_STATUS
+            ).all()
+        
+        limit = current_app.config.get('DUPLICATE_CANDIDATE_LIMIT', 200)
+        if backend == 'minhash':
+            candidate_ids = LshIndex.candidate_ids(title, description, platform, limit=limit)
+        elif backend == 'fts':
+            candidate_ids = FullTextIndex.candidate_ids(title, description, platform, limit=limit)
+        else:
+            candidate_ids = TokenIndex.candidate_ids(
+                TokenIndex.tokens_for(title, description), platform, limit=limit
+            )
+        if not candidate_ids:
+            return []
+        
+        # Keep the backend's ranking (most shared tokens/bands first) for pruning
+        incidents = {
+            incident.id: incident
+            for incident in Incident.query.filter(Incident.id.in_(candidate_ids)).all()
+        }
+        return [incidents[incident_id] for incident_id in candidate_ids if incident_id in incidents]
+    
     @staticmethod
-    def find_similar_incidents(title, description, platform, threshold=0.75, limit=5):
+    def find_similar_incidents(title, description, platform, threshold=0.75, limit=5, backend=None):
         """
         Find existing incidents similar to the provided text.
         
@@ -23,33 +105,123 @@ class DuplicateDetector:
             platform (str): Platform name (Additiv/Avaloq)
             threshold (float): Similarity threshold (0.0 to 1.0)
             limit (int): Maximum number of similar incidents to return
+            backend (str): Candidate backend (defaults to DUPLICATE_BACKEND config)
             
         Returns:
             list: List of tuples (Incident object, similarity_score)
         """
-        # Get recent open incidents on same platform
-        existing_incidents = Incident.query.filter_by(
-            platform=platform,
-            status='Open'
-        ).order_by(Incident.created_at.desc()).limit(50).all()
-        
-        # Calculate similarity scores
-        similar_incidents = []
-        for incident in existing_incidents:
+        backend = DuplicateDetector.resolve_backend(backend)
+        if backend == 'tfidf':
+            return DuplicateDetector.find_similar_batch(
+                [(title, description)], platform, threshold, limit
+            )[0]
+        
+        # Get open incidents on same platform from the configured candidate backend
+        existing_incidents = DuplicateDetector.get_candidates(
+            title, description, platform, threshold, backend=backend
+        )
+        DUPLICATE_CANDIDATES.observe(len(existing_incidents), backend)
+        
+        return DuplicateDetector.score_candidates(
+            title, description, existing_incidents, threshold, limit
+        )
+    
+    @staticmethod
+    def score_candidates(title, description, candidates, threshold=0.75, limit=5):
+        """
+        Score candidate incidents and keep the best matches above the threshold.
+        
+        Keeps a min-heap of the current top `limit` matches. Once it is full a
+        candidate only needs scoring if it can beat the weakest kept match, so
+        TextProcessor.weighted_similarity can usually stop at a cheap bound
+        instead of running the full SequenceMatcher.
+        
+        Args:
+            title (str): Query title
+            description (str): Query description
+            candidates (iterable): Incident objects (best guesses first prune most)
+            threshold (float): Similarity threshold (0.0 to 1.0)
+            limit (int): Maximum number of matches to return
+            
+        Returns:
+            list: List of tuples (Incident object, similarity_score), highest first
+        """
+        if limit <= 0:
+            return []
+        
+        # Tokenise the query once; candidates supply their cached tokens
+        title_tokens = TextProcessor.preprocess_text(title)
+        description_tokens = TextProcessor.preprocess_text(description)
+        
+        # Min-heap of (similarity, -order, incident): the root is the weakest kept
+        # match, and on ties the earlier candidate wins as with a stable sort
+        top_matches = []
+        for order, incident in enumerate(candidates):
+            heap_full = len(top_matches) >= limit
+            min_score = max(threshold, top_matches[0][0]) if heap_full else threshold
+            
             # Compare title and description separately with weighted scoring
-            title_sim = TextProcessor.calculate_similarity(title, incident.title)
-            desc_sim = TextProcessor.calculate_similarity(description, incident.description)
-            similarity = (0.25 * title_sim) + (0.75 * desc_sim)
+            similarity = TextProcessor.weighted_similarity([
+                (0.25, title, incident.title, title_tokens, incident.title_token_list),
+                (0.75, description, incident.description, description_tokens, incident.description_token_list),
+            ], min_score=min_score)
             
-            if similarity >= threshold:
-                similar_incidents.append((incident, similarity))
+            if similarity is None:
+                continue
+            if not heap_full:
+                heapq.heappush(top_matches, (similarity, -order, incident))
+            elif similarity > top_matches[0][0]:
+                heapq.heapreplace(top_matches, (similarity, -order, incident))
         
-        # Sort by similarity (highest first) and limit results
-        similar_incidents.sort(key=lambda x: x[1], reverse=True)
-        return similar_incidents[:limit]
+        # Highest similarity first
+        top_matches.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [(incident, similarity) for similarity, _, incident in top_matches]
     
     @staticmethod
-    def check_for_duplicates(title, description, platform, threshold=0.75):
+    def find_similar_batch(queries, platform, threshold=0.75, limit=5):
+        """
+        Find similar open incidents for many queries at once using TF-IDF.
+        
+        All queries are scored against every open incident on the platform
+        in one sparse matrix product, which is what makes bulk imports and
+        full re-scans practical. Scores are weighted cosine similarities
+        (0.25 title / 0.75 description), not calculate_similarity scores.
+        
+        Args:
+            queries (list): (title, description) tuples
+            platform (str): Platform name (Additiv/Avaloq)
+            threshold (float): Similarity threshold (0.0 to 1.0)
+            limit (int): Maximum number of similar incidents per query
+            
+        Returns:
+            list: One list of (Incident object, similarity_score) tuples per query
+        """
+        # Imported lazily so NumPy/SciPy only load when the TF-IDF engine is used
+        from app.utils.tfidf import TfidfIndex
+        
+        index = TfidfIndex.for_platform(platform, status=TokenIndex.INDEXED_STATUS)
+        matches = index.top_matches_batch(
+            [title for title, _ in queries],
+            [description for _, description in queries],
+            threshold,
+            limit
+        )
+        
+        matched_ids = {incident_id for row in matches for incident_id, _ in row}
+        incidents = {}
+        if matched_ids:
+            incidents = {
+                incident.id: incident
+                for incident in Incident.query.filter(Incident.id.in_(matched_ids)).all()
+            }
+        
+        return [
+            [(incidents[incident_id], score) for incident_id, score in row if incident_id in incidents]
+            for row in matches
+        ]
+    
+    @staticmethod
+    def check_for_duplicates(title, description, platform, threshold=0.75, backend=None):
         """
         Check if an incident is a potential duplicate.
         
@@ -58,6 +230,7 @@ class DuplicateDetector:
             description (str): Incident description
             platform (str): Platform name
             threshold (float): Similarity threshold
+            backend (str): Candidate backend (defaults to DUPLICATE_BACKEND config)
             
         Returns:
             dict: {
@@ -65,9 +238,13 @@ class DuplicateDetector:
                 'similar_incidents': list of (Incident, score) tuples
             }
         """
-        similar = DuplicateDetector.find_similar_incidents(
-            title, description, platform, threshold
-        )
+        started = perf_counter()
+        with request_span('duplicates'):
+            similar = DuplicateDetector.find_similar_incidents(
+                title, description, platform, threshold, backend=backend
+            )
+        DUPLICATE_LATENCY.observe(perf_counter() - started)
+        DUPLICATE_CHECKS.inc('duplicate' if similar else 'unique')
         
         return {
             'is_duplicate': len(similar) > 0,
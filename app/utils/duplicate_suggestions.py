@@ -0,0 +1,193 @@
+"""
+Live duplicate suggestions while an incident is being typed.
+The create form asks for suggestions after every pause in typing, so one
+user sends many small requests whose text mostly just grows. Each session
+keeps its state in the session cache: the candidate rows loaded so far for
+the chosen platform, the tokens already looked up in the token index and
+the last ranking. The index is only queried again when the text adds
+tokens (ranked against the whole text), only rows not seen before are
+loaded, the cached rows are scored in memory (previous best matches first,
+so pruning kicks in early) and scoring stops when DUPLICATE_SUGGEST_BUDGET_MS
+is spent. The state is dropped when the platform changes or an incident on it
+is added, removed or edited (the platform's duplicate generation moves on).
+"""
+
+import secrets
+from collections import namedtuple
+from time import perf_counter
+
+from flask import current_app, session
+
+from app import db
+from app.models.incident import Incident
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.metrics import DUPLICATE_SUGGESTIONS
+from app.utils.response_cache import MISSING, current_generation, duplicate_generation_name
+from app.utils.token_index import TokenIndex
+
+SESSION_KEY = 'duplicate_suggest'
+MAX_CACHED_CANDIDATES = 2000  # Start over once a session has loaded this many rows
+
+# Cached copy of the fields score_candidates reads from an Incident (never mutated)
+SuggestionCandidate = namedtuple(
+    'SuggestionCandidate',
+    ['id', 'title', 'description', 'title_token_list', 'description_token_list']
+)
+
+
+def _new_state(platform, generation):
+    return {
+        'platform': platform,
+        'generation': generation,
+        'title': None,
+        'description': None,
+        'looked_up': frozenset(),
+        'candidates': {},
+        'matches': (),
+        'partial': False,
+    }
+
+
+def _state_key():
+    """Session cache key of the current session's state, created on first use."""
+    if SESSION_KEY not in session:
+        session[SESSION_KEY] = secrets.token_urlsafe(16)
+    return f'{SESSION_KEY}:{session[SESSION_KEY]}'
+
+
+def _fetch_rows(incident_ids):
+    """Load the text and cached tokens of the given incidents."""
+    rows = db.session.query(
+        Incident.id, Incident.title, Incident.description,
+        Incident.title_tokens, Incident.description_tokens
+    ).filter(Incident.id.in_(incident_ids)).all()
+    return [
+        SuggestionCandidate(
+            incident_id, title, description,
+            tuple((title_tokens if title_tokens is not None else Incident.tokenise(title)).split()),
+            tuple((description_tokens if description_tokens is not None else Incident.tokenise(description)).split()),
+        )
+        for incident_id, title, description, title_tokens, description_tokens in rows
+    ]
+
+
+def _load_candidates(tokens, state):
+    """
+    Look up the best candidates for the whole query and add the rows not cached yet.
+
+    Returns:
+        dict: New candidates mapping (the state's own mapping is left untouched)
+    """
+    limit = current_app.config.get('DUPLICATE_CANDIDATE_LIMIT', 200)
+    candidate_ids = TokenIndex.candidate_ids(tokens, state['platform'], limit=limit)
+    missing = [incident_id for incident_id in candidate_ids if incident_id not in state['candidates']]
+    candidates = dict(state['candidates'])
+    if missing:
+        candidates.update((candidate.id, candidate) for candidate in _fetch_rows(missing))
+    return candidates
+
+
+def _ranked_candidates(tokens, state, grows):
+    """
+    Order the cached rows that share tokens with the query, best guesses first.
+
+    When the text only grew, the previous matches lead (they are the likeliest
+    matches again and fill the top-N heap early); the rest follow by shared tokens.
+    """
+    overlap = {}
+    for incident_id, candidate in state['candidates'].items():
+        shared = len(tokens.intersection(candidate.title_token_list, candidate.description_token_list))
+        if shared:
+            overlap[incident_id] = shared
+
+    previous = {incident_id: rank for rank, (incident_id, _) in enumerate(state['matches'])} if grows else {}
+    ordered = sorted(overlap, key=lambda incident_id: (
+        previous.get(incident_id, len(previous)), -overlap[incident_id], -incident_id
+    ))
+    limit = current_app.config.get('DUPLICATE_CANDIDATE_LIMIT', 200)
+    return [state['candidates'][incident_id] for incident_id in ordered[:limit]]
+
+
+def _within_budget(candidates, deadline, cut_short):
+    """Yield candidates until the deadline passes, appending to cut_short if it does."""
+    for candidate in candidates:
+        if perf_counter() >= deadline:
+            cut_short.append(candidate)
+            return
+        yield candidate
+
+
+def suggest_duplicates(title, description, platform):
+    """
+    Rank open incidents resembling a partly typed incident.
+
+    Candidates always come from the token index (whatever DUPLICATE_BACKEND
+    is), since its postings are what allows skipping the lookup when a
+    request adds no tokens. The cached state is never modified in place:
+    each request builds a new state and stores it, so overlapping requests
+    from one session never see each other's half-updated state.
+
+    Args:
+        title (str): Title typed so far
+        description (str): Description typed so far
+        platform (str): Platform selected in the form
+
+    Returns:
+        dict: {
+            'matches': list of (incident id, title, similarity_score) tuples,
+            'partial': bool, True when the latency budget cut scoring short
+        }
+    """
+    config = current_app.config
+    deadline = perf_counter() + config['DUPLICATE_SUGGEST_BUDGET_MS'] / 1000.0
+    title = title or ''
+    description = description or ''
+
+    tokens = TokenIndex.tokens_for(title, description)
+    if not tokens:
+        return {'matches': [], 'partial': False}
+
+    cache = current_app.extensions.get('session_cache')
+    generation = current_generation(duplicate_generation_name(platform))
+    state = MISSING
+    if cache is not None:
+        key = _state_key()
+        state = cache.get(key)
+    if state is MISSING or state['platform'] != platform or state['generation'] != generation \
+            or len(state['candidates']) > MAX_CACHED_CANDIDATES:
+        state = _new_state(platform, generation)
+
+    if state['title'] == title and state['description'] == description and not state['partial']:
+        DUPLICATE_SUGGESTIONS.inc('reused')
+    else:
+        grows = state['title'] is not None and \
+            title.startswith(state['title']) and description.startswith(state['description'])
+        state = dict(state)
+        if not tokens <= state['looked_up']:
+            state['candidates'] = _load_candidates(tokens, state)
+            state['looked_up'] = state['looked_up'] | tokens
+
+        cut_short = []
+        matches = DuplicateDetector.score_candidates(
+            title, description,
+            _within_budget(_ranked_candidates(tokens, state, grows), deadline, cut_short),
+            threshold=config['DUPLICATE_SUGGEST_THRESHOLD'],
+            limit=config['DUPLICATE_SUGGEST_LIMIT']
+        )
+        state.update(
+            title=title,
+            description=description,
+            matches=tuple((candidate.id, score) for candidate, score in matches),
+            partial=bool(cut_short),
+        )
+        DUPLICATE_SUGGESTIONS.inc('partial' if state['partial'] else 'complete')
+        if cache is not None:
+            cache.set(key, state)
+
+    return {
+        'matches': [
+            (incident_id, state['candidates'][incident_id].title, score)
+            for incident_id, score in state['matches']
+        ],
+        'partial': state['partial'],
+    }
@@ -0,0 +1,96 @@
+"""
+Reuse of a duplicate check across the create/confirm round trip.
+When create_incident shows the duplicate warning, the check's outcome is
+stored in the session cache under a random id, and the form gets a signed
+token naming that id, the user and a hash of the checked fields. Confirming
+the creation reuses the stored outcome instead of running the check again,
+unless the fields were edited or an incident on the checked platform was
+added, removed or had its text or status changed since (the platform's
+duplicate generation moved on), in which case the caller recomputes.
+
+With the 'lru' backend the outcome is only found by the worker that stored
+it; set RESPONSE_CACHE_BACKEND=file for reuse across workers.
+"""
+
+import hashlib
+import secrets
+
+from flask import current_app
+from flask_login import current_user
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from app.utils.response_cache import MISSING, current_generation, duplicate_generation_name
+
+SALT = 'duplicate-check'
+TOKEN_MAX_AGE = 1800  # Seconds a warning can stay open before confirming re-checks
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=SALT)
+
+
+def form_fingerprint(title, description, platform):
+    """Hash of the fields the duplicate check depends on."""
+    payload = '\x1f'.join([title or '', description or '', platform or ''])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def remember_duplicate_check(result, title, description, platform):
+    """
+    Store a duplicate check's outcome and sign a token for the confirm form.
+
+    Args:
+        result (dict): DuplicateDetector.check_for_duplicates() result
+        title (str): Checked title
+        description (str): Checked description
+        platform (str): Checked platform
+
+    Returns:
+        str: Signed token, or None when the session cache is disabled
+    """
+    cache = current_app.extensions.get('session_cache')
+    if cache is None:
+        return None
+
+    check_id = secrets.token_urlsafe(16)
+    cache.set(f'duplicate_check:{check_id}', {
+        'generation': current_generation(duplicate_generation_name(platform)),
+        'is_duplicate': result['is_duplicate'],
+        'similar_incidents': [(incident.id, score) for incident, score in result['similar_incidents']],
+    })
+    return _serializer().dumps({
+        'check': check_id,
+        'user': current_user.id,
+        'form': form_fingerprint(title, description, platform),
+    })
+
+
+def recall_duplicate_check(token, title, description, platform):
+    """
+    Look up the outcome stored for a confirm token.
+
+    Args:
+        token (str): Token from the confirm form (may be missing or forged)
+        title (str): Submitted title
+        description (str): Submitted description
+        platform (str): Submitted platform
+
+    Returns:
+        dict: {'is_duplicate', 'similar_incidents': [(incident id, score), ...]},
+              or None if the check must be run again
+    """
+    cache = current_app.extensions.get('session_cache')
+    if not token or cache is None:
+        return None
+    try:
+        claims = _serializer().loads(token, max_age=TOKEN_MAX_AGE)
+    except BadSignature:  # Also covers expired tokens
+        return None
+    if claims.get('user') != current_user.id or \
+            claims.get('form') != form_fingerprint(title, description, platform):
+        return None
+
+    stored = cache.get(f"duplicate_check:{claims.get('check')}")
+    if stored is MISSING or stored['generation'] != current_generation(duplicate_generation_name(platform)):
+        return None
+    return {'is_duplicate': stored['is_duplicate'], 'similar_incidents': stored['similar_incidents']}
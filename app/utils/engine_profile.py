@@ -0,0 +1,59 @@
+"""
+SQLite engine tuning profile.
+Applies the PRAGMAs in SQLITE_PRAGMAS to every new SQLite connection, so
+each pooled connection of each worker runs with the same settings: WAL
+journaling (readers no longer block the writer), synchronous=NORMAL, a busy
+timeout instead of immediate 'database is locked' errors, memory-mapped
+reads and a larger page cache. Other databases are left untouched.
+"""
+
+from sqlalchemy import event
+
+from app import db
+
+
+def pragma_statements(pragmas):
+    """
+    Build the PRAGMA statements for a profile.
+
+    Args:
+        pragmas (dict): PRAGMA name -> value, applied in order
+
+    Returns:
+        list: SQL statements
+    """
+    return [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """
+    Run the PRAGMAs on every connection the engine opens.
+
+    Args:
+        engine (Engine): Engine to configure (ignored unless it is SQLite)
+        pragmas (dict): PRAGMA name -> value, applied in order
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    statements = pragma_statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def configure_engines(app):
+    """
+    Apply the application's SQLite profile to each of its engines (no connection is opened).
+
+    Args:
+        app (Flask): Application whose engines to configure
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_sqlite_pragmas(engine, app.config.get('SQLITE_PRAGMAS', {}))
@@ -0,0 +1,262 @@
+"""
+SQLite FTS5 full-text index over incident titles and descriptions.
+Pushes text matching into the database engine for the search page and
+for duplicate candidate retrieval. Databases without FTS5 (or not SQLite)
+fall back to LIKE matching and the inverted token index.
+"""
+
+import re
+
+from sqlalchemy import event, or_, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.models.incident import Incident
+from app.utils.text_processor import TextProcessor
+from app.utils.token_index import TokenIndex
+
+
+class FullTextIndex:
+    """
+    Maintains and queries the incidents_fts virtual table.
+    """
+
+    TABLE = 'incidents_fts'
+
+    # External-content table: rows live in incidents, triggers keep the index in sync
+    CREATE_STATEMENTS = (
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE}
+            USING fts5(title, description, content='incidents', content_rowid='id')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {TABLE}_ai AFTER INSERT ON incidents BEGIN
+                INSERT INTO {TABLE}(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {TABLE}_ad AFTER DELETE ON incidents BEGIN
+                INSERT INTO {TABLE}({TABLE}, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {TABLE}_au AFTER UPDATE OF title, description ON incidents BEGIN
+                INSERT INTO {TABLE}({TABLE}, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO {TABLE}(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END""",
+    )
+
+    # bm25 column weights (title, description), matching the 0.25/0.75 scorer split
+    BM25_WEIGHTS = (1.0, 3.0)
+
+    # Runs of letters and digits: the unicode61 tokenizer treats everything
+    # else (including '_' and '-') as a separator
+    TERM_PATTERN = re.compile(r'[^\W_]+')
+
+    @staticmethod
+    def create(connection):
+        """
+        Create the FTS5 table and its triggers if the SQLite build supports it.
+
+        Args:
+            connection (Connection): SQLAlchemy connection to run the DDL on
+
+        Returns:
+            bool: True if the index exists afterwards
+        """
+        if connection.dialect.name != 'sqlite':
+            return False
+        try:
+            for statement in FullTextIndex.CREATE_STATEMENTS:
+                connection.execute(text(statement))
+        except OperationalError:
+            # SQLite compiled without FTS5 ("no such module: fts5")
+            return False
+        return True
+
+    @staticmethod
+    def drop(connection):
+        """Drop the FTS5 table (its triggers go with the incidents table)."""
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text(f'DROP TABLE IF EXISTS {FullTextIndex.TABLE}'))
+
+    @staticmethod
+    def is_available():
+        """
+        Check whether the current database has the FTS5 index.
+
+        Returns:
+            bool: True if incidents_fts exists
+        """
+        if db.engine.dialect.name != 'sqlite':
+            return False
+        return db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': FullTextIndex.TABLE}
+        ).first() is not None
+
+    @staticmethod
+    def rebuild(connection=None):
+        """
+        Create the index if missing and repopulate it from the incidents table.
+
+        Args:
+            connection (Connection): Write inside this connection's transaction
+                                     instead of committing the session (migrations)
+
+        Returns:
+            bool: True if the index was rebuilt, False if FTS5 is unavailable
+        """
+        if connection is not None:
+            if not FullTextIndex.create(connection):
+                return False
+            connection.execute(text(f"INSERT INTO {FullTextIndex.TABLE}({FullTextIndex.TABLE}) VALUES ('rebuild')"))
+            return True
+
+        if not FullTextIndex.create(db.session.connection()):
+            db.session.rollback()
+            return False
+        db.session.execute(text(f"INSERT INTO {FullTextIndex.TABLE}({FullTextIndex.TABLE}) VALUES ('rebuild')"))
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def query_terms(query):
+        """
+        Split a search string into terms the way the index tokenised the text.
+
+        TextProcessor.preprocess_text would join 'AUTH_TIMEOUT' into
+        'authtimeout', which the index never contains; here it becomes
+        'auth' and 'timeout', as in the indexed row. Stop words are dropped.
+
+        Args:
+            query (str): Free-text search string
+
+        Returns:
+            list: Lowercase terms
+        """
+        return [term for term in FullTextIndex.TERM_PATTERN.findall((query or '').lower())
+                if term not in TextProcessor.STOP_WORDS]
+
+    @staticmethod
+    def build_match(tokens, operator='AND', prefix_last=False):
+        """
+        Build a safe FTS5 MATCH expression from query terms.
+
+        Terms contain letters and digits only (see query_terms and
+        TextProcessor.preprocess_text), and each is quoted, so user input can
+        never inject FTS5 query syntax.
+
+        Args:
+            tokens (list): Query terms or preprocessed tokens
+            operator (str): 'AND' or 'OR'
+            prefix_last (bool): Treat the final token as a prefix (search-as-you-type)
+
+        Returns:
+            str: MATCH expression
+        """
+        terms = [f'"{token}"' for token in tokens]
+        if prefix_last and terms:
+            terms[-1] += '*'
+        return f' {operator} '.join(terms)
+
+    @staticmethod
+    def _matching_ids(match, platform=None, status=None, limit=50):
+        """Run a ranked MATCH query and return incident ids, best first."""
+        sql = (
+            f'SELECT incidents.id FROM {FullTextIndex.TABLE} '
+            f'JOIN incidents ON incidents.id = {FullTextIndex.TABLE}.rowid '
+            f'WHERE {FullTextIndex.TABLE} MATCH :match'
+        )
+        params = {'match': match, 'limit': limit}
+        if platform:
+            sql += ' AND incidents.platform = :platform'
+            params['platform'] = platform
+        if status:
+            sql += ' AND incidents.status = :status'
+            params['status'] = status
+        title_weight, description_weight = FullTextIndex.BM25_WEIGHTS
+        sql += (f' ORDER BY bm25({FullTextIndex.TABLE}, {title_weight}, {description_weight}), '
+                f'incidents.id DESC LIMIT :limit')
+
+        return [row[0] for row in db.session.execute(text(sql), params)]
+
+    @staticmethod
+    def search(query, platform=None, limit=50):
+        """
+        Search incidents whose title or description contain every query term.
+
+        Args:
+            query (str): Free-text search string
+            platform (str): Optional platform filter
+            limit (int): Maximum number of incidents to return
+
+        Returns:
+            list: Incident objects, best match first (newest first in fallback mode)
+        """
+        tokens = FullTextIndex.query_terms(query)
+        if not tokens:
+            return []
+
+        if FullTextIndex.is_available():
+            incident_ids = FullTextIndex._matching_ids(
+                FullTextIndex.build_match(tokens, prefix_last=True), platform=platform, limit=limit
+            )
+            incidents = {
+                incident.id: incident
+                for incident in Incident.query.filter(Incident.id.in_(incident_ids)).all()
+            } if incident_ids else {}
+            return [incidents[incident_id] for incident_id in incident_ids if incident_id in incidents]
+
+        # Fallback: every token must appear in the title or description
+        search_query = Incident.query
+        for token in tokens:
+            pattern = f'%{token}%'
+            search_query = search_query.filter(or_(
+                Incident.title.ilike(pattern), Incident.description.ilike(pattern)
+            ))
+        if platform:
+            search_query = search_query.filter(Incident.platform == platform)
+        return search_query.order_by(Incident.created_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def candidate_ids(title, description, platform, limit=200):
+        """
+        Find open incidents on a platform matching any term of an incident's text, ranked by bm25.
+        Falls back to the inverted token index when FTS5 is unavailable.
+
+        The MATCH terms come from query_terms, so they line up with what the
+        index holds; the preprocessed TokenIndex tokens are only used by the
+        fallback, whose postings were built from them.
+
+        Args:
+            title (str): Incident title
+            description (str): Incident description
+            platform (str): Platform name (Additiv/Avaloq)
+            limit (int): Maximum number of candidate ids to return
+
+        Returns:
+            list: Incident ids, best match first
+        """
+        if not FullTextIndex.is_available():
+            tokens = TokenIndex.tokens_for(title, description)
+            return TokenIndex.candidate_ids(tokens, platform, limit=limit) if tokens else []
+
+        terms = sorted(set(FullTextIndex.query_terms(f'{title or ""} {description or ""}')))
+        if not terms:
+            return []
+        return FullTextIndex._matching_ids(
+            FullTextIndex.build_match(terms, operator='OR'),
+            platform=platform,
+            status=TokenIndex.INDEXED_STATUS,
+            limit=limit
+        )
+
+
+@event.listens_for(Incident.__table__, 'after_create')
+def _create_fts_index(target, connection, **kw):
+    """Create the FTS5 index alongside the incidents table."""
+    FullTextIndex.create(connection)
+
+
+@event.listens_for(Incident.__table__, 'before_drop')
+def _drop_fts_index(target, connection, **kw):
+    """Drop the FTS5 index before the incidents table it mirrors."""
+    FullTextIndex.drop(connection)
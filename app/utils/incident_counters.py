@@ -0,0 +1,190 @@
+"""
+Write-maintained incident counters.
+Keeps incident_counters in step with every ORM insert, update and delete of
+an incident, inside the same transaction, so dashboards read a handful of
+counter rows instead of scanning the incidents table.
+"""
+
+from sqlalchemy import and_, bindparam, event, func, inspect
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_counter import IncidentCounter
+from app.utils.response_cache import bump_generation
+
+
+class IncidentCounters:
+    """
+    Maintains and queries the incident_counters table.
+
+    Bulk statements that bypass the ORM (Query.delete, core UPDATEs) are not
+    seen by the flush hook; run repair_incident_counters.py after them.
+    """
+
+    # Incident columns that make up a counter key
+    KEY_FIELDS = ('priority', 'status', 'platform', 'assigned_team')
+
+    @staticmethod
+    def _committed_value(state, field):
+        """Value of a field as last loaded from or written to the database."""
+        history = state.attrs[field].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.unchanged:
+            return history.unchanged[0]
+        return getattr(state.obj(), field)
+
+    @staticmethod
+    def _key(obj):
+        return tuple(getattr(obj, field) for field in IncidentCounters.KEY_FIELDS)
+
+    @staticmethod
+    def _committed_key(obj):
+        state = inspect(obj)
+        return tuple(IncidentCounters._committed_value(state, field) for field in IncidentCounters.KEY_FIELDS)
+
+    @staticmethod
+    def removed_keys(session):
+        """
+        Counter keys leaving a flush: stored keys of changed and deleted incidents.
+
+        Must run in before_flush, while deleted rows can still be loaded.
+
+        Returns:
+            list: Counter key tuples to decrement
+        """
+        keys = []
+        for obj in session.dirty:
+            if isinstance(obj, Incident):
+                state = inspect(obj)
+                if any(state.attrs[field].history.has_changes() for field in IncidentCounters.KEY_FIELDS):
+                    keys.append(IncidentCounters._committed_key(obj))
+        for obj in session.deleted:
+            if isinstance(obj, Incident):
+                keys.append(IncidentCounters._committed_key(obj))
+        return keys
+
+    @staticmethod
+    def added_keys(session):
+        """
+        Counter keys entering a flush: current keys of new and changed incidents.
+
+        Must run in after_flush, when inserted rows have their column
+        defaults but new/dirty and attribute history still describe the flush.
+
+        Returns:
+            list: Counter key tuples to increment
+        """
+        keys = []
+        for obj in session.new:
+            if isinstance(obj, Incident):
+                keys.append(IncidentCounters._key(obj))
+        for obj in session.dirty:
+            if isinstance(obj, Incident):
+                state = inspect(obj)
+                if any(state.attrs[field].history.has_changes() for field in IncidentCounters.KEY_FIELDS):
+                    keys.append(IncidentCounters._key(obj))
+        return keys
+
+    @staticmethod
+    def apply(connection, deltas):
+        """
+        Add deltas to the counter rows, creating rows for new combinations.
+
+        Uses UPDATE then INSERT rather than a dialect-specific upsert.
+
+        Args:
+            connection (Connection): Connection in the flushing transaction
+            deltas (dict): Counter key tuple -> change in count
+        """
+        table = IncidentCounter.__table__
+        update = table.update().where(and_(*(
+            table.c[field] == bindparam(f'k_{field}') for field in IncidentCounters.KEY_FIELDS
+        ))).values(count=table.c['count'] + bindparam('k_delta'))
+
+        for key, amount in deltas.items():
+            params = {f'k_{field}': value for field, value in zip(IncidentCounters.KEY_FIELDS, key)}
+            params['k_delta'] = amount
+            if connection.execute(update, params).rowcount == 0:
+                connection.execute(table.insert().values(
+                    count=amount, **dict(zip(IncidentCounters.KEY_FIELDS, key))
+                ))
+
+    @staticmethod
+    def rebuild(connection=None):
+        """
+        Recount every counter row from the incidents table.
+
+        Args:
+            connection (Connection): Write inside this connection's transaction
+                                     instead of committing the session (migrations)
+
+        Returns:
+            int: Number of counter rows written
+        """
+        table = IncidentCounter.__table__
+        key_columns = [getattr(Incident, field) for field in IncidentCounters.KEY_FIELDS]
+        executor = connection if connection is not None else db.session
+
+        executor.execute(table.delete())
+        executor.execute(table.insert().from_select(
+            list(IncidentCounters.KEY_FIELDS) + ['count'],
+            db.select(*key_columns, func.count(Incident.id)).group_by(*key_columns)
+        ))
+        # Counts may have changed behind the ORM (bulk loads), so drop cached dashboards
+        bump_generation(connection if connection is not None else db.session.connection())
+        if connection is None:
+            db.session.commit()
+        return executor.execute(db.select(func.count()).select_from(table)).scalar()
+
+    @staticmethod
+    def totals(*fields):
+        """
+        Sum counters grouped by some of the key fields, in one query.
+
+        Args:
+            *fields (str): Key fields to group by (none gives the grand total)
+
+        Returns:
+            list: (field values..., count) rows
+        """
+        columns = [getattr(IncidentCounter, field) for field in fields]
+        return db.session.query(
+            *columns, func.coalesce(func.sum(IncidentCounter.count), 0)
+        ).group_by(*columns).all()
+
+
+def _load_committed_value(target, value, oldvalue, initiator):
+    """No-op set listener; registering it with active_history keeps the old key value."""
+
+
+def _collect_removed_before_flush(session, flush_context, instances):
+    """Session hook: note the stored keys of incidents changed or deleted in this flush."""
+    session.info['incident_counter_removed'] = IncidentCounters.removed_keys(session)
+
+
+def _update_counters_after_flush(session, flush_context):
+    """Session hook: apply this flush's incident changes to the counters."""
+    deltas = {}
+    for key in session.info.pop('incident_counter_removed', []):
+        deltas[key] = deltas.get(key, 0) - 1
+    for key in IncidentCounters.added_keys(session):
+        deltas[key] = deltas.get(key, 0) + 1
+
+    deltas = {key: amount for key, amount in deltas.items() if amount}
+    if deltas:
+        IncidentCounters.apply(session.connection(), deltas)
+
+
+def register_counter_listeners():
+    """Attach the counter maintenance hooks to the application session (idempotent)."""
+    # Without active history, assigning to an expired attribute forgets the old value
+    for field in IncidentCounters.KEY_FIELDS:
+        attribute = getattr(Incident, field)
+        if not event.contains(attribute, 'set', _load_committed_value):
+            event.listen(attribute, 'set', _load_committed_value, active_history=True)
+
+    if not event.contains(db.session, 'before_flush', _collect_removed_before_flush):
+        event.listen(db.session, 'before_flush', _collect_removed_before_flush)
+    if not event.contains(db.session, 'after_flush', _update_counters_after_flush):
+        event.listen(db.session, 'after_flush', _update_counters_after_flush)
@@ -0,0 +1,191 @@
+"""
+Shared multi-pattern keyword matcher for incident triage.
+Either checks the one category a rule needs (plain substring checks, as the
+original if-chains did) or scans an incident description once and reports
+every keyword category it contains. The triage keyword categories
+themselves live in app/triage_rules.json.
+"""
+
+from bisect import bisect_right
+from collections import deque
+from itertools import compress
+
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick automaton: finds every occurrence of many patterns in one
+    left-to-right pass, in time linear in the text whatever the pattern count.
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns (dict): Pattern string -> set of labels reported when it occurs
+        """
+        self._goto = [{}]
+        self._output = [set()]
+
+        # Build the trie
+        for pattern, labels in patterns.items():
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    self._goto.append({})
+                    self._output.append(set())
+                    next_node = len(self._goto) - 1
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node].update(labels)
+
+        # Breadth-first pass to add failure links and merge outputs along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] |= self._output[self._fail[child]]
+
+        self._output = [frozenset(labels) for labels in self._output]
+
+    def search(self, text):
+        """
+        Return the union of labels for every pattern occurring in text.
+
+        Args:
+            text (str): Text to scan (matched case-sensitively)
+
+        Returns:
+            set: Labels of all patterns found
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found |= output[node]
+        return found
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher mapping keyword categories to case-insensitive keywords.
+
+    Matching is plain substring containment, exactly like
+    `any(keyword in text.lower() for keyword in keywords)`. For small keyword
+    sets CPython's C-level substring search beats a pure-Python automaton
+    (see tests/benchmarks/bench_triage.py), so the automaton is only used once
+    the keyword count passes AUTOMATON_MIN_KEYWORDS. Below that, rules check
+    one category at a time with has_category, stopping at the first hit.
+    """
+
+    AUTOMATON_MIN_KEYWORDS = 150
+
+    def __init__(self, categories):
+        """
+        Args:
+            categories (dict): Category name -> iterable of keywords
+        """
+        # Each distinct keyword is checked once, however many categories share it
+        keywords = {}
+        for category, words in categories.items():
+            for word in words:
+                keywords.setdefault(word.lower(), set()).add(category)
+
+        self.categories = frozenset(categories)
+        self.category_words = {
+            category: tuple(dict.fromkeys(word.lower() for word in words))
+            for category, words in categories.items()
+        }
+        self._words = tuple(keywords)
+        self._word_categories = tuple(frozenset(cats) for cats in keywords.values())
+        self._automaton = None
+        if len(keywords) >= self.AUTOMATON_MIN_KEYWORDS:
+            self._automaton = AhoCorasickAutomaton(keywords)
+
+    @property
+    def uses_automaton(self):
+        """Whether full scans run the automaton (and per-category checks would cost a scan each)."""
+        return self._automaton is not None
+
+    def has_category(self, lowered, category):
+        """
+        Check one category with plain substring tests, stopping at the first hit.
+
+        Args:
+            lowered (str): Text already lowercased by the caller
+            category (str): Category name
+
+        Returns:
+            bool: True if any of the category's keywords occurs in the text
+        """
+        return any(map(lowered.__contains__, self.category_words[category]))
+
+    def match(self, text):
+        """
+        Find every category with at least one keyword in the text.
+
+        Args:
+            text (str): Text to scan (case-insensitive)
+
+        Returns:
+            frozenset: Matched category names
+        """
+        text = (text or '').lower()
+        if self._automaton is not None:
+            return frozenset(self._automaton.search(text))
+
+        # map/compress keep the per-keyword loop in C
+        return frozenset().union(*compress(self._word_categories, map(text.__contains__, self._words)))
+
+    def match_many(self, texts):
+        """
+        Find matching categories for many texts at once.
+
+        With the substring strategy the texts are joined into one corpus
+        (separated by NUL, which no keyword contains) and each keyword is
+        found with repeated C-level str.find calls, skipping to the next text
+        after a hit, instead of one search per keyword per text.
+
+        Args:
+            texts (iterable): Texts to scan (case-insensitive)
+
+        Returns:
+            dict: Category name -> set of indexes of the texts it matched
+        """
+        lowered = [(text or '').lower() for text in texts]
+        rows = {category: set() for category in self.categories}
+
+        if self._automaton is not None:
+            for index, text in enumerate(lowered):
+                for category in self._automaton.search(text):
+                    rows[category].add(index)
+            return rows
+
+        corpus = '\0'.join(lowered)
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        starts.append(offset)
+
+        for word, categories in zip(self._words, self._word_categories):
+            hits = set()
+            position = corpus.find(word)
+            while position != -1:
+                index = bisect_right(starts, position) - 1
+                hits.add(index)
+                position = corpus.find(word, starts[index + 1])
+            for category in categories:
+                rows[category] |= hits
+        return rows
@@ -0,0 +1,202 @@
+"""
+MinHash/LSH index for near-duplicate candidate retrieval.
+Stores one compact signature per incident and one bucket row per band for
+every open incident, so lookups touch only incidents sharing a band.
+"""
+
+from flask import current_app
+from sqlalchemy import bindparam, event, func, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_lsh_bucket import IncidentLshBucket
+from app.utils.text_processor import MinHasher
+from app.utils.token_index import TokenIndex, incidents_to_reindex
+
+
+class LshIndex:
+    """
+    Maintains and queries the incident_lsh_buckets table.
+    """
+
+    # Hashers keyed by (num_perm, bands, seed) so the coefficients are built once
+    _hashers = {}
+
+    @staticmethod
+    def get_hasher():
+        """
+        Return the MinHasher configured for the current application.
+
+        Returns:
+            MinHasher: Shared hasher instance
+        """
+        key = (
+            current_app.config.get('MINHASH_NUM_PERM', 64),
+            current_app.config.get('MINHASH_BANDS', 16),
+            current_app.config.get('MINHASH_SEED', 1)
+        )
+        if key not in LshIndex._hashers:
+            LshIndex._hashers[key] = MinHasher(num_perm=key[0], bands=key[1], seed=key[2])
+        return LshIndex._hashers[key]
+
+    @staticmethod
+    def signature_for(title, description):
+        """
+        Compute the signature for an incident's text.
+
+        Returns:
+            array: MinHash signature, or None when the text has no tokens
+        """
+        tokens = TokenIndex.tokens_for(title, description)
+        if not tokens:
+            return None
+        return LshIndex.get_hasher().signature(tokens)
+
+    @staticmethod
+    def signature_for_incident(incident):
+        """
+        Compute the signature for a stored incident from its cached tokens.
+
+        Returns:
+            array: MinHash signature, or None when the incident has no tokens
+        """
+        tokens = set(incident.title_token_list) | set(incident.description_token_list)
+        if not tokens:
+            return None
+        return LshIndex.get_hasher().signature(tokens)
+
+    @staticmethod
+    def sync_incident(incident, text_changed=True):
+        """
+        Refresh an incident's signature and band buckets.
+
+        Args:
+            incident (Incident): Incident pending in the current session
+            text_changed (bool): Recompute the signature (otherwise reuse the stored one)
+        """
+        hasher = LshIndex.get_hasher()
+
+        if text_changed or incident.minhash_signature is None:
+            signature = LshIndex.signature_for_incident(incident)
+            incident.minhash_signature = MinHasher.to_bytes(signature) if signature else None
+
+        wanted = set()
+        if incident.status == TokenIndex.INDEXED_STATUS and incident.minhash_signature:
+            wanted = set(hasher.band_keys(MinHasher.from_bytes(incident.minhash_signature)))
+
+        current = {row.bucket: row for row in incident.lsh_buckets}
+        for bucket, row in current.items():
+            if bucket not in wanted:
+                incident.lsh_buckets.remove(row)
+
+        for bucket in wanted - current.keys():
+            incident.lsh_buckets.append(IncidentLshBucket(bucket=bucket))
+
+    @staticmethod
+    def candidate_ids(title, description, platform, limit=200):
+        """
+        Find open incidents on a platform sharing at least one LSH band.
+
+        Args:
+            title (str): Incident title
+            description (str): Incident description
+            platform (str): Platform name (Additiv/Avaloq)
+            limit (int): Maximum number of candidate ids to return
+
+        Returns:
+            list: Incident ids, those colliding in the most bands first
+        """
+        signature = LshIndex.signature_for(title, description)
+        if signature is None:
+            return []
+
+        keys = LshIndex.get_hasher().band_keys(signature)
+        collisions = func.count(IncidentLshBucket.id).label('collisions')
+        rows = db.session.query(IncidentLshBucket.incident_id, collisions).join(
+            Incident, Incident.id == IncidentLshBucket.incident_id
+        ).filter(
+            IncidentLshBucket.bucket.in_(keys),
+            Incident.platform == platform,
+            Incident.status == TokenIndex.INDEXED_STATUS
+        ).group_by(
+            IncidentLshBucket.incident_id
+        ).order_by(
+            collisions.desc(), IncidentLshBucket.incident_id.desc()
+        ).limit(limit).all()
+
+        return [incident_id for incident_id, _ in rows]
+
+    @staticmethod
+    def rebuild(batch_size=1000, connection=None):
+        """
+        Recompute every signature and bucket from the incidents table.
+        Needed after changing MINHASH_* settings or upgrading an existing database.
+
+        Args:
+            batch_size (int): Number of incidents processed per batch
+            connection (Connection): Write inside this connection's transaction
+                                     instead of committing the session (migrations)
+
+        Returns:
+            int: Number of incidents signed
+        """
+        hasher = LshIndex.get_hasher()
+        # A session joined to the caller's transaction never commits it
+        session = db.session if connection is None else Session(bind=connection)
+        session.execute(IncidentLshBucket.__table__.delete())
+
+        signed = 0
+        last_id = 0
+        while True:
+            rows = session.query(Incident).filter(
+                Incident.id > last_id
+            ).order_by(Incident.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            signatures = []
+            buckets = []
+            for incident in rows:
+                signature = LshIndex.signature_for_incident(incident)
+                packed = MinHasher.to_bytes(signature) if signature else None
+                signatures.append({'b_id': incident.id, 'signature': packed})
+                if signature and incident.status == TokenIndex.INDEXED_STATUS:
+                    buckets.extend(
+                        {'bucket': key, 'incident_id': incident.id}
+                        for key in hasher.band_keys(signature)
+                    )
+
+            table = Incident.__table__
+            session.execute(
+                table.update().where(table.c.id == bindparam('b_id')).values(
+                    minhash_signature=bindparam('signature')
+                ),
+                signatures
+            )
+            if buckets:
+                session.execute(IncidentLshBucket.__table__.insert(), buckets)
+
+            signed += len(rows)
+            last_id = rows[-1].id
+            session.expunge_all()  # Keep memory flat across batches
+
+        if connection is None:
+            db.session.commit()
+        return signed
+
+
+def _sync_lsh_before_flush(session, flush_context, instances):
+    """Session hook: re-sign incidents whose text or status changed in this flush."""
+    for incident in incidents_to_reindex(session):
+        state = inspect(incident)
+        text_changed = state.pending or any(
+            state.attrs[field].history.has_changes() for field in ('title', 'description')
+        )
+        LshIndex.sync_incident(incident, text_changed=text_changed)
+
+
+def register_lsh_listeners():
+    """Attach the LSH maintenance hook to the application session (idempotent)."""
+    if not event.contains(db.session, 'before_flush', _sync_lsh_before_flush):
+        event.listen(db.session, 'before_flush', _sync_lsh_before_flush)
@@ -0,0 +1,439 @@
+"""
+Prometheus-format application metrics.
+Counters, histograms and gauges for HTTP requests, triage calls, duplicate
+detection, the response cache and the database pool, served as text at /metrics.
+
+Recording is lock-free: each thread adds into its own shard (a plain dict),
+and shards are only summed when metrics are collected. Under a pre-fork
+server such as gunicorn each worker periodically writes its totals to
+METRICS_MULTIPROC_DIR, and /metrics merges every worker's file, so any
+worker can answer a scrape for the whole server. Files of exited workers
+are folded into one archive file, so the directory does not grow with
+worker restarts and totals never go backwards.
+"""
+
+import json
+import os
+import secrets
+import threading
+from bisect import bisect_left
+from time import monotonic, perf_counter
+
+from flask import request
+
+# Histogram bucket upper bounds (seconds unless noted)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TRIAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+DUPLICATE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+CANDIDATE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 200, 500)  # Incidents scored
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# In METRICS_MULTIPROC_DIR: counters and histograms of exited workers, and
+# the lock serialising scrapes against folding files into it
+ARCHIVE_FILE = 'archive.json'
+LOCK_FILE = 'metrics.lock'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named metric with fixed label names."""
+
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self, samples):
+        """
+        Format this metric's samples in the Prometheus text format.
+
+        Args:
+            samples (dict): Label values tuple -> aggregated value
+
+        Returns:
+            list: Exposition lines
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for labels, value in sorted(samples.items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}')
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets, with sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=HTTP_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        state = shard.get(key)
+        if state is None:
+            # One (non-cumulative) count per bucket, one for +Inf, then the sum
+            state = shard[key] = [0] * (len(self.buckets) + 2)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def render(self, samples):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for labels, state in sorted(samples.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, [('le', _format_number(float(bound)))])
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_number(float(state[-1]))}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class Gauge(Metric):
+    """Point-in-time values read by a callback when metrics are collected."""
+
+    kind = 'gauge'
+
+    def __init__(self, registry, name, documentation, labelnames=(), collect=None):
+        super().__init__(registry, name, documentation, labelnames)
+        self.collect = collect
+
+    def read(self):
+        """Current values as label values tuple -> number (empty on failure)."""
+        try:
+            return dict(self.collect()) if self.collect else {}
+        except Exception:
+            return {}
+
+
+class MetricsRegistry:
+    """
+    Holds the metric definitions and the per-thread shards they record into.
+
+    Args:
+        multiproc_dir (str): Directory shared by all worker processes, or None
+                             for a single process
+    """
+
+    def __init__(self, multiproc_dir=None):
+        self.metrics = {}
+        self.multiproc_dir = multiproc_dir
+        self._start_process()
+
+    def _start_process(self):
+        """Fresh sample storage and file name for this process."""
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._last_flush = monotonic()
+        # The random part keeps a reused PID from overwriting a dead worker's file
+        self._file_id = f'{os.getpid()}-{secrets.token_hex(4)}'
+
+    def after_fork(self):
+        """
+        Reinitialise in a forked child (registered with os.register_at_fork).
+
+        A worker must not report the samples it inherited from the master,
+        and must not inherit a lock another master thread held at fork time.
+        """
+        self._start_process()
+
+    def shard(self):
+        """This thread's sample dict; the lock is only taken on a thread's first sample."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def reset(self):
+        """Drop every sample recorded by this process (used by tests)."""
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f'Duplicate metric name: {metric.name}')
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=HTTP_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None):
+        return self._register(Gauge(self, name, documentation, labelnames, collect))
+
+    def snapshot(self):
+        """
+        Sum this process's shards and read its gauges.
+
+        Returns:
+            dict: (metric name, label values tuple) -> number or histogram state
+        """
+        totals = {}
+        with self._shards_lock:
+            shards = [dict(shard) for shard in self._shards]
+        for shard in shards:
+            for key, value in shard.items():
+                if isinstance(value, list):
+                    current = totals.get(key)
+                    totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        for metric in self.metrics.values():
+            if isinstance(metric, Gauge):
+                for labels, value in metric.read().items():
+                    totals[(metric.name, tuple(labels))] = value
+        return totals
+
+    # ----- Multi-process aggregation -----
+
+    def _process_file(self):
+        return os.path.join(self.multiproc_dir, f'metrics-{self._file_id}.json')
+
+    @staticmethod
+    def _file_pid(filename):
+        """PID of a worker file (metrics-<pid>-<random>.json), or None for other files."""
+        if not (filename.startswith('metrics-') and filename.endswith('.json')):
+            return None
+        try:
+            return int(filename[len('metrics-'):-len('.json')].split('-')[0])
+        except ValueError:
+            return None
+
+    def flush(self, interval=None):
+        """
+        Write this process's snapshot for the other workers to merge.
+
+        Args:
+            interval (float): Skip the write if the last one was more recent
+                              than this many seconds
+        """
+        if not self.multiproc_dir:
+            return
+        if interval is not None and monotonic() - self._last_flush < interval:
+            return
+        self._last_flush = monotonic()
+
+        rows = [[name, list(labels), value] for (name, labels), value in self.snapshot().items()]
+        path = self._process_file()
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as handle:
+            json.dump(rows, handle)
+        os.replace(temp_path, path)  # Readers never see a half-written file
+
+    @staticmethod
+    def _process_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    @staticmethod
+    def _merge(totals, rows, metrics, include_gauges=True):
+        """Add exported rows into totals, skipping unknown metrics (and gauges if asked)."""
+        for name, labels, value in rows:
+            metric = metrics.get(name)
+            if metric is None or (isinstance(metric, Gauge) and not include_gauges):
+                continue
+            key = (name, tuple(labels))
+            current = totals.get(key)
+            if isinstance(value, list):
+                totals[key] = value if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                totals[key] = (current or 0) + value
+
+    def _read_rows(self, filename):
+        try:
+            with open(os.path.join(self.multiproc_dir, filename)) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _archive_dead_workers(self, filenames):
+        """
+        Fold the files of exited workers into the archive and delete them.
+        Call with the exclusive lock held.
+        """
+        dead = [name for name in filenames
+                if self._file_pid(name) is not None and not self._process_alive(self._file_pid(name))]
+        if not dead:
+            return
+
+        archived = {}
+        self._merge(archived, self._read_rows(ARCHIVE_FILE) or [], self.metrics)
+        for filename in dead:
+            self._merge(archived, self._read_rows(filename) or [], self.metrics, include_gauges=False)
+
+        path = os.path.join(self.multiproc_dir, ARCHIVE_FILE)
+        with open(f'{path}.tmp', 'w') as handle:
+            json.dump([[name, list(labels), value] for (name, labels), value in archived.items()], handle)
+        os.replace(f'{path}.tmp', path)
+        for filename in dead:
+            os.remove(os.path.join(self.multiproc_dir, filename))
+
+    def collect(self):
+        """
+        Aggregate samples across every worker process.
+
+        Counters and histograms of exited workers are kept (in the archive)
+        so totals never go backwards; gauges only count live workers.
+
+        Returns:
+            dict: (metric name, label values tuple) -> aggregated value
+        """
+        if not self.multiproc_dir:
+            return self.snapshot()
+
+        import fcntl  # Multi-process mode runs under pre-fork servers, i.e. on Unix
+
+        self.flush()
+        with open(os.path.join(self.multiproc_dir, LOCK_FILE), 'a') as lock:
+            # Held while reading too, so no scrape sees a file both archived and live
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._archive_dead_workers(os.listdir(self.multiproc_dir))
+
+            totals = {}
+            for filename in os.listdir(self.multiproc_dir):
+                if filename == ARCHIVE_FILE or self._file_pid(filename) is not None:
+                    self._merge(totals, self._read_rows(filename) or [], self.metrics)
+        return totals
+
+    def render(self):
+        """Collect every metric and format the Prometheus text exposition."""
+        samples = {}
+        for (name, labels), value in self.collect().items():
+            samples.setdefault(name, {})[labels] = value
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.extend(metric.render(samples.get(name, {})))
+        return '\n'.join(lines) + '\n'
+
+
+def bind_label(key):
+    """Label value for a Flask-SQLAlchemy bind key (None is the primary database)."""
+    return key or 'default'
+
+
+def _pool_usage():
+    """Connection pool gauges for every engine of the application, by bind."""
+    from app import db
+
+    usage = {}
+    for key, engine in db.engines.items():
+        pool = engine.pool
+        for state, method in (('checked_out', 'checkedout'), ('idle', 'checkedin'), ('overflow', 'overflow')):
+            if hasattr(pool, method):
+                usage[(bind_label(key), state)] = getattr(pool, method)()
+    return usage
+
+REGISTRY = MetricsRegistry()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=REGISTRY.after_fork)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests by endpoint, method and status.',
+    ('endpoint', 'method', 'status')
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by endpoint.',
+    ('endpoint',), HTTP_BUCKETS
+)
+TRIAGE_LATENCY = REGISTRY.histogram(
+    'triage_call_duration_seconds', 'Latency of predict_priority, assign_team and triage_incident calls.',
+    ('function',), TRIAGE_BUCKETS
+)
+DUPLICATE_CHECKS = REGISTRY.counter(
+    'duplicate_checks_total', 'Duplicate checks by result (duplicate or unique).',
+    ('result',)
+)
+DUPLICATE_LATENCY = REGISTRY.histogram(
+    'duplicate_check_duration_seconds', 'Latency of DuplicateDetector.check_for_duplicates.',
+    (), DUPLICATE_BUCKETS
+)
+DUPLICATE_CANDIDATES = REGISTRY.histogram(
+    'duplicate_check_candidates', 'Candidate incidents scored per duplicate check, by backend.',
+    ('backend',), CANDIDATE_BUCKETS
+)
+DUPLICATE_SUGGESTIONS = REGISTRY.counter(
+    'duplicate_suggestions_total', 'Live duplicate suggestion requests by outcome (reused, complete or partial).',
+    ('outcome',)
+)
+RESPONSE_CACHE_LOOKUPS = REGISTRY.counter(
+    'response_cache_lookups_total', 'Versioned response cache lookups by entry and result (hit or miss).',
+    ('entry', 'result')
+)
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    'db_pool_connections', 'Database pool connections by bind and state.',
+    ('bind', 'state'), _pool_usage
+)
+
+
+def register_metrics(app):
+    """
+    Record HTTP request metrics and share them between workers.
+
+    Args:
+        app (Flask): Application to instrument
+    """
+    REGISTRY.multiproc_dir = app.config.get('METRICS_MULTIPROC_DIR')
+    if REGISTRY.multiproc_dir:
+        os.makedirs(REGISTRY.multiproc_dir, exist_ok=True)
+    flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5)
+
+    @app.before_request
+    def start_request_timer():
+        request.environ['metrics.started'] = perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = request.environ.get('metrics.started')
+        if started is not None:
+            endpoint = request.endpoint or 'unmatched'
+            HTTP_REQUESTS.inc(endpoint, request.method, str(response.status_code))
+            HTTP_LATENCY.observe(perf_counter() - started, endpoint)
+        REGISTRY.flush(interval=flush_interval)
+        return response
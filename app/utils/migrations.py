@@ -0,0 +1,228 @@
+"""
+Schema migrations for existing databases.
+db.create_all() creates missing tables but never alters a table that already
+exists, so columns and indexes added to existing models are applied here.
+Applied versions are recorded in the schema_migrations table.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import inspect, select, text
+
+from app import db
+
+# Created by db.create_all() like any model table
+schema_migrations = db.Table(
+    'schema_migrations',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('name', db.String(100), nullable=False),
+    db.Column('applied_at', db.DateTime, default=datetime.utcnow, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema change, applied at most once per database."""
+
+    version: int
+    name: str
+    apply: Callable
+
+
+# Registered migrations, in version order
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """
+    Register a migration function.
+
+    A fresh database built by db.create_all() already has the final schema,
+    so every migration must be a no-op when its change is already present.
+
+    Args:
+        version (int): Unique, increasing version number
+        name (str): Short description stored with the applied version
+    """
+    def register(func):
+        if any(existing.version == version for existing in MIGRATIONS):
+            raise ValueError(f'Duplicate migration version: {version}')
+        MIGRATIONS.append(Migration(version, name, func))
+        MIGRATIONS.sort(key=lambda item: item.version)
+        return func
+    return register
+
+
+def add_missing_columns(connection, table):
+    """Add the nullable columns of a model table that the database lacks."""
+    existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing and column.nullable:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
+def create_indexes(connection, table, *names):
+    """Create the named indexes declared on a model table, skipping existing ones."""
+    indexes = {index.name: index for index in table.indexes}
+    for name in names:
+        indexes[name].create(connection, checkfirst=True)
+
+
+@migration(1, 'incident cache columns')
+def _incident_cache_columns(connection):
+    """Token caches, MinHash signature and cluster id on incidents."""
+    from app.models.incident import Incident
+
+    add_missing_columns(connection, Incident.__table__)
+    create_indexes(connection, Incident.__table__, 'ix_incidents_cluster_id')
+
+
+@migration(2, 'incident list keyset indexes')
+def _incident_list_keyset_indexes(connection):
+    """(filter column, created_at, id) indexes behind the paginated incident list."""
+    from app.models.incident import Incident
+
+    create_indexes(
+        connection, Incident.__table__,
+        'ix_incidents_created_id',
+        'ix_incidents_priority_created_id',
+        'ix_incidents_status_created_id',
+        'ix_incidents_platform_created_id',
+        'ix_incidents_team_created_id',
+    )
+
+
+@migration(3, 'duplicate check and audit log indexes')
+def _duplicate_and_audit_indexes(connection):
+    """Open-incidents-per-platform scans and audit log ordering and lookups."""
+    from app.models.audit_log import AuditLog
+    from app.models.incident import Incident
+
+    create_indexes(connection, Incident.__table__, 'ix_incidents_platform_status_created')
+    create_indexes(
+        connection, AuditLog.__table__,
+        'ix_audit_logs_changed_at_id',
+        'ix_audit_logs_incident_changed_at',
+    )
+
+
+def _is_empty(connection, table, *criteria):
+    """Whether a table has no rows (matching the criteria)."""
+    return connection.execute(select(table.c[0]).where(*criteria).limit(1)).first() is None
+
+
+@migration(4, 'backfill incident counters')
+def _backfill_incident_counters(connection):
+    """
+    Count existing incidents into incident_counters.
+
+    The write listeners only maintain the counters from then on, so until
+    this runs the dashboards of an upgraded database show zeros. Runs in the
+    migration's transaction, so a failed backfill is not recorded as applied.
+    """
+    from app.models.incident import Incident
+    from app.models.incident_counter import IncidentCounter
+    from app.utils.incident_counters import IncidentCounters
+
+    if _is_empty(connection, IncidentCounter.__table__) and not _is_empty(connection, Incident.__table__):
+        IncidentCounters.rebuild(connection)
+
+
+@migration(5, 'backfill duplicate token index')
+def _backfill_token_index(connection):
+    """
+    Index the open incidents of a database created before incident_tokens.
+
+    Until this runs, the index backend of duplicate detection finds no
+    candidates. Runs in the migration's transaction, like migration 4.
+    """
+    from app.models.incident import Incident
+    from app.models.incident_token import IncidentToken
+    from app.utils.token_index import TokenIndex
+
+    incidents = Incident.__table__
+    if _is_empty(connection, IncidentToken.__table__) and \
+            not _is_empty(connection, incidents, incidents.c.status == TokenIndex.INDEXED_STATUS):
+        TokenIndex.rebuild(connection=connection)
+
+
+@migration(6, 'backfill MinHash LSH buckets')
+def _backfill_lsh_buckets(connection):
+    """
+    Sign incidents and fill the LSH buckets on a database created before them.
+
+    Until this runs, the minhash backend of duplicate detection finds no
+    candidates. Runs in the migration's transaction, like migration 4.
+    """
+    from app.models.incident import Incident
+    from app.models.incident_lsh_bucket import IncidentLshBucket
+    from app.utils.lsh_index import LshIndex
+    from app.utils.token_index import TokenIndex
+
+    incidents = Incident.__table__
+    if _is_empty(connection, IncidentLshBucket.__table__) and \
+            not _is_empty(connection, incidents, incidents.c.status == TokenIndex.INDEXED_STATUS):
+        LshIndex.rebuild(connection=connection)
+
+
+@migration(7, 'backfill FTS5 search index')
+def _backfill_fts_index(connection):
+    """
+    Create and fill incidents_fts on a SQLite database created before it.
+
+    Until this runs, search and the fts duplicate backend fall back to
+    slower paths. Skipped where FTS5 is unavailable. Runs in the
+    migration's transaction, like migration 4.
+    """
+    from app.utils.fts_index import FullTextIndex
+
+    if connection.dialect.name == 'sqlite' and not inspect(connection).has_table(FullTextIndex.TABLE):
+        FullTextIndex.rebuild(connection)
+
+
+def applied_versions(connection):
+    """Versions already recorded in schema_migrations."""
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine=None):
+    """
+    List the migrations not yet applied to a database.
+
+    Args:
+        engine (Engine): Database engine (defaults to the application engine)
+
+    Returns:
+        list: Pending Migration objects, in version order
+    """
+    engine = engine or db.engine
+    if not inspect(engine).has_table(schema_migrations.name):
+        return list(MIGRATIONS)
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [item for item in MIGRATIONS if item.version not in applied]
+
+
+def upgrade(engine=None):
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Args:
+        engine (Engine): Database engine (defaults to the application engine)
+
+    Returns:
+        list: Names of the migrations applied
+    """
+    engine = engine or db.engine
+    schema_migrations.create(engine, checkfirst=True)
+
+    applied = []
+    for item in pending_migrations(engine):
+        with engine.begin() as connection:
+            item.apply(connection)
+            connection.execute(schema_migrations.insert().values(version=item.version, name=item.name))
+        applied.append(item.name)
+    return applied
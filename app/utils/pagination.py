@@ -0,0 +1,180 @@
+"""
+Keyset (cursor) pagination for the incident list and audit log, and
+server-side filters for the incident list. Pages seek from the last row
+seen on (timestamp, id) instead of using OFFSET or loading every row, so
+each page costs the same at any depth.
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from sqlalchemy import literal, tuple_
+
+from app.models.incident import Incident
+
+# Filters accepted from the query string: argument name -> Incident column
+EQUALITY_FILTERS = {
+    'priority': Incident.priority,
+    'status': Incident.status,
+    'platform': Incident.platform,
+    'team': Incident.assigned_team,
+}
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def encode_cursor(timestamp, row_id):
+    """
+    Build an opaque cursor pointing at a row's position in a list.
+
+    Args:
+        timestamp (datetime): Sort timestamp of the row at the edge of a page
+        row_id (int): Primary key of that row (breaks timestamp ties)
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = f'{timestamp.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor.
+
+    Args:
+        cursor (str): Cursor from the query string
+
+    Returns:
+        tuple: (timestamp, id), or None if the cursor is missing or malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def incident_filters(args):
+    """
+    Read list filters from request arguments.
+
+    Args:
+        args (MultiDict): Request query arguments
+
+    Returns:
+        tuple: (filters, criteria) - filters maps argument names to the valid
+               non-empty values (for templates and links), criteria is the
+               list of SQLAlchemy conditions to apply
+    """
+    filters = {}
+    criteria = []
+
+    for name, column in EQUALITY_FILTERS.items():
+        value = args.get(name, '').strip()
+        if value:
+            filters[name] = value
+            criteria.append(column == value)
+
+    for name in ('date_from', 'date_to'):
+        value = args.get(name, '').strip()
+        try:
+            day = datetime.strptime(value, DATE_FORMAT)
+        except ValueError:
+            continue  # Missing or malformed dates are ignored
+        filters[name] = value
+        if name == 'date_from':
+            criteria.append(Incident.created_at >= day)
+        else:
+            # Inclusive end date: everything before the following midnight
+            criteria.append(Incident.created_at < day + timedelta(days=1))
+
+    return filters, criteria
+
+
+class KeysetPage:
+    """One page of rows, newest first, with cursors to its neighbours."""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def paginate_keyset(query, timestamp_column, id_column, per_page, after=None, before=None):
+    """
+    Fetch one page of a query, newest first, seeking on (timestamp, id).
+
+    Args:
+        query (Query): Query with filters already applied
+        timestamp_column (Column): Sort timestamp column
+        id_column (Column): Primary key column (breaks timestamp ties)
+        per_page (int): Page size
+        after (str): Cursor - return the rows older than this one
+        before (str): Cursor - return the rows newer than this one
+
+    Returns:
+        KeysetPage: The page items and navigation cursors
+    """
+    key = tuple_(timestamp_column, id_column)
+
+    def position(cursor):
+        timestamp, row_id = cursor
+        return tuple_(literal(timestamp, timestamp_column.type), literal(row_id))
+
+    def cursor_for(row):
+        return encode_cursor(getattr(row, timestamp_column.key), getattr(row, id_column.key))
+
+    before_position = decode_cursor(before)
+    if before_position is not None:
+        # Walk backwards (oldest first) from the cursor, then restore newest-first order
+        rows = query.filter(key > position(before_position)).order_by(
+            timestamp_column.asc(), id_column.asc()
+        ).limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        has_next = bool(items)
+    else:
+        after_position = decode_cursor(after)
+        if after_position is not None:
+            query = query.filter(key < position(after_position))
+        rows = query.order_by(
+            timestamp_column.desc(), id_column.desc()
+        ).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev = after_position is not None and bool(items)
+
+    return KeysetPage(
+        items,
+        next_cursor=cursor_for(items[-1]) if has_next else None,
+        prev_cursor=cursor_for(items[0]) if has_prev else None,
+    )
+
+
+def paginate_incidents(query, per_page, after=None, before=None):
+    """
+    Fetch one page of a filtered incident query, newest first.
+
+    Args:
+        query (Query): Incident query with filters already applied
+        per_page (int): Page size
+        after (str): Cursor - return the incidents older than this one
+        before (str): Cursor - return the incidents newer than this one
+
+    Returns:
+        KeysetPage: The page items and navigation cursors
+    """
+    return paginate_keyset(query, Incident.created_at, Incident.id, per_page, after=after, before=before)
@@ -0,0 +1,121 @@
+"""
+Read replica routing for read-heavy views.
+Views decorated with @read_replica run their queries on one of the replica
+binds (SQLALCHEMY_BINDS keys starting with 'replica'); every other view and
+every write uses the primary. A user who has just written is pinned to the
+primary for READ_REPLICA_STICKY_SECONDS, through a value in their session
+cookie, so they always see their own changes even while replicas lag.
+"""
+
+import random
+import sqlite3
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app import db
+from app.utils.engine_profile import apply_sqlite_pragmas
+
+REPLICA_PREFIX = 'replica'
+STICKY_SESSION_KEY = 'read_primary_until'
+
+
+def replica_engines():
+    """Engines of the configured replica binds (empty when there are none)."""
+    return [engine for key, engine in db.engines.items()
+            if key is not None and key.startswith(REPLICA_PREFIX)]
+
+
+def reads_pinned_to_primary():
+    """Whether the current user wrote recently enough to need the primary."""
+    return session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def choose_replica():
+    """
+    Pick the engine the current view should read from.
+
+    Returns:
+        Engine: A random replica, or None to read from the primary
+    """
+    engines = replica_engines()
+    if not engines or reads_pinned_to_primary():
+        return None
+    return random.choice(engines)
+
+
+def read_replica(f):
+    """
+    Decorator routing a read-only view's queries to a read replica.
+
+    Usage:
+        @bp.route('/list')
+        @login_required
+        @read_replica
+        def list_incidents():
+            ...
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        replica = choose_replica()
+        if replica is None:
+            return f(*args, **kwargs)
+        g.db_replica = replica
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.pop('db_replica', None)
+    return decorated_function
+
+
+def _note_primary_write(session, flush_context):
+    """Session hook: remember that this request wrote to the primary."""
+    if has_request_context():
+        g.db_wrote = True
+
+
+def register_replicas(app):
+    """
+    Make replica connections read-only and pin writers to the primary.
+    Replicas are copies of the primary, so schema setup calls
+    db.create_all(bind_key=None) and never visits them.
+
+    Args:
+        app (Flask): Application to configure
+    """
+    with app.app_context():
+        engines = replica_engines()
+    if not engines:
+        return
+    for engine in engines:
+        apply_sqlite_pragmas(engine, {'query_only': 'ON'})
+
+    if not event.contains(db.session, 'after_flush', _note_primary_write):
+        event.listen(db.session, 'after_flush', _note_primary_write)
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if g.pop('db_wrote', False):
+            session[STICKY_SESSION_KEY] = time.time() + current_app.config['READ_REPLICA_STICKY_SECONDS']
+        return response
+
+
+def sync_sqlite_replica(primary_url, replica_url):
+    """
+    Copy a SQLite primary into a replica file with the online backup API.
+    Readers of the replica see either the old or the new copy, never a mix.
+
+    Args:
+        primary_url (str | URL): SQLAlchemy URL of the primary database
+        replica_url (str | URL): SQLAlchemy URL of the replica database
+    """
+    source = sqlite3.connect(make_url(primary_url).database)
+    target = sqlite3.connect(make_url(replica_url).database, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,193 @@
+"""
+Per-request instrumentation.
+Records, for each request, the SQL statement count, total database time,
+the slowest statement, template render time, named spans (such as duplicate
+scoring) and overall latency, so a slow page can be pinned on the database,
+Jinja or the application code.
+
+Opt-in: with REQUEST_METRICS each request logs one structured line, and in
+debug mode also gets a Server-Timing header for the browser dev tools.
+With COUNT_QUERIES (testing) the statement count is returned in an
+X-Query-Count header so tests can pin a view's query budget.
+"""
+
+import json
+from contextlib import contextmanager
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+from app import db
+from app.utils.metrics import bind_label
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+SLOWEST_STATEMENT_CHARS = 200  # Logged prefix of the slowest statement
+
+# Engine -> bind label, for charging statements run on read replicas to their bind
+_engine_binds = WeakKeyDictionary()
+
+
+class RequestMetrics:
+    """Timings gathered while one request is handled (all durations in seconds)."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.queries_by_bind = {}
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.template_time = 0.0
+        self.template_starts = []
+        self.spans = {}
+
+    def record_query(self, statement, elapsed, bind='default'):
+        """Add one executed SQL statement."""
+        self.queries += 1
+        self.queries_by_bind[bind] = self.queries_by_bind.get(bind, 0) + 1
+        self.db_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def add_span(self, name, elapsed):
+        """Add time spent in a named block of application code."""
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed
+
+    def summary(self, total, status_code):
+        """
+        Build the structured log record for the request.
+
+        Args:
+            total (float): Overall request latency
+            status_code (int): Response status
+
+        Returns:
+            dict: JSON-serialisable metrics (durations in milliseconds)
+        """
+        slowest = ' '.join((self.slowest_statement or '').split())[:SLOWEST_STATEMENT_CHARS]
+        return {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_queries': self.queries,
+            'db_queries_by_bind': self.queries_by_bind,
+            'db_ms': round(self.db_time * 1000, 2),
+            'slowest_sql_ms': round(self.slowest_time * 1000, 2),
+            'slowest_sql': slowest or None,
+            'template_ms': round(self.template_time * 1000, 2),
+            'spans_ms': {name: round(elapsed * 1000, 2) for name, elapsed in self.spans.items()},
+        }
+
+    def server_timing(self, total):
+        """Format the metrics as a Server-Timing header value."""
+        parts = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'template;dur={self.template_time * 1000:.2f}',
+        ]
+        parts.extend(f'{name};dur={elapsed * 1000:.2f}' for name, elapsed in self.spans.items())
+        parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
+
+
+def current_metrics():
+    """Metrics of the request being handled, or None outside an instrumented request."""
+    if has_request_context():
+        return g.get('request_metrics')
+    return None
+
+
+@contextmanager
+def request_span(name):
+    """
+    Time a block of code as a named span of the current request.
+
+    Does nothing outside an instrumented request, so it is safe in code also
+    run from scripts and tests.
+
+    Args:
+        name (str): Span name (a Server-Timing metric name, e.g. 'duplicates')
+    """
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_span(name, perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Engine hook: note when a statement starts."""
+    if context is not None and current_metrics() is not None:
+        context._request_metrics_started = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Engine hook: charge a finished statement to the current request."""
+    started = getattr(context, '_request_metrics_started', None)
+    metrics = current_metrics()
+    if started is not None and metrics is not None:
+        metrics.record_query(statement, perf_counter() - started, _engine_binds.get(conn.engine, 'default'))
+
+
+def _before_render(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.template_starts.append(perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None and metrics.template_starts:
+        metrics.template_time += perf_counter() - metrics.template_starts.pop()
+
+
+def register_request_metrics(app):
+    """
+    Instrument every request of an application when REQUEST_METRICS or COUNT_QUERIES is set.
+
+    Args:
+        app (Flask): Application to instrument
+    """
+    log_requests = app.config.get('REQUEST_METRICS', False)
+    count_queries = app.config.get('COUNT_QUERIES', False)
+    if not (log_requests or count_queries):
+        return
+
+    # Every bind, so reads routed to a replica are counted too
+    with app.app_context():
+        engines = dict(db.engines)
+    for key, engine in engines.items():
+        _engine_binds[engine] = bind_label(key)
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def start_request_metrics():
+        # Test clients can share one app context (and g) across requests
+        g.request_metrics = RequestMetrics()
+
+    @app.after_request
+    def finish_request_metrics(response):
+        metrics = g.pop('request_metrics', None)
+        if metrics is None:
+            return response
+        total = perf_counter() - metrics.started
+
+        if count_queries:
+            response.headers[QUERY_COUNT_HEADER] = str(metrics.queries)
+        if log_requests:
+            app.logger.info('request_metrics %s', json.dumps(metrics.summary(total, response.status_code)))
+            if app.debug:
+                response.headers['Server-Timing'] = metrics.server_timing(total)
+        return response
@@ -0,0 +1,289 @@
+"""
+Versioned cache for dashboard and filter badge data.
+Cached values are keyed by a data generation number stored in the database
+and bumped in the same transaction as every incident, audit log or user
+write. A reader therefore gets hits until the data actually changes, and the
+first read after a write recomputes; there is no expiry time to tune.
+
+Views cache the context they compute (counts, recent incidents), not the
+rendered page, which also carries per-user navigation and flash messages.
+The backend is chosen by RESPONSE_CACHE_BACKEND:
+
+- 'lru': in-process, least recently used entries evicted (per worker)
+- 'file': pickled entries in RESPONSE_CACHE_DIR, shared by every worker;
+  point it at a tmpfs such as /dev/shm for a shared-memory store
+- 'none': caching disabled
+
+Per-session state (the create/confirm duplicate check, live duplicate
+suggestions) lives in a second store of the same backend, bounded by
+SESSION_CACHE_MAX_ENTRIES, so busy sessions never evict dashboard entries.
+With the 'lru' backend each worker has its own store and a request routed
+to another worker starts over; sharing it across workers needs 'file'.
+Session state depends on one platform's incidents only, so it is checked
+against that platform's duplicate generation instead of the global one.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.data_generation import DataGeneration
+from app.models.incident import Incident
+from app.models.user import User
+
+GENERATION = 'incidents'  # One generation covers every cached dashboard entry
+DUPLICATE_FIELDS = ('title', 'description', 'platform', 'status')  # What duplicate checks read
+MISSING = object()
+
+
+def _written_at(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0  # Removed by another worker meanwhile
+
+
+class LruCache:
+    """
+    In-process cache evicting the least recently used entry.
+
+    Args:
+        max_entries (int): Entries kept before the oldest is evicted
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key, MISSING)
+            if value is not MISSING:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileCache:
+    """
+    Cache of pickled files in a directory shared by all worker processes.
+
+    Args:
+        directory (str): Cache directory (created if missing)
+        max_entries (int): Files kept; the least recently written are removed
+    """
+
+    SUFFIX = '.pickle'
+
+    def __init__(self, directory, max_entries=256):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + self.SUFFIX)
+
+    def _files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(self.SUFFIX)]
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as handle:
+                return pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISSING
+
+    def set(self, key, value):
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as temp_file:
+            pickle.dump(value, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._path(key))  # Readers never see a half-written entry
+        self._prune()
+
+    def _prune(self):
+        files = self._files()
+        if len(files) <= self.max_entries:
+            return
+        for path in sorted(files, key=_written_at)[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already pruned by another worker
+
+    def clear(self):
+        for path in self._files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def duplicate_generation_name(platform):
+    """Generation name covering the incidents duplicate checks read on one platform."""
+    return f'duplicates:{platform}'
+
+
+def current_generation(name=GENERATION):
+    """
+    Read a data generation number.
+
+    Args:
+        name (str): Data set (defaults to the one behind the dashboards)
+
+    Returns:
+        int: Current generation, or None before the first write
+    """
+    return db.session.execute(
+        select(DataGeneration.value).where(DataGeneration.name == name)
+    ).scalar()
+
+
+def bump_generation(connection, name=GENERATION):
+    """
+    Advance a data generation inside the caller's transaction.
+
+    Args:
+        connection (Connection): Connection of the writing transaction
+        name (str): Data set (defaults to the one behind the dashboards)
+    """
+    table = DataGeneration.__table__
+    result = connection.execute(
+        table.update().where(table.c.name == name).values(value=table.c.value + 1)
+    )
+    if result.rowcount == 0:
+        # Start from the clock so a recreated database never reuses the
+        # generations (and shared cache files) of an earlier one
+        connection.execute(table.insert().values(name=name, value=time.time_ns() // 1000))
+
+
+def bump_generations(connection, platforms=()):
+    """
+    Invalidate the dashboards and the duplicate checks of some platforms.
+
+    Args:
+        connection (Connection): Connection of the writing transaction
+        platforms (iterable): Platforms whose open incidents' text changed
+    """
+    bump_generation(connection)
+    for platform in sorted(platforms):
+        bump_generation(connection, duplicate_generation_name(platform))
+
+
+def cached(entry, compute):
+    """
+    Return compute() for the current data generation, from the cache when possible.
+
+    Args:
+        entry (str): Name of the cached value (e.g. 'dashboard')
+        compute (callable): Builds the value on a miss; must return a picklable value
+
+    Returns:
+        The cached or freshly computed value
+    """
+    from app.utils.metrics import RESPONSE_CACHE_LOOKUPS
+
+    cache = current_app.extensions.get('response_cache')
+    generation = current_generation() if cache is not None else None
+    if generation is None:
+        return compute()
+
+    key = f'{entry}:{generation}'
+    value = cache.get(key)
+    if value is MISSING:
+        RESPONSE_CACHE_LOOKUPS.inc(entry, 'miss')
+        value = compute()
+        cache.set(key, value)
+    else:
+        RESPONSE_CACHE_LOOKUPS.inc(entry, 'hit')
+    return value
+
+
+def writes_cached_data(session):
+    """Whether a flush changes anything the cached entries are built from."""
+    for obj in session.new | session.deleted:
+        if isinstance(obj, (Incident, AuditLog, User)):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, (Incident, AuditLog)) and session.is_modified(obj):
+            return True
+        # Only the role of a user is counted
+        if isinstance(obj, User) and inspect(obj).attrs.is_admin.history.has_changes():
+            return True
+    return False
+
+
+def duplicate_platforms_written(session):
+    """Platforms whose duplicate check inputs (open incidents' text) a flush changes."""
+    platforms = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Incident):
+            platforms.add(obj.platform)
+    for obj in session.dirty:
+        if not isinstance(obj, Incident):
+            continue
+        attrs = inspect(obj).attrs
+        if any(attrs[field].history.has_changes() for field in DUPLICATE_FIELDS):
+            platforms.add(obj.platform)
+            platforms.update(attrs.platform.history.deleted)  # Moved away from
+    return platforms
+
+
+def _bump_generation_after_flush(session, flush_context):
+    """Session hook: invalidate cached entries when this flush writes their data."""
+    if writes_cached_data(session):
+        bump_generations(session.connection(), duplicate_platforms_written(session))
+
+
+def register_generation_listeners():
+    """Attach the generation hook to the application session (idempotent)."""
+    if not event.contains(db.session, 'after_flush', _bump_generation_after_flush):
+        event.listen(db.session, 'after_flush', _bump_generation_after_flush)
+
+
+def register_response_cache(app):
+    """
+    Create the configured cache backend for an application.
+
+    Dashboard entries go to app.extensions['response_cache'] and per-session
+    state to app.extensions['session_cache'], each with its own size limit.
+
+    Args:
+        app (Flask): Application to configure
+    """
+    backend = app.config.get('RESPONSE_CACHE_BACKEND', 'lru')
+    max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 256)
+    session_entries = app.config.get('SESSION_CACHE_MAX_ENTRIES', 1024)
+    if backend == 'lru':
+        app.extensions['response_cache'] = LruCache(max_entries)
+        app.extensions['session_cache'] = LruCache(session_entries)
+    elif backend == 'file':
+        directory = app.config.get('RESPONSE_CACHE_DIR') or os.path.join(app.instance_path, 'response_cache')
+        app.extensions['response_cache'] = FileCache(directory, max_entries)
+        app.extensions['session_cache'] = FileCache(os.path.join(directory, 'sessions'), session_entries)
+    elif backend == 'none':
+        app.extensions['response_cache'] = None
+        app.extensions['session_cache'] = None
+    else:
+        raise ValueError(f'Unknown response cache backend: {backend}')
@@ -0,0 +1,130 @@
+"""
+Aggregated incident and user statistics for the dashboards.
+Gathers every count the views need with one GROUP BY query per table,
+instead of a separate COUNT query per priority, status or role. Incident
+counts come from the write-maintained incident_counters table, so they
+cost the same however many incidents there are.
+
+Results are plain dataclasses so the views can keep them in the versioned
+response cache (app.utils.response_cache).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func
+
+from app import db
+
+
+@dataclass(frozen=True)
+class IncidentStats:
+    """Incident counts by priority and by status."""
+
+    total: int = 0
+    by_priority: dict = field(default_factory=dict)
+    by_status: dict = field(default_factory=dict)
+
+    @property
+    def high(self):
+        return self.by_priority.get('High', 0)
+
+    @property
+    def medium(self):
+        return self.by_priority.get('Medium', 0)
+
+    @property
+    def low(self):
+        return self.by_priority.get('Low', 0)
+
+    @property
+    def open(self):
+        return self.by_status.get('Open', 0)
+
+    @property
+    def in_progress(self):
+        return self.by_status.get('In Progress', 0)
+
+    @property
+    def resolved(self):
+        return self.by_status.get('Resolved', 0)
+
+    @property
+    def closed(self):
+        return self.by_status.get('Closed', 0)
+
+
+@dataclass(frozen=True)
+class UserStats:
+    """User counts by role."""
+
+    total: int = 0
+    admins: int = 0
+    regular: int = 0
+
+
+@dataclass(frozen=True)
+class RecentIncident:
+    """The fields of a recent incident shown on the admin dashboard."""
+
+    id: int
+    title: str
+    priority: str
+    status: str
+    created_at: datetime
+
+
+def get_incident_stats():
+    """
+    Count incidents by priority and status in a single query.
+
+    Reads the incident_counters table (a few rows per priority/status pair)
+    rather than scanning incidents.
+
+    Returns:
+        IncidentStats: Totals per priority, per status and overall
+    """
+    from app.utils.incident_counters import IncidentCounters
+
+    total = 0
+    by_priority = {}
+    by_status = {}
+    for priority, status, count in IncidentCounters.totals('priority', 'status'):
+        total += count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+        by_status[status] = by_status.get(status, 0) + count
+
+    return IncidentStats(total=total, by_priority=by_priority, by_status=by_status)
+
+
+def get_user_stats():
+    """
+    Count users by role in a single query.
+
+    Returns:
+        UserStats: Total, admin and regular user counts
+    """
+    from app.models.user import User
+
+    counts = dict(db.session.query(User.is_admin, func.count(User.id)).group_by(User.is_admin).all())
+    admins = counts.get(True, 0)
+    regular = counts.get(False, 0)
+    return UserStats(total=admins + regular, admins=admins, regular=regular)
+
+
+def get_recent_incidents(limit=10):
+    """
+    Fetch the newest incidents for the admin dashboard.
+
+    Args:
+        limit (int): Number of incidents
+
+    Returns:
+        list: RecentIncident rows, newest first
+    """
+    from app.models.incident import Incident
+
+    rows = db.session.query(
+        Incident.id, Incident.title, Incident.priority, Incident.status, Incident.created_at
+    ).order_by(Incident.created_at.desc(), Incident.id.desc()).limit(limit)
+    return [RecentIncident(*row) for row in rows]
@@ -3,7 +3,10 @@ Natural Language Processing utilities for incident text analysis.
 Implements text preprocessing, keyword extraction, and similarity matching.
 """
 
+import random
 import re
+import zlib
+from array import array
 from difflib import SequenceMatcher
 
 
@@ -80,20 +83,26 @@ class TextProcessor:
         return [word for word, freq in sorted_words[:top_n]]
     
     @staticmethod
-    def calculate_similarity(text1, text2):
+    def calculate_similarity(text1, text2, tokens1=None, tokens2=None):
         """
         Calculate similarity between two texts using token overlap and sequence matching.
         
         Args:
             text1 (str): First text
             text2 (str): Second text
+            tokens1 (set): Preprocessed tokens of text1, if already known
+            tokens2 (set): Preprocessed tokens of text2, if already known
             
         Returns:
             float: Similarity score between 0.0 and 1.0
         """
-        # Preprocess both texts
-        tokens1 = set(TextProcessor.preprocess_text(text1))
-        tokens2 = set(TextProcessor.preprocess_text(text2))
+        # Preprocess both texts (unless the caller has cached tokens)
+        if tokens1 is None:
+            tokens1 = TextProcessor.preprocess_text(text1)
+        if tokens2 is None:
+            tokens2 = TextProcessor.preprocess_text(text2)
+        tokens1 = set(tokens1)
+        tokens2 = set(tokens2)
         
         # Avoid division by zero
         if not tokens1 or not tokens2:
@@ -112,6 +121,82 @@ class TextProcessor:
         
         return similarity
     
+    @staticmethod
+    def weighted_similarity(fields, min_score=0.0):
+        """
+        Weighted sum of calculate_similarity over several fields, with early exit.
+        
+        An upper bound on the total is tightened in stages from cheapest to
+        most expensive, and scoring stops as soon as the bound drops below
+        min_score:
+        1. Token-set size ratio (bounds Jaccard) and text length ratio
+           (SequenceMatcher.real_quick_ratio) - no set or string work
+        2. Exact Jaccard similarity
+        3. SequenceMatcher.quick_ratio (character multiset overlap)
+        4. Full SequenceMatcher.ratio, heaviest field first
+        
+        Args:
+            fields (list): (weight, text1, text2, tokens1, tokens2) tuples
+            min_score (float): Scores below this are not needed
+            
+        Returns:
+            float: Same value as sum(weight * calculate_similarity(text1, text2)),
+                   or None if the score is certainly below min_score
+        """
+        count = len(fields)
+        weights = [field[0] for field in fields]
+        texts = [(field[1].lower(), field[2].lower()) for field in fields]
+        token_sets = [(set(field[3]), set(field[4])) for field in fields]
+        
+        # Fields with an empty token set always score 0.0 in calculate_similarity
+        active = [bool(tokens1) and bool(tokens2) for tokens1, tokens2 in token_sets]
+        
+        def total(jaccard, sequence):
+            score = 0.0
+            for i in range(count):
+                if active[i]:
+                    score += weights[i] * ((0.7 * jaccard[i]) + (0.3 * sequence[i]))
+            return score
+        
+        # Stage 1: size and length ratios
+        jaccard = []
+        sequence = []
+        for (tokens1, tokens2), (text1, text2) in zip(token_sets, texts):
+            sizes = sorted((len(tokens1), len(tokens2)))
+            lengths = len(text1) + len(text2)
+            jaccard.append(sizes[0] / sizes[1] if sizes[1] else 0.0)
+            sequence.append(2.0 * min(len(text1), len(text2)) / lengths if lengths else 1.0)
+        if total(jaccard, sequence) < min_score:
+            return None
+        
+        # Stage 2: exact Jaccard
+        for i, (tokens1, tokens2) in enumerate(token_sets):
+            if active[i]:
+                jaccard[i] = len(tokens1 & tokens2) / len(tokens1 | tokens2)
+        if total(jaccard, sequence) < min_score:
+            return None
+        
+        # Stage 3: character multiset bound
+        matchers = [
+            SequenceMatcher(None, text1, text2) if active[i] else None
+            for i, (text1, text2) in enumerate(texts)
+        ]
+        for i in range(count):
+            if active[i]:
+                sequence[i] = matchers[i].quick_ratio()
+        if total(jaccard, sequence) < min_score:
+            return None
+        
+        # Stage 4: exact ratios, largest weight first so a miss is detected sooner
+        for i in sorted(range(count), key=lambda i: weights[i], reverse=True):
+            if not active[i]:
+                continue
+            sequence[i] = matchers[i].ratio()
+            if total(jaccard, sequence) < min_score:
+                return None
+        
+        return total(jaccard, sequence)
+    
     @staticmethod
     def is_duplicate(new_text, existing_text, threshold=0.75):
         """
@@ -126,4 +211,107 @@ class TextProcessor:
             bool: True if texts are considered duplicates
         """
         similarity = TextProcessor.calculate_similarity(new_text, existing_text)
-        return similarity >= threshold
\ No newline at end of file
+        return similarity >= threshold
+
+
+class MinHasher:
+    """
+    MinHash signatures with locality-sensitive hashing (LSH) banding.
+    
+    A signature estimates the Jaccard similarity of two token sets in constant
+    space. Splitting it into bands of rows means two sets share at least one
+    band bucket with probability 1 - (1 - J^rows)^bands, which bounds the
+    chance of missing a near-duplicate without comparing every pair.
+    """
+    
+    # Mersenne prime used for the universal hash family
+    PRIME = (1 << 61) - 1
+    MAX_HASH = (1 << 32) - 1
+    
+    def __init__(self, num_perm=64, bands=16, seed=1):
+        """
+        Args:
+            num_perm (int): Number of hash permutations (signature length)
+            bands (int): Number of LSH bands (must divide num_perm)
+            seed (int): Seed for the permutation coefficients
+        """
+        if num_perm % bands != 0:
+            raise ValueError('num_perm must be divisible by bands')
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        
+        # Fixed seed so signatures are comparable across processes and restarts
+        rng = random.Random(seed)
+        self._coefficients = [
+            (rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME))
+            for _ in range(num_perm)
+        ]
+    
+    @staticmethod
+    def _token_hash(token):
+        """Stable 32-bit token hash (built-in hash() is salted per process)."""
+        return zlib.crc32(token.encode('utf-8'))
+    
+    def signature(self, tokens):
+        """
+        Compute the MinHash signature of a token set.
+        
+        Args:
+            tokens (iterable): Preprocessed tokens
+            
+        Returns:
+            array: Unsigned 32-bit signature of length num_perm
+        """
+        hashes = [MinHasher._token_hash(token) for token in set(tokens)]
+        signature = array('I', [self.MAX_HASH] * self.num_perm)
+        if not hashes:
+            return signature
+        
+        for i, (a, b) in enumerate(self._coefficients):
+            signature[i] = min((a * h + b) % self.PRIME for h in hashes) & self.MAX_HASH
+        return signature
+    
+    @staticmethod
+    def to_bytes(signature):
+        """Pack a signature for storage in a binary column."""
+        return signature.tobytes()
+    
+    @staticmethod
+    def from_bytes(data):
+        """Unpack a signature stored with to_bytes()."""
+        signature = array('I')
+        signature.frombytes(data)
+        return signature
+    
+    def band_keys(self, signature):
+        """
+        Hash each band of a signature into a bucket key.
+        
+        Args:
+            signature (array): MinHash signature
+            
+        Returns:
+            list: One signed 63-bit bucket key per band (band number mixed in)
+        """
+        keys = []
+        for band in range(self.bands):
+            start = band * self.rows
+            chunk = signature[start:start + self.rows].tobytes()
+            key = zlib.crc32(chunk, band) | (band << 32)
+            keys.append(key)
+        return keys
+    
+    @staticmethod
+    def estimate_similarity(signature1, signature2):
+        """
+        Estimate Jaccard similarity from two signatures.
+        
+        Returns:
+            float: Fraction of matching signature positions (0.0 to 1.0)
+        """
+        if not signature1 or len(signature1) != len(signature2):
+            return 0.0
+        matches = sum(1 for x, y in zip(signature1, signature2) if x == y)
+        return matches / len(signature1)
@@ -0,0 +1,170 @@
+"""
+Inverted token index for duplicate candidate retrieval.
+Keeps a token -> incident posting list for every open incident so that
+duplicate detection only scores incidents sharing at least one token.
+"""
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_token import IncidentToken
+from app.utils.text_processor import TextProcessor
+
+
+class TokenIndex:
+    """
+    Maintains and queries the incident_tokens inverted index.
+    """
+
+    # Only incidents in this status are candidates for duplicate detection
+    INDEXED_STATUS = 'Open'
+
+    # Fields whose changes require the postings to be rebuilt
+    TRACKED_FIELDS = ('title', 'description', 'status')
+
+    @staticmethod
+    def tokens_for(title, description):
+        """
+        Build the set of index tokens for an incident.
+
+        Args:
+            title (str): Incident title
+            description (str): Incident description
+
+        Returns:
+            set: Unique preprocessed tokens from title and description
+        """
+        tokens = set(TextProcessor.preprocess_text(title or ''))
+        tokens.update(TextProcessor.preprocess_text(description or ''))
+        return tokens
+
+    @staticmethod
+    def sync_incident(incident):
+        """
+        Bring an incident's postings in line with its current text and status.
+        Only the difference is written, so unchanged tokens cost nothing.
+
+        Args:
+            incident (Incident): Incident pending in the current session
+        """
+        if incident.status == TokenIndex.INDEXED_STATUS:
+            wanted = set(incident.title_token_list) | set(incident.description_token_list)
+        else:
+            wanted = set()
+
+        current = {posting.token: posting for posting in incident.index_tokens}
+
+        # Removing from the collection deletes the row (delete-orphan cascade)
+        for token, posting in current.items():
+            if token not in wanted:
+                incident.index_tokens.remove(posting)
+
+        for token in wanted - current.keys():
+            incident.index_tokens.append(IncidentToken(token=token))
+
+    @staticmethod
+    def candidate_ids(tokens, platform, limit=200):
+        """
+        Find open incidents on a platform sharing tokens with the query.
+
+        Args:
+            tokens (set): Preprocessed query tokens
+            platform (str): Platform name (Additiv/Avaloq)
+            limit (int): Maximum number of candidate ids to return
+
+        Returns:
+            list: Incident ids ordered by number of shared tokens (highest first)
+        """
+        if not tokens:
+            return []
+
+        overlap = func.count(IncidentToken.id).label('overlap')
+        rows = db.session.query(IncidentToken.incident_id, overlap).join(
+            Incident, Incident.id == IncidentToken.incident_id
+        ).filter(
+            IncidentToken.token.in_(tokens),
+            Incident.platform == platform,
+            Incident.status == TokenIndex.INDEXED_STATUS
+        ).group_by(
+            IncidentToken.incident_id
+        ).order_by(
+            overlap.desc(), IncidentToken.incident_id.desc()
+        ).limit(limit).all()
+
+        return [incident_id for incident_id, _ in rows]
+
+    @staticmethod
+    def rebuild(batch_size=1000, connection=None):
+        """
+        Rebuild the whole index from the incidents table.
+        Used to backfill databases created before the index existed.
+
+        Args:
+            batch_size (int): Number of postings inserted per statement
+            connection (Connection): Write inside this connection's transaction
+                                     instead of committing the session (migrations)
+
+        Returns:
+            int: Number of incidents indexed
+        """
+        # A session joined to the caller's transaction never commits it
+        session = db.session if connection is None else Session(bind=connection)
+        session.execute(IncidentToken.__table__.delete())
+
+        indexed = 0
+        postings = []
+        rows = session.query(Incident).filter(
+            Incident.status == TokenIndex.INDEXED_STATUS
+        ).yield_per(batch_size)
+
+        for incident in rows:
+            indexed += 1
+            for token in set(incident.title_token_list) | set(incident.description_token_list):
+                postings.append({'token': token, 'incident_id': incident.id})
+
+            if len(postings) >= batch_size:
+                session.execute(IncidentToken.__table__.insert(), postings)
+                postings = []
+
+        if postings:
+            session.execute(IncidentToken.__table__.insert(), postings)
+
+        if connection is None:
+            db.session.commit()
+        return indexed
+
+
+def incidents_to_reindex(session):
+    """
+    Yield incidents in a flushing session whose indexed fields changed.
+    
+    Args:
+        session (Session): Session passed to a before_flush hook
+        
+    Yields:
+        Incident: New incidents, and dirty ones with a changed tracked field
+    """
+    for obj in list(session.new):
+        if isinstance(obj, Incident):
+            yield obj
+
+    for obj in list(session.dirty):
+        if not isinstance(obj, Incident):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[field].history.has_changes() for field in TokenIndex.TRACKED_FIELDS):
+            yield obj
+
+
+def _sync_index_before_flush(session, flush_context, instances):
+    """Session hook: reindex incidents created or edited in this flush."""
+    for incident in incidents_to_reindex(session):
+        TokenIndex.sync_incident(incident)
+
+
+def register_index_listeners():
+    """Attach the index maintenance hook to the application session (idempotent)."""
+    if not event.contains(db.session, 'before_flush', _sync_index_before_flush):
+        event.listen(db.session, 'before_flush', _sync_index_before_flush)
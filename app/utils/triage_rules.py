@@ -0,0 +1,369 @@
+"""
+Data-driven priority and routing rules.
+Loads the declarative rule table in app/triage_rules.json, compiles it into
+dict-dispatch lookup tables plus one keyword matcher, and hot-swaps the
+compiled rules when the file changes so rule edits need no deploy or restart.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from app.utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'triage_rules.json'
+)
+
+# Keys a rule may use; all conditions present must hold for the rule to fire
+RULE_KEYS = {'result', 'platform', 'journey', 'min_clients', 'keyword', 'note'}
+
+
+class RuleSet:
+    """
+    Compiled rule table.
+
+    Each section ('priority', 'routing') is an ordered list of rules where
+    the first matching rule wins, exactly like the original if-chains. At
+    compile time the platform and journey conditions are resolved for every
+    known (platform, journey) pair, so evaluation is one dict lookup followed
+    by a short chain of client-count and keyword checks.
+    """
+
+    def __init__(self, definition):
+        """
+        Args:
+            definition (dict): Parsed rule table (see app/triage_rules.json)
+
+        Raises:
+            ValueError: If the table is malformed
+        """
+        if not isinstance(definition, dict):
+            raise ValueError('Rule table must be a JSON object')
+
+        keywords = definition.get('keywords', {})
+        if not isinstance(keywords, dict) or not all(
+            isinstance(words, list) and all(isinstance(word, str) and word for word in words)
+            for words in keywords.values()
+        ):
+            raise ValueError('"keywords" must map category names to lists of strings')
+        self.keywords = {category: list(words) for category, words in keywords.items()}
+        self.matcher = KeywordMatcher(self.keywords)
+
+        self.priority_rules, self.priority_default = self._parse_section(definition, 'priority')
+        self.routing_rules, self.routing_default = self._parse_section(definition, 'routing', with_clients=False)
+
+        all_rules = self.priority_rules + self.routing_rules
+        self._platforms = frozenset().union(*(rule[1] for rule in all_rules if rule[1] is not None))
+        self._journeys = frozenset().union(*(rule[2] for rule in all_rules if rule[2] is not None))
+
+        self._priority_table = self._compile(self.priority_rules, self.priority_default)
+        self._routing_table = self._compile(self.routing_rules, self.routing_default)
+        # Both chains per pair, so triage needs a single lookup
+        self._triage_table = {
+            key: (chain, self._routing_table[key]) for key, chain in self._priority_table.items()
+        }
+
+    def _parse_section(self, definition, name, with_clients=True):
+        """
+        Validate one section and convert its rules to tuples.
+
+        Args:
+            definition (dict): Parsed rule table
+            name (str): Section name
+            with_clients (bool): Whether rules may use min_clients (routing
+                                 does not receive a client count)
+
+        Returns:
+            tuple: (rules, default) where each rule is
+                   (result, platforms, journeys, min_clients, keyword) and
+                   unused conditions are None
+        """
+        section = definition.get(name)
+        if not isinstance(section, dict) or not isinstance(section.get('default'), str):
+            raise ValueError(f'"{name}" must be an object with "rules" and a "default" result')
+
+        rules = []
+        for number, rule in enumerate(section.get('rules', [])):
+            where = f'{name} rule {number}'
+            if not isinstance(rule, dict):
+                raise ValueError(f'{where} must be an object')
+            unknown = set(rule) - RULE_KEYS
+            if unknown:
+                raise ValueError(f'{where} has unknown keys: {", ".join(sorted(unknown))}')
+            if not isinstance(rule.get('result'), str):
+                raise ValueError(f'{where} needs a "result" string')
+
+            platforms, journeys = rule.get('platform'), rule.get('journey')
+            for field, values in (('platform', platforms), ('journey', journeys)):
+                if values is not None and not (isinstance(values, list) and values):
+                    raise ValueError(f'{where}: "{field}" must be a non-empty list')
+
+            min_clients = rule.get('min_clients')
+            if min_clients is not None and not with_clients:
+                raise ValueError(f'{where}: "min_clients" is not available in {name} rules')
+            if min_clients is not None and (not isinstance(min_clients, int) or isinstance(min_clients, bool)):
+                raise ValueError(f'{where}: "min_clients" must be an integer')
+
+            keyword = rule.get('keyword')
+            if keyword is not None and keyword not in self.keywords:
+                raise ValueError(f'{where}: unknown keyword category "{keyword}"')
+
+            rules.append((
+                rule['result'],
+                frozenset(platforms) if platforms is not None else None,
+                frozenset(journeys) if journeys is not None else None,
+                min_clients,
+                keyword,
+            ))
+        return rules, section['default']
+
+    def _compile(self, rules, default):
+        """
+        Resolve platform/journey conditions for every known pair.
+
+        Returns:
+            dict: (platform, journey) -> tuple of (min_clients, keyword, result);
+                  None stands for any platform or journey not named in the rules
+        """
+        table = {}
+        for platform in self._platforms | {None}:
+            for journey in self._journeys | {None}:
+                chain = []
+                for result, platforms, journeys, min_clients, keyword in rules:
+                    if platforms is not None and platform not in platforms:
+                        continue
+                    if journeys is not None and journey not in journeys:
+                        continue
+                    chain.append((min_clients, keyword, result))
+                    if min_clients is None and keyword is None:
+                        break  # Later rules are unreachable for this pair
+                else:
+                    chain.append((None, None, default))
+                table[(platform, journey)] = tuple(chain)
+        return table
+
+    def _key(self, platform, journey):
+        """Return the compiled-table key for a platform/journey pair."""
+        return (platform if platform in self._platforms else None,
+                journey if journey in self._journeys else None)
+
+    def _evaluate(self, table, platform, journey, clients_affected, description, keyword_matches):
+        """
+        Walk the pre-resolved chain for a platform/journey pair.
+
+        Keyword rules use keyword_matches when the caller has one. Otherwise
+        they check just their own category in the lowercased description,
+        like the original any() loops, unless the keyword set is large enough
+        for the automaton, in which case the description is scanned once.
+        """
+        lowered = None
+        for min_clients, keyword, result in table[self._key(platform, journey)]:
+            if min_clients is not None and clients_affected < min_clients:
+                continue
+            if keyword is not None:
+                if keyword_matches is None and self.matcher.uses_automaton:
+                    keyword_matches = self.matcher.match(description)
+                if keyword_matches is not None:
+                    if keyword not in keyword_matches:
+                        continue
+                else:
+                    if lowered is None:
+                        lowered = (description or '').lower()
+                    if not self.matcher.has_category(lowered, keyword):
+                        continue
+            return result
+
+    def match_keywords(self, description):
+        """Return the keyword categories found in a description."""
+        return self.matcher.match(description)
+
+    def predict_priority(self, platform, journey, clients_affected, description, keyword_matches=None):
+        """Evaluate the priority rules (see classifier.predict_priority)."""
+        return self._evaluate(self._priority_table, platform, journey,
+                              clients_affected, description, keyword_matches)
+
+    def assign_team(self, platform, journey, description, keyword_matches=None):
+        """Evaluate the routing rules (see router.assign_team)."""
+        return self._evaluate(self._routing_table, platform, journey,
+                              None, description, keyword_matches)
+
+    def triage(self, platform, journey, clients_affected, description):
+        """
+        Evaluate both sections, lowercasing (or scanning) the description at most once.
+
+        This is the per-incident path of the create and edit views, so both
+        chains are walked inline from one table lookup.
+
+        Returns:
+            tuple: (priority, team)
+        """
+        if self.matcher.uses_automaton:
+            keyword_matches = self.matcher.match(description)
+            return (self.predict_priority(platform, journey, clients_affected, description, keyword_matches),
+                    self.assign_team(platform, journey, description, keyword_matches))
+
+        chains = self._triage_table.get((platform, journey))
+        if chains is None:
+            chains = self._triage_table[self._key(platform, journey)]
+        priority_chain, routing_chain = chains
+        category_words = self.matcher.category_words
+        lowered = None
+
+        for min_clients, keyword, result in priority_chain:
+            if min_clients is not None and clients_affected < min_clients:
+                continue
+            if keyword is not None:
+                if lowered is None:
+                    lowered = (description or '').lower()
+                if not any(map(lowered.__contains__, category_words[keyword])):
+                    continue
+            priority = result
+            break
+
+        for _, keyword, team in routing_chain:
+            if keyword is not None:
+                if lowered is None:
+                    lowered = (description or '').lower()
+                if not any(map(lowered.__contains__, category_words[keyword])):
+                    continue
+            return priority, team
+
+
+def load_rules(path):
+    """
+    Read and compile a rule file.
+
+    Args:
+        path (str): Path to a JSON rule table
+
+    Returns:
+        RuleSet: Compiled rules
+
+    Raises:
+        ValueError: If the file is not valid JSON or not a valid rule table
+    """
+    with open(path, encoding='utf-8') as f:
+        return RuleSet(json.load(f))
+
+
+class RuleStore:
+    """
+    Holds the active RuleSet and reloads it when the rule file changes.
+
+    Readers never lock: the compiled RuleSet is replaced with a single
+    reference assignment, so every caller sees either the old or the new
+    rules in full. get() only loads the rules the first time; changes are
+    picked up by check_for_changes(), which create_app runs before each
+    request and which stats the file at most once per reload_interval
+    seconds. A file that fails to load is logged and the previous rules
+    stay active.
+    """
+
+    def __init__(self, path, reload_interval=5.0):
+        """
+        Args:
+            path (str): Rule file to load
+            reload_interval (float): Seconds between change checks (None disables reloading)
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._rules = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the active rules, loading them on first use."""
+        rules = self._rules
+        if rules is None:
+            rules = self.reload()
+        return rules
+
+    def check_for_changes(self):
+        """Reload the rules if reload_interval has passed and the file changed."""
+        if self.reload_interval is not None and time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def reload(self, force=False):
+        """
+        Recompile the rule file if it changed (or always, with force).
+
+        Returns:
+            RuleSet: The active rules afterwards
+
+        Raises:
+            OSError, ValueError: If there are no previous rules to fall back on
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self._rules is None:
+                    raise
+                logger.error('Keeping previous triage rules; cannot read %s: %s', self.path, e)
+                return self._rules
+
+            if not force and self._rules is not None and mtime == self._mtime:
+                return self._rules
+
+            try:
+                rules = load_rules(self.path)
+            except (OSError, ValueError) as e:
+                if self._rules is None:
+                    raise
+                logger.error('Keeping previous triage rules; failed to load %s: %s', self.path, e)
+                self._mtime = mtime  # Retry once the file changes again
+                return self._rules
+
+            self._rules, self._mtime = rules, mtime
+            logger.info('Loaded triage rules from %s', self.path)
+            return rules
+
+
+_store = RuleStore(DEFAULT_RULES_PATH)
+
+
+def configure_rules(path=None, reload_interval=5.0):
+    """
+    Point the triage functions at a rule file (called by create_app).
+
+    Args:
+        path (str): Rule file (defaults to app/triage_rules.json)
+        reload_interval (float): Seconds between change checks (None disables reloading)
+    """
+    global _store
+    _store = RuleStore(path or DEFAULT_RULES_PATH, reload_interval)
+
+
+def get_rules():
+    """Return the active compiled rules."""
+    return _store.get()
+
+
+def check_rules():
+    """Pick up rule file changes (registered by create_app as a before_request hook)."""
+    _store.check_for_changes()
+
+
+def reload_rules():
+    """Force a reload of the rule file and return the active rules."""
+    return _store.reload(force=True)
+
+
+def match_triage_keywords(description):
+    """
+    Scan an incident description for all triage keyword categories.
+
+    Args:
+        description (str): Incident description text
+
+    Returns:
+        frozenset: Matched categories, to pass to predict_priority and assign_team
+    """
+    return get_rules().match_keywords(description)
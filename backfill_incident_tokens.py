@@ -0,0 +1,59 @@
+"""
+Backfill the cached token columns on existing incidents.
+Fills title_tokens/description_tokens for rows written before they existed
+(the columns themselves are added by the schema migrations, applied first).
+New and edited incidents are tokenised automatically on write.
+"""
+
+import os
+
+from sqlalchemy import bindparam, or_
+
+from app import create_app, db
+from app.models.incident import Incident
+from app.utils.migrations import upgrade
+
+
+def backfill_incident_tokens(batch_size=1000):
+    """Tokenise every incident whose cached token columns are empty."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        upgrade()
+        table = Incident.__table__
+        update = table.update().where(table.c.id == bindparam('b_id')).values(
+            title_tokens=bindparam('b_title_tokens'),
+            description_tokens=bindparam('b_description_tokens')
+        )
+
+        filled = 0
+        last_id = 0
+        while True:
+            rows = db.session.query(
+                Incident.id, Incident.title, Incident.description
+            ).filter(
+                Incident.id > last_id,
+                or_(Incident.title_tokens.is_(None), Incident.description_tokens.is_(None))
+            ).order_by(Incident.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            db.session.execute(update, [
+                {
+                    'b_id': incident_id,
+                    'b_title_tokens': Incident.tokenise(title),
+                    'b_description_tokens': Incident.tokenise(description)
+                }
+                for incident_id, title, description in rows
+            ])
+            db.session.commit()
+
+            filled += len(rows)
+            last_id = rows[-1][0]
+
+        print(f"✅ Tokenised {filled} incident(s)")
+        print("   Run rebuild_duplicate_indexes.py to refresh the token index and MinHash signatures.")
+
+
+if __name__ == '__main__':
+    backfill_incident_tokens()
@@ -0,0 +1,66 @@
+"""
+Cluster near-duplicate incidents across the full history.
+Writes a cluster_id to every incident so helpline leads can see how many
+tickets a single outage produced. Safe to interrupt: re-running resumes
+from the checkpoint file. A completed run removes it, so the next run
+clusters the whole history again, including incidents added since.
+
+Usage:
+    python cluster_incidents.py [--threshold 0.75] [--workers N] [--chunk-size 1000] [--reset]
+"""
+
+import argparse
+import os
+
+from sqlalchemy import func
+
+from app import create_app, db
+from app.models.incident import Incident
+from app.utils.clustering import ClusterJob
+
+
+def cluster_incidents(args):
+    """Run or resume the clustering job and print a summary."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        checkpoint = args.checkpoint or os.path.join(app.instance_path, 'cluster_checkpoint.json')
+        job = ClusterJob(
+            checkpoint,
+            threshold=args.threshold,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            max_candidates=args.max_candidates
+        )
+        if args.reset and os.path.exists(checkpoint):
+            job.reset()
+            print("🗑️  Removed previous checkpoint")
+
+        clusters = job.run()
+
+        print(f"\n✅ Found {clusters} cluster(s) of near-duplicate incidents")
+
+        largest = db.session.query(
+            Incident.cluster_id, func.count(Incident.id).label('size')
+        ).group_by(Incident.cluster_id).having(func.count(Incident.id) > 1).order_by(
+            func.count(Incident.id).desc()
+        ).limit(5).all()
+        for cluster_id, size in largest:
+            print(f"  Cluster #{cluster_id}: {size} incidents")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cluster near-duplicate incidents.')
+    parser.add_argument('--threshold', type=float, default=0.75,
+                        help='Similarity needed to join a cluster (default 0.75)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: number of CPU cores)')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='Incidents processed per chunk (default 1000)')
+    parser.add_argument('--max-candidates', type=int, default=200,
+                        help='Candidates scored per incident (default 200)')
+    parser.add_argument('--checkpoint', default=None,
+                        help='Checkpoint file (default instance/cluster_checkpoint.json)')
+    parser.add_argument('--reset', action='store_true',
+                        help='Discard an interrupted run and start again')
+    cluster_incidents(parser.parse_args())
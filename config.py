@@ -10,6 +10,19 @@ from datetime import timedelta
 # Get the base directory (project root)
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+# SQLite connection profile for servers with several workers (applied on
+# connect by app.utils.engine_profile, in this order): the busy timeout is
+# set first so switching to WAL waits for other connections
+SQLITE_SERVER_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'journal_mode': 'WAL',           # Readers and the writer no longer block each other
+    'synchronous': 'NORMAL',         # Safe with WAL; fsync at checkpoints, not every commit
+    'mmap_size': 256 * 1024 * 1024,  # Memory-mapped reads (bytes)
+    'cache_size': -64000,            # Page cache per connection (negative = KiB)
+    'temp_store': 'MEMORY',          # Sorts and temp B-trees in memory
+}
+
+
 class Config:
     """Base configuration class with common settings."""
     
@@ -19,6 +32,19 @@ class Config:
     # Database configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    # Per-connection SQLite PRAGMAs and engine/pool options (see subclasses)
+    SQLITE_PRAGMAS = {}
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # Read replicas for @read_replica views (comma-separated URLs, e.g. periodically
+    # synced SQLite copies); a user who just wrote reads the primary for a while
+    SQLALCHEMY_BINDS = {
+        f'replica_{number}': url for number, url in enumerate(
+            url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()
+        )
+    }
+    READ_REPLICA_STICKY_SECONDS = int(os.environ.get('READ_REPLICA_STICKY_SECONDS', 15))
+    # Create tables, migrate and seed inside create_app (otherwise run `flask init-db`)
+    INIT_DB_ON_STARTUP = os.environ.get('INIT_DB_ON_STARTUP', 'False') == 'True'
     
     # Session security settings (OWASP A07:2021 - Authentication)
     SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
@@ -36,10 +62,55 @@ class Config:
     # Logging configuration
     LOG_TO_STDOUT = os.environ.get('LOG_TO_STDOUT', 'False') == 'True'
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    # One structured log line per request (SQL, template and total timings);
+    # debug mode also adds a Server-Timing header
+    REQUEST_METRICS = os.environ.get('REQUEST_METRICS', 'False') == 'True'
+    
+    # Versioned cache for dashboard and filter badge data: 'lru' (per worker),
+    # 'file' (shared by all workers; use a tmpfs dir such as /dev/shm/ims-cache) or 'none'
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'lru')
+    RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')  # Defaults to instance/response_cache
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    # Per-session duplicate check and suggestion state, kept apart from the
+    # dashboard entries; only reused across workers with the 'file' backend
+    SESSION_CACHE_MAX_ENTRIES = 1024
+    
+    # Prometheus metrics at /metrics; under gunicorn point METRICS_MULTIPROC_DIR
+    # at a directory shared by the workers (emptied before the server starts).
+    # Metrics reveal endpoints, latencies and pool state, so every environment
+    # opts in; with METRICS_TOKEN set, scrapers must send "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False') == 'True'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_INTERVAL = 5  # Seconds between writes of a worker's metrics file
     
     # Application-specific settings
     INCIDENTS_PER_PAGE = 20
+    AUDIT_LOG_PER_PAGE = 50
+    SEARCH_RESULTS_LIMIT = 50
     DUPLICATE_THRESHOLD = 0.85
+    DUPLICATE_CANDIDATE_LIMIT = 200  # Max incidents scored per duplicate check
+    # Live suggestions on the create form: the text is still partial, so the
+    # threshold sits below the 0.50 used when the form is submitted
+    DUPLICATE_SUGGEST_THRESHOLD = 0.40
+    DUPLICATE_SUGGEST_LIMIT = 5
+    DUPLICATE_SUGGEST_BUDGET_MS = 150  # Scoring stops here and returns what it has
+    TRIAGE_BATCH_MAX_ROWS = 10000  # Max incidents per batch triage request
+    
+    # Duplicate detection backend: 'index' (inverted token index), 'minhash' (MinHash/LSH),
+    # 'fts' (SQLite FTS5, falls back to 'index' without FTS5)
+    # or 'tfidf' (vectorised TF-IDF cosine; thresholds then apply to cosine similarity)
+    DUPLICATE_BACKEND = os.environ.get('DUPLICATE_BACKEND', 'index')
+    
+    # Triage rule table (priority and routing); edits are picked up without a restart
+    TRIAGE_RULES_PATH = os.environ.get('TRIAGE_RULES_PATH') or os.path.join(basedir, 'app', 'triage_rules.json')
+    TRIAGE_RULES_RELOAD_INTERVAL = 5  # Seconds between checks for a changed rule file
+    
+    # MinHash/LSH settings - changing these requires rebuild_duplicate_indexes.py
+    # 16 bands x 4 rows finds pairs with Jaccard 0.5 at ~65%, 0.7 at ~98%
+    MINHASH_NUM_PERM = 64
+    MINHASH_BANDS = 16
+    MINHASH_SEED = 1
 
 
 class DevelopmentConfig(Config):
@@ -49,6 +120,7 @@ class DevelopmentConfig(Config):
     # Use absolute path for Windows compatibility
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'instance', 'incidents_dev.db')
+    SQLITE_PRAGMAS = SQLITE_SERVER_PRAGMAS
 
 
 class TestingConfig(Config):
@@ -57,6 +129,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'instance', 'incidents_test.db')
     WTF_CSRF_ENABLED = False
+    COUNT_QUERIES = True  # X-Query-Count header on every response
+    METRICS_ENABLED = True
 
 
 class ProductionConfig(Config):
@@ -65,6 +139,13 @@ class ProductionConfig(Config):
     TESTING = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'instance', 'incidents_prod.db')
+    SQLITE_PRAGMAS = SQLITE_SERVER_PRAGMAS
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),  # Per worker process
+        'max_overflow': int(os.environ.get('DB_POOL_OVERFLOW', 5)),
+        'pool_timeout': 10,  # Seconds to wait for a free connection
+        'pool_recycle': 3600,
+    }
     SESSION_COOKIE_SECURE = True
     PREFERRED_URL_SCHEME = 'https'
 
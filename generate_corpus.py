@@ -0,0 +1,83 @@
+"""
+Generate a synthetic incident corpus for load and scale testing.
+Bulk-inserts realistic incidents, users and override audit log entries into
+the configured database, then rebuilds the duplicate-detection token index
+and the dashboard counters. A million incidents take a few minutes.
+
+Usage:
+    python generate_corpus.py --incidents 1000000 [--near-duplicate-rate 0.1] [--reset]
+"""
+
+import argparse
+import os
+import time
+
+from app import create_app, db, init_db
+from app.utils.corpus import generate_corpus
+
+
+def run(args):
+    """Generate the corpus and print a summary."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        if args.reset:
+            print("🗑️  Dropping all tables...")
+            db.drop_all(bind_key=None)
+        init_db(seed=False)
+
+        started = time.perf_counter()
+
+        def progress(written):
+            rate = written / (time.perf_counter() - started)
+            print(f"   {written:,} / {args.incidents:,} incidents ({rate:,.0f}/s)", flush=True)
+
+        print(f"🔨 Generating {args.incidents:,} incident(s)...")
+        summary = generate_corpus(
+            args.incidents,
+            users=args.users,
+            admins=args.admins,
+            password=args.password,
+            batch_size=args.batch_size,
+            near_duplicate_rate=args.near_duplicate_rate,
+            override_rate=args.override_rate,
+            days=args.days,
+            seed=args.seed,
+            minhash=args.minhash,
+            progress=progress
+        )
+
+        print(f"\n✅ Done in {time.perf_counter() - started:.1f}s")
+        print(f"   Users: {summary['users']:,} (password '{args.password}')")
+        print(f"   Incidents: {summary['incidents']:,} "
+              f"({summary['near_duplicates']:,} near-duplicate re-reports)")
+        print(f"   Audit log entries: {summary['audit_logs']:,}")
+        if not args.minhash:
+            print("   MinHash/LSH buckets were not rebuilt; pass --minhash for the 'minhash' backend.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic incident corpus.')
+    parser.add_argument('--incidents', type=int, default=100000,
+                        help='Incidents to generate (default 100000)')
+    parser.add_argument('--users', type=int, default=50,
+                        help='Helpline users to create (default 50)')
+    parser.add_argument('--admins', type=int, default=5,
+                        help='Admin users to create (default 5)')
+    parser.add_argument('--password', default='User123!',
+                        help="Password for every generated user (default 'User123!')")
+    parser.add_argument('--batch-size', type=int, default=20000,
+                        help='Rows per bulk insert (default 20000)')
+    parser.add_argument('--near-duplicate-rate', type=float, default=0.1,
+                        help='Share of incidents re-reporting an earlier one (default 0.1)')
+    parser.add_argument('--override-rate', type=float, default=0.03,
+                        help='Share of incidents overridden by an admin (default 0.03)')
+    parser.add_argument('--days', type=int, default=365,
+                        help='Days of history to spread incidents over (default 365)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed (default 42)')
+    parser.add_argument('--minhash', action='store_true',
+                        help='Also rebuild MinHash signatures and LSH buckets (slow)')
+    parser.add_argument('--reset', action='store_true',
+                        help='Drop and recreate all tables first (development only)')
+    run(parser.parse_args())
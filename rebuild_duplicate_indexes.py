@@ -0,0 +1,37 @@
+"""
+Rebuild the duplicate-detection indexes from the incidents table.
+Run after changing the MINHASH_* settings, or whenever an index is
+suspected to be out of sync. Upgraded databases are backfilled by
+`flask init-db`.
+"""
+
+import os
+
+from app import create_app
+from app.utils.token_index import TokenIndex
+from app.utils.lsh_index import LshIndex
+from app.utils.fts_index import FullTextIndex
+
+
+def rebuild_duplicate_indexes():
+    """Drop and repopulate the token index, MinHash/LSH buckets and FTS5 index."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        print("🔨 Rebuilding incident token index...")
+        indexed = TokenIndex.rebuild()
+        print(f"✅ Indexed {indexed} open incident(s)")
+
+        print("🔨 Recomputing MinHash signatures and LSH buckets...")
+        signed = LshIndex.rebuild()
+        print(f"✅ Signed {signed} incident(s)")
+
+        print("🔨 Rebuilding FTS5 full-text index...")
+        if FullTextIndex.rebuild():
+            print("✅ Full-text index rebuilt")
+        else:
+            print("⚠️  FTS5 not available - search will use LIKE matching")
+
+
+if __name__ == '__main__':
+    rebuild_duplicate_indexes()
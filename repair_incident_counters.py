@@ -0,0 +1,25 @@
+"""
+Rebuild the incident_counters table from the incidents table.
+Run after any bulk change to incidents made outside the ORM (the counters
+are otherwise maintained automatically on every write). Upgraded databases
+are backfilled by `flask init-db` (migration 4).
+"""
+
+import os
+
+from app import create_app
+from app.utils.incident_counters import IncidentCounters
+
+
+def repair_incident_counters():
+    """Recount every (priority, status, platform, team) counter."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        print("🔨 Recounting incident counters...")
+        rows = IncidentCounters.rebuild()
+        print(f"✅ Wrote {rows} counter row(s)")
+
+
+if __name__ == '__main__':
+    repair_incident_counters()
@@ -1,9 +1,10 @@
 """
 This is a database reset script - FOR DEVELOPMENT ONLY
-Drops all tables and recreates them with the new schema.
+Drops all tables and recreates them through init_db, the same path as
+`flask init-db` (tables, migrations), then adds the test users.
 """
 
-from app import create_app, db
+from app import create_app, db, init_db
 from app.models import User, Incident, AuditLog
 
 def reset_database():
@@ -12,10 +13,11 @@ def reset_database():
     
     with app.app_context():
         print("🗑️  Dropping all tables...")
-        db.drop_all()
+        # Primary only: replica binds are copies synced from it
+        db.drop_all(bind_key=None)
         
         print("🔨 Creating all tables with new schema...")
-        db.create_all()
+        init_db(seed=False)
         
         print("✅ Database reset complete!")
         print("\n📋 Tables created:")
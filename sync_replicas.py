@@ -0,0 +1,45 @@
+"""
+Copy the SQLite primary database into each configured read replica.
+For local testing of the read/write split: point DATABASE_REPLICA_URLS at
+one or more SQLite files and keep this running next to the app. Replicas
+lag the primary by up to the interval; users who just wrote read from the
+primary meanwhile (READ_REPLICA_STICKY_SECONDS should exceed the interval).
+
+Usage:
+    DATABASE_REPLICA_URLS=sqlite:////tmp/replica1.db python sync_replicas.py --interval 5
+"""
+
+import argparse
+import os
+import time
+
+from app import create_app, db
+from app.utils.replicas import REPLICA_PREFIX, sync_sqlite_replica
+
+
+def sync_replicas(interval=None):
+    """Sync every SQLite replica once, or every `interval` seconds until interrupted."""
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        primary = db.engine.url
+    replicas = {key: url for key, url in app.config['SQLALCHEMY_BINDS'].items()
+                if key.startswith(REPLICA_PREFIX) and url.startswith('sqlite')}
+    if not replicas:
+        print("❌ No SQLite replicas configured (set DATABASE_REPLICA_URLS)")
+        return
+
+    while True:
+        started = time.perf_counter()
+        for url in replicas.values():
+            sync_sqlite_replica(primary, url)
+        print(f"🔄 Synced {len(replicas)} replica(s) in {time.perf_counter() - started:.2f}s", flush=True)
+        if interval is None:
+            break
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Copy the SQLite primary into its read replicas.')
+    parser.add_argument('--interval', type=float,
+                        help='Seconds between syncs (default: sync once and exit)')
+    sync_replicas(parser.parse_args().interval)
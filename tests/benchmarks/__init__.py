@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the Incident Management System.
+These are standalone scripts (bench_*.py), not collected by pytest.
+Run with: python -m tests.benchmarks.<module>
+"""
@@ -0,0 +1,113 @@
+"""
+Benchmark concurrent writes to SQLite from several worker processes.
+
+Starts N processes (like gunicorn workers), each with its own app and
+engine, against one database file. Each worker loops for a fixed time:
+create an incident through the ORM (so the token index, counters and cache
+generation are maintained as in a request), then read the dashboard counts
+and the first list page. Reports committed writes per second, reads per
+second and 'database is locked' failures, for the SQLite defaults and for
+the production engine profile (WAL, synchronous=NORMAL, busy_timeout, mmap).
+
+Usage:
+    python -m tests.benchmarks.bench_concurrency --workers 8 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from config import ProductionConfig, config
+
+PROFILES = {
+    'sqlite defaults': {'SQLITE_PRAGMAS': {}, 'SQLALCHEMY_ENGINE_OPTIONS': {}},
+    'production profile': {},
+}
+
+
+def register_config(profile, path):
+    """Register a 'bench' configuration: production settings on a scratch database."""
+    settings = dict(PROFILES[profile], SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}',
+                    METRICS_ENABLED=False, INIT_DB_ON_STARTUP=False, TESTING=True)  # No log file
+    config['bench'] = type('BenchConfig', (ProductionConfig,), settings)
+
+
+def worker(profile, path, seconds, start, results):
+    """Write and read in a loop until the deadline, then report the counts."""
+    from app import create_app, db
+    from app.models.incident import Incident
+    from app.utils.pagination import paginate_incidents
+    from app.utils.stats import get_incident_stats
+
+    register_config(profile, path)
+    app = create_app('bench')
+    writes = reads = locked = 0
+    with app.app_context():
+        start.wait()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            try:
+                db.session.add(Incident(
+                    title=f'Concurrent write {os.getpid()} {writes}',
+                    description='Transfer of funds timing out for several clients after release',
+                    platform='Avaloq', journey='Transfer', clients_affected=3,
+                    predicted_priority='Medium', predicted_team='LCM', priority='Medium',
+                    assigned_team='LCM', status='Open', created_by=1
+                ))
+                db.session.commit()
+                writes += 1
+                get_incident_stats()
+                paginate_incidents(Incident.query, per_page=20)
+                db.session.commit()  # End the read transaction
+                reads += 1
+            except OperationalError as error:
+                db.session.rollback()
+                if 'locked' not in str(error):
+                    raise
+                locked += 1
+    results.put((writes, reads, locked))
+
+
+def run(profile, workers, seconds):
+    """Run one profile against a fresh database file and return the totals."""
+    from app import create_app, db, init_db
+
+    directory = tempfile.mkdtemp(prefix='bench-concurrency-')
+    path = os.path.join(directory, 'incidents.db')
+    register_config(profile, path)
+    app = create_app('bench')
+    with app.app_context():
+        init_db()
+        db.session.remove()
+        db.engine.dispose()  # No connections inherited by the forked workers
+
+    context = multiprocessing.get_context('fork')
+    start, results = context.Event(), context.Queue()
+    processes = [context.Process(target=worker, args=(profile, path, seconds, start, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    time.sleep(1)  # Let every worker build its app before the clock starts
+    start.set()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return [sum(column) for column in zip(*totals)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    print(f'{args.workers} workers, {args.seconds:g}s per profile')
+    print(f'{"profile":<22}{"writes/s":>10}{"reads/s":>10}{"locked":>8}')
+    for profile in PROFILES:
+        writes, reads, locked = run(profile, args.workers, args.seconds)
+        print(f'{profile:<22}{writes / args.seconds:>10.1f}{reads / args.seconds:>10.1f}{locked:>8}',
+              flush=True)
@@ -0,0 +1,129 @@
+"""
+Benchmark duplicate detection backends for recall and latency.
+
+Builds a synthetic corpus of open incidents, plants reworded copies of
+some of them as queries, and measures how often each backend returns the
+original (recall) and how long each check takes. The baseline is an
+exhaustive scan scoring every open incident with the existing scorer.
+
+Usage:
+    python -m tests.benchmarks.bench_duplicate_backends --incidents 2000 --queries 100
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app import create_app, db
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.text_processor import TextProcessor
+
+SUBJECTS = ['client', 'portfolio', 'transfer', 'payment', 'statement', 'balance',
+            'login', 'valuation', 'order', 'report', 'account', 'mandate']
+PROBLEMS = ['timeout', 'failure', 'mismatch', 'delay', 'error', 'missing',
+            'duplicated', 'frozen', 'rejected', 'incorrect', 'stale', 'blank']
+CONTEXTS = ['overnight batch', 'mobile app', 'web portal', 'api gateway', 'custodian feed',
+            'fx conversion', 'month end', 'onboarding flow', 'tax wrapper', 'isa account']
+FILLER = ['reported', 'multiple', 'times', 'since', 'morning', 'after', 'release',
+          'escalated', 'urgent', 'retry', 'manual', 'workaround', 'screenshot', 'attached']
+
+
+def make_text(rng):
+    """Generate a synthetic (title, description) pair."""
+    subject, problem = rng.choice(SUBJECTS), rng.choice(PROBLEMS)
+    context = rng.choice(CONTEXTS)
+    title = f'{subject} {problem} in {context} ref {rng.randint(1000, 99999)}'
+    words = [subject, problem] + context.split() + rng.sample(FILLER, 6) + [f'case{rng.randint(1, 10 ** 6)}']
+    rng.shuffle(words)
+    return title, ' '.join(words)
+
+
+def reword(text, rng):
+    """Drop one word and swap in a filler word to simulate a re-reported incident."""
+    words = text.split()
+    words.pop(rng.randrange(len(words)))
+    words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER))
+    return ' '.join(words)
+
+
+def exhaustive_scan(title, description, platform, threshold, limit=5):
+    """Score every open incident on the platform (the pre-index behaviour without the 50-row cap)."""
+    scored = []
+    for incident in Incident.query.filter_by(platform=platform, status='Open').all():
+        similarity = (0.25 * TextProcessor.calculate_similarity(title, incident.title) +
+                      0.75 * TextProcessor.calculate_similarity(description, incident.description))
+        if similarity >= threshold:
+            scored.append((incident, similarity))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:limit]
+
+
+def build_corpus(count, seed):
+    """Insert `count` synthetic incidents and return their (id, title, description)."""
+    rng = random.Random(seed)
+    user = User.query.first()
+    rows = []
+    for _ in range(count):
+        title, description = make_text(rng)
+        incident = Incident(
+            title=title, description=description, platform='Additiv', journey='Other',
+            clients_affected=1, predicted_priority='Low', predicted_team='Additiv LCM',
+            priority='Low', assigned_team='Additiv LCM', status='Open', created_by=user.id
+        )
+        db.session.add(incident)
+        rows.append(incident)
+    db.session.commit()
+    return [(incident.id, incident.title, incident.description) for incident in rows]
+
+
+def run(incidents, queries, threshold, seed):
+    """Run the benchmark and print a recall/latency table."""
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        user = User(username='bench', email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+
+        print(f'Building corpus of {incidents} incidents...')
+        corpus = build_corpus(incidents, seed)
+
+        rng = random.Random(seed + 1)
+        planted = [(incident_id, title, reword(description, rng))
+                   for incident_id, title, description in rng.sample(corpus, queries)]
+
+        strategies = {
+            'exhaustive': lambda t, d: exhaustive_scan(t, d, 'Additiv', threshold),
+            'index': lambda t, d: DuplicateDetector.find_similar_incidents(t, d, 'Additiv', threshold, backend='index'),
+            'minhash': lambda t, d: DuplicateDetector.find_similar_incidents(t, d, 'Additiv', threshold, backend='minhash'),
+            'tfidf': lambda t, d: DuplicateDetector.find_similar_incidents(t, d, 'Additiv', threshold, backend='tfidf'),
+        }
+
+        print(f'\n{"backend":<12}{"recall":>8}{"mean ms":>10}{"p95 ms":>10}')
+        for name, strategy in strategies.items():
+            hits, timings = 0, []
+            for original_id, title, description in planted:
+                start = time.perf_counter()
+                results = strategy(title, description)
+                timings.append((time.perf_counter() - start) * 1000)
+                hits += any(incident.id == original_id for incident, _ in results)
+
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            print(f'{name:<12}{hits / len(planted):>8.2%}{statistics.mean(timings):>10.2f}{p95:>10.2f}')
+
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--incidents', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--threshold', type=float, default=0.75)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.incidents, args.queries, args.threshold, args.seed)
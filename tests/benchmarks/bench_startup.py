@@ -0,0 +1,91 @@
+"""
+Benchmark application startup.
+
+Times create_app the way a new gunicorn worker pays for it: cold (a fresh
+interpreter importing the app, then calling the factory) and warm (the
+factory alone, imports already cached). Each is measured with the default
+lazy startup and with INIT_DB_ON_STARTUP, which runs create_all, the
+migrations and the seed check inside the factory. Also reports how many
+database connections the factory opened.
+
+Usage:
+    python -m tests.benchmarks.bench_startup --runs 20 --config production
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+COLD_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app({config!r})
+print(json.dumps([imported - started, time.perf_counter() - imported]))
+"""
+
+
+def summarise(timings):
+    timings = sorted(seconds * 1000 for seconds in timings)
+    return statistics.median(timings), timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+def cold_start(config_name, runs, init_db):
+    """Import and factory times (seconds) of `runs` fresh interpreters."""
+    env = dict(os.environ, INIT_DB_ON_STARTUP=str(init_db))
+    imports, factories = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_SCRIPT.format(config=config_name)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        imported, factory = json.loads(output.strip().splitlines()[-1])
+        imports.append(imported)
+        factories.append(factory)
+    return imports, factories
+
+
+def warm_start(config_name, runs, init_db):
+    """Factory times (seconds) and connections opened, with imports cached."""
+    from app import create_app
+    from config import config
+
+    connections = []
+    listener = lambda *args: connections.append(1)  # noqa: E731
+    event.listen(Pool, 'connect', listener)
+    config[config_name].INIT_DB_ON_STARTUP = init_db
+    timings = []
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            create_app(config_name)
+            timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(Pool, 'connect', listener)
+        config[config_name].INIT_DB_ON_STARTUP = False
+    return timings, len(connections) / runs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--config', default='production',
+                        help='Configuration name passed to create_app (default production)')
+    args = parser.parse_args()
+
+    for label, init_db in (('Lazy startup (default)', False), ('INIT_DB_ON_STARTUP=True', True)):
+        imports, factories = cold_start(args.config, args.runs, init_db)
+        warm, connections = warm_start(args.config, args.runs, init_db)
+        print(f'\n{label}: {connections:.1f} connection(s) opened per create_app')
+        for name, timings in (('cold import', imports), ('cold create_app', factories),
+                              ('warm create_app', warm)):
+            median, p95 = summarise(timings)
+            print(f'  {name:<20}{median:>9.1f} ms{p95:>9.1f} ms p95')
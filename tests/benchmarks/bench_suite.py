@@ -0,0 +1,216 @@
+"""
+Benchmark suite for the triage and duplicate-detection hot paths.
+
+Times text preprocessing, similarity scoring, duplicate lookup, priority
+prediction, team routing and the main routes (through the Flask test
+client, including incident creation) against synthetic corpora of each
+requested size built by app.utils.corpus. Results can be saved as a JSON
+baseline and later runs compared against it: any case whose median is
+slower than the baseline by more than the tolerance is flagged and the run
+exits with status 1.
+
+Usage:
+    python -m tests.benchmarks.bench_suite --sizes 1000 10000 100000 --save tests/benchmarks/baseline.json
+    python -m tests.benchmarks.bench_suite --compare tests/benchmarks/baseline.json --tolerance 0.25
+
+Timings depend on the machine: record and compare baselines on the same host.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from flask import g
+
+from app import create_app, db
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.classifier import predict_priority
+from app.utils.corpus import generate_corpus
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.router import assign_team
+from app.utils.text_processor import TextProcessor
+from tests.benchmarks.bench_duplicate_backends import make_text, reword
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+PLATFORMS = ['Additiv', 'Avaloq']
+JOURNEYS = ['Login', 'Transfer', 'Payment', 'Balance View', 'Account Access',
+            'Data Sync', 'Reporting', 'Other']
+BENCH_PASSWORD = 'BenchPass123!'
+
+# (timed samples, calls per sample) by case kind; pure functions run in
+# batches so timer overhead and jitter do not swamp microsecond calls
+REPEATS = {'function': (200, 100), 'lookup': (200, 1), 'route': (50, 1)}
+WARMUP = 5
+
+
+def measure(func, runs, calls=1):
+    """Time `runs` samples of `calls` calls each after a warm-up; latencies are per call."""
+    for _ in range(WARMUP):
+        func()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings.append((time.perf_counter() - start) * 1000 / calls)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 4),
+        'runs': runs * calls,
+    }
+
+
+def corpus_sample(size, count=500):
+    """(title, description) of `count` incidents spread evenly through the corpus."""
+    step = max(size // count, 1)
+    return [
+        (title, description)
+        for title, description in db.session.query(Incident.title, Incident.description).filter(
+            Incident.id % step == 0
+        ).limit(count)
+    ]
+
+
+def benchmark_cases(client, sample, seed):
+    """Build the (name, kind, callable) benchmark cases for one corpus sample."""
+    rng = random.Random(seed + 1)
+    descriptions = itertools.cycle([description for _, description in sample])
+    pairs = itertools.cycle([(a[1], b[1]) for a, b in zip(sample, reversed(sample))])
+    queries = itertools.cycle([(title, reword(description, rng)) for title, description in sample])
+    triage_inputs = itertools.cycle([
+        (rng.choice(PLATFORMS), rng.choice(JOURNEYS), rng.choice([1, 4, 12]), description)
+        for _, description in sample
+    ])
+    routing_inputs = itertools.cycle([
+        (rng.choice(PLATFORMS), rng.choice(JOURNEYS), description) for _, description in sample
+    ])
+    incident_ids = itertools.cycle([row[0] for row in db.session.query(Incident.id).limit(500)])
+    creations = itertools.count()
+
+    def find_similar():
+        title, description = next(queries)
+        DuplicateDetector.find_similar_incidents(title, description, 'Additiv', threshold=0.5)
+
+    def create_incident():
+        title, description = make_text(rng)
+        client.post('/incidents/create', data={
+            'title': f'{title} bench {next(creations)}', 'description': description,
+            'platform': 'Avaloq', 'journey': 'Reporting', 'clients_affected': 1,
+            'confirm_create': 'yes',
+        })
+
+    return [
+        ('preprocess_text', 'function', lambda: TextProcessor.preprocess_text(next(descriptions))),
+        ('calculate_similarity', 'function', lambda: TextProcessor.calculate_similarity(*next(pairs))),
+        ('predict_priority', 'function', lambda: predict_priority(*next(triage_inputs))),
+        ('assign_team', 'function', lambda: assign_team(*next(routing_inputs))),
+        ('find_similar_incidents', 'lookup', find_similar),
+        ('GET /dashboard', 'route', lambda: client.get('/dashboard')),
+        ('GET /incidents/list', 'route', lambda: client.get('/incidents/list')),
+        ('GET /incidents/list?priority=High', 'route', lambda: client.get('/incidents/list?priority=High')),
+        ('GET /incidents/<id>', 'route', lambda: client.get(f'/incidents/{next(incident_ids)}')),
+        ('POST /incidents/create', 'route', create_incident),
+    ]
+
+
+def run(sizes, seed):
+    """Run every case against each corpus size and return the results document."""
+    app = create_app('testing')
+    results = {}
+    with app.app_context():
+        for size in sizes:
+            # Requests share this app context, so drop the previous size's logged-in user too
+            db.session.remove()
+            g.pop('_login_user', None)
+            db.drop_all(bind_key=None)
+            db.create_all(bind_key=None)
+            print(f'Building corpus of {size} incidents...', flush=True)
+            started = time.perf_counter()
+            generate_corpus(size, users=5, admins=1, password=BENCH_PASSWORD, seed=seed)
+            print(f'  built in {time.perf_counter() - started:.1f}s')
+
+            client = app.test_client()
+            username = User.query.filter_by(is_admin=False).order_by(User.id).first().username
+            client.post('/auth/login', data={'username': username, 'password': BENCH_PASSWORD})
+
+            results[str(size)] = {}
+            for name, kind, func in benchmark_cases(client, corpus_sample(size), seed):
+                results[str(size)][name] = stats = measure(func, *REPEATS[kind])
+                print(f'  {name:<36}{stats["median_ms"]:>10.3f} ms{stats["p95_ms"]:>10.3f} ms p95', flush=True)
+
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'machine': platform.machine(),
+            'seed': seed,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    Print each case's median against the baseline and list the regressions.
+
+    Returns:
+        list: (size, case, ratio) for cases slower than baseline * (1 + tolerance)
+    """
+    for key in ('python', 'sqlite', 'machine'):
+        if current['meta'].get(key) != baseline['meta'].get(key):
+            print(f'⚠️  Baseline {key} {baseline["meta"].get(key)} differs from {current["meta"].get(key)}')
+
+    regressions = []
+    print(f'\n{"size":>8}  {"case":<36}{"baseline":>11}{"current":>11}{"change":>9}')
+    for size, cases in current['results'].items():
+        for name, stats in cases.items():
+            before = baseline['results'].get(size, {}).get(name)
+            if before is None:
+                continue
+            ratio = stats['median_ms'] / before['median_ms'] if before['median_ms'] else 1.0
+            flag = ''
+            if ratio > 1 + tolerance:
+                regressions.append((size, name, ratio))
+                flag = '  REGRESSION'
+            print(f'{size:>8}  {name:<36}{before["median_ms"]:>11.3f}{stats["median_ms"]:>11.3f}'
+                  f'{ratio - 1:>+9.1%}{flag}')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help='Write the results to this JSON baseline file')
+    parser.add_argument('--compare', help='Compare the results with this JSON baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown of a median before it counts as a regression (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    document = run(args.sizes, args.seed)
+
+    if args.save:
+        with open(args.save, 'w') as handle:
+            json.dump(document, handle, indent=2)
+        print(f'\nSaved results to {args.save}')
+
+    if args.compare:
+        with open(args.compare) as handle:
+            found = compare(document, json.load(handle), args.tolerance)
+        if found:
+            print(f'\n❌ {len(found)} case(s) slower than the baseline by more than {args.tolerance:.0%}')
+            sys.exit(1)
+        print(f'\n✅ No case slower than the baseline by more than {args.tolerance:.0%}')
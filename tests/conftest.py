@@ -1,6 +1,7 @@
 """
 PyTest configuration and fixtures.
-Provides reusable test setup including test client and database.
+Provides reusable test setup including test client, database and an
+incident factory.
 """
 
 import pytest
@@ -21,9 +22,9 @@ def app():
     
     with test_app.app_context():
         # Drop all tables first (in case the app factory created them)
-        db.drop_all()
+        db.drop_all(bind_key=None)
         # Create all tables
-        db.create_all()
+        db.create_all(bind_key=None)
         
         # Create test users
         testuser = User(
@@ -86,7 +87,7 @@ def app():
         
         # Cleanup
         db.session.remove()
-        db.drop_all()
+        db.drop_all(bind_key=None)
 
 
 @pytest.fixture
@@ -107,4 +108,34 @@ def sample_incident(app):
         incident = Incident.query.filter_by(
             title='Test incident for unit testing'
         ).first()
-        return incident
\ No newline at end of file
+        return incident
+
+
+@pytest.fixture
+def incident_factory(app):
+    """
+    Create incidents owned by testuser with fixed triage values.
+
+    Call the returned function with a title and description, plus any
+    Incident fields to override the defaults; predicted values follow
+    priority and assigned_team unless given, and fields passed as None are
+    left to the column defaults. The incident is committed unless
+    commit=False is passed.
+    """
+    def make_incident(title='Test incident', description='Test incident description', commit=True, **fields):
+        user = User.query.filter_by(username='testuser').first()
+        values = dict(
+            title=title, description=description,
+            platform='Avaloq', journey='Reporting', clients_affected=1,
+            priority='Low', assigned_team='LCM', status='Open', created_by=user.id
+        )
+        values.update(fields)
+        values.setdefault('predicted_priority', values['priority'])
+        values.setdefault('predicted_team', values['assigned_team'])
+        incident = Incident(**{name: value for name, value in values.items() if value is not None})
+        db.session.add(incident)
+        if commit:
+            db.session.commit()
+        return incident
+
+    return make_incident
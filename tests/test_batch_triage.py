@@ -0,0 +1,129 @@
+"""
+Test batch triage.
+Validates that the vectorised rules match predict_priority and assign_team row for row.
+"""
+
+import itertools
+
+import pandas as pd
+import pytest
+
+from app.utils.batch_triage import triage_batch
+from app.utils.classifier import predict_priority
+from app.utils.router import assign_team
+
+PLATFORMS = ['Additiv', 'Avaloq', 'Other']
+JOURNEYS = ['Login', 'Transfer', 'Payment', 'Balance View', 'Account Access',
+            'Data Sync', 'Reporting', 'Other']
+CLIENTS = [1, 2, 4, 6, 11]
+DESCRIPTIONS = [
+    'Statement looks odd',
+    'Users cannot sign in',
+    'Portfolio data mismatch',
+    'Screen frozen after release',
+    'Payment rejected at gateway',
+    'Service unavailable for the morning',
+]
+
+
+def all_rows():
+    """Every combination of the sample values above."""
+    return list(itertools.product(PLATFORMS, JOURNEYS, CLIENTS, DESCRIPTIONS))
+
+
+def test_batch_matches_per_row_functions():
+    """Test every rule combination gives the same result as the per-row functions."""
+    rows = all_rows()
+    results = triage_batch(rows)
+
+    assert len(results) == len(rows)
+    for (platform, journey, clients, description), result in zip(rows, results):
+        assert result == {
+            'priority': predict_priority(platform, journey, clients, description),
+            'team': assign_team(platform, journey, description),
+        }
+
+
+def test_batch_accepts_dataframe():
+    """Test DataFrame input returns a DataFrame aligned to the input index."""
+    frame = pd.DataFrame(all_rows(), columns=['platform', 'journey', 'clients_affected', 'description'])
+    frame.index = frame.index + 100
+
+    results = triage_batch(frame)
+
+    assert list(results.columns) == ['priority', 'team']
+    assert results.index.equals(frame.index)
+    assert results.to_dict('records') == triage_batch(all_rows())
+
+
+def test_batch_accepts_dicts_and_empty_input():
+    """Test dict rows and an empty batch."""
+    rows = [{'platform': 'Avaloq', 'journey': 'Reporting', 'clients_affected': '1',
+             'description': 'Report totals look odd'}]
+    assert triage_batch(rows) == [{'priority': 'Low', 'team': 'LCM'}]
+    assert triage_batch([]) == []
+
+
+def test_batch_rejects_invalid_rows():
+    """Test missing fields and non-numeric client counts raise ValueError."""
+    with pytest.raises(ValueError):
+        triage_batch([{'platform': 'Additiv', 'journey': 'Login', 'description': 'x'}])
+    with pytest.raises(ValueError):
+        triage_batch([('Additiv', 'Login', 'many', 'x')])
+    with pytest.raises(ValueError):
+        triage_batch(pd.DataFrame({'platform': ['Additiv']}))
+
+
+@pytest.mark.parametrize('field, value', [
+    ('description', 5),
+    ('platform', None),
+    ('journey', ['Login']),
+    ('clients_affected', 12.9),
+    ('clients_affected', '12.9'),
+    ('clients_affected', True),
+])
+def test_batch_rejects_wrong_types_with_row_number(field, value):
+    """Test a wrongly typed field fails with its row number instead of being coerced."""
+    valid = {'platform': 'Additiv', 'journey': 'Login', 'clients_affected': 2, 'description': 'Login slow'}
+    with pytest.raises(ValueError, match=f'Row 1: {field}'):
+        triage_batch([valid, dict(valid, **{field: value})])
+
+
+def test_batch_accepts_whole_float_counts():
+    """Test 12.0 (as JSON or a float DataFrame column) is accepted as 12."""
+    frame = pd.DataFrame({'platform': ['Additiv'], 'journey': ['Login'],
+                          'clients_affected': [15.0], 'description': ['Login down']})
+    assert triage_batch(frame)['priority'].tolist() == ['High']
+
+
+def test_batch_endpoint(client):
+    """Test the JSON endpoint triages every incident and validates input."""
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+
+    response = client.post('/incidents/triage/batch', json={'incidents': [
+        {'platform': 'Additiv', 'journey': 'Login', 'clients_affected': 15, 'description': 'Login down'},
+        {'platform': 'Avaloq', 'journey': 'Other', 'clients_affected': 1, 'description': 'Statement looks odd'},
+    ]})
+    assert response.status_code == 200
+    assert response.get_json() == {'count': 2, 'results': [
+        {'priority': 'High', 'team': 'LCM'},
+        {'priority': 'Low', 'team': 'Avaloq Support'},
+    ]}
+
+    response = client.post('/incidents/triage/batch', json={'incidents': [{'platform': 'Additiv'}]})
+    assert response.status_code == 400
+    assert 'missing' in response.get_json()['error']
+
+    assert client.post('/incidents/triage/batch', json={}).status_code == 400
+
+    response = client.post('/incidents/triage/batch', json={'incidents': [
+        {'platform': 'Additiv', 'journey': 'Login', 'clients_affected': 1, 'description': 5},
+    ]})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Row 0: description must be a string'
+
+
+def test_batch_endpoint_requires_login(client):
+    """Test anonymous requests are redirected to the login page."""
+    response = client.post('/incidents/triage/batch', json={'incidents': []})
+    assert response.status_code == 302
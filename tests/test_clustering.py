@@ -0,0 +1,86 @@
+"""
+Test the offline near-duplicate clustering job.
+Validates union-find, cluster assignment (in-process and with a worker
+pool), checkpoint resume and that completed runs leave no checkpoint.
+"""
+
+import json
+
+from app import db
+from app.models.incident import Incident
+from app.utils.clustering import ClusterJob, UnionFind
+
+
+def test_union_find_keeps_smallest_root():
+    """Test merged sets share the smallest id as root."""
+    union_find = UnionFind()
+    union_find.union(5, 3)
+    union_find.union(9, 5)
+    union_find.union(12, 20)
+
+    assert union_find.find(9) == 3
+    assert union_find.find(20) == 12
+    assert union_find.find(7) == 7
+
+
+def test_job_clusters_near_duplicates(incident_factory, tmp_path):
+    """Test reworded reports of one outage share a cluster, others do not."""
+    outage = [
+        incident_factory('Card payments declined', 'Card payments declined at checkout for all clients',
+                         status='Resolved').id,
+        incident_factory('Card payments declined', 'Card payments declined at checkout for clients').id,
+        incident_factory('Card payments declined', 'All card payments declined at checkout for clients').id,
+    ]
+    other = incident_factory('Statement PDF blank', 'Monthly statement PDF renders as a blank page').id
+
+    job = ClusterJob(str(tmp_path / 'checkpoint.json'), chunk_size=2, workers=1, log=lambda msg: None)
+    clusters = job.run()
+
+    cluster_ids = {db.session.get(Incident, i).cluster_id for i in outage}
+    assert clusters == 1
+    assert cluster_ids == {outage[0]}
+    assert db.session.get(Incident, other).cluster_id == other
+
+
+def test_job_scores_in_worker_processes(incident_factory, tmp_path):
+    """Test the process pool path finds the same clusters as in-process scoring."""
+    outage = [
+        incident_factory('Card payments declined', 'Card payments declined at checkout for all clients').id,
+        incident_factory('Card payments declined', 'Card payments declined at checkout for clients').id,
+        incident_factory('Card payments declined', 'All card payments declined at checkout for clients').id,
+    ]
+    other = incident_factory('Statement PDF blank', 'Monthly statement PDF renders as a blank page').id
+
+    job = ClusterJob(str(tmp_path / 'checkpoint.json'), chunk_size=2, workers=2, log=lambda msg: None)
+
+    assert job.run() == 1
+    assert {db.session.get(Incident, i).cluster_id for i in outage} == {outage[0]}
+    assert db.session.get(Incident, other).cluster_id == other
+
+
+def test_job_resumes_from_checkpoint(incident_factory, tmp_path):
+    """Test a mid-run checkpoint and its edge log are honoured, then removed."""
+    first = incident_factory('Card payments declined', 'Card payments declined at checkout for clients').id
+    second = incident_factory('Card payments declined', 'Card payments declined at checkout for all clients').id
+    checkpoint = tmp_path / 'checkpoint.json'
+    job = ClusterJob(str(checkpoint), workers=1, log=lambda msg: None)
+
+    # Simulate a run interrupted after scoring: only the write phase remains
+    checkpoint.write_text(json.dumps({'phase': 'write', 'last_id': 0, 'threshold': 0.75}))
+    job.append_edges([(second, first)])
+
+    assert job.run() == 1
+    assert db.session.get(Incident, second).cluster_id == first
+    assert not checkpoint.exists()
+    assert not (tmp_path / 'checkpoint.json.edges').exists()
+
+
+def test_next_run_clusters_new_incidents(incident_factory, tmp_path):
+    """Test a completed run does not stop later runs from clustering new incidents."""
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    first = incident_factory('Card payments declined', 'Card payments declined at checkout for clients').id
+    ClusterJob(checkpoint, workers=1, log=lambda msg: None).run()
+
+    second = incident_factory('Card payments declined', 'Card payments declined at checkout for all clients').id
+    assert ClusterJob(checkpoint, workers=1, log=lambda msg: None).run() == 1
+    assert db.session.get(Incident, second).cluster_id == first
@@ -0,0 +1,72 @@
+"""
+Test the synthetic corpus generator.
+Validates row counts, near-duplicate and override rates, and the rebuilt derived tables.
+"""
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.corpus import CorpusGenerator, generate_corpus
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.incident_counters import IncidentCounters
+from app.utils.response_cache import GENERATION, current_generation, duplicate_generation_name
+
+
+def test_generator_is_deterministic():
+    """Test the same seed gives the same rows."""
+    first = CorpusGenerator(seed=7)
+    second = CorpusGenerator(seed=7)
+    end = first.end
+    second.end = end
+    rows = [first.incident(i, [1])[0] for i in range(1, 50)]
+    assert rows == [second.incident(i, [1])[0] for i in range(1, 50)]
+
+
+def test_generate_corpus(app):
+    """Test incidents, users and audit logs are written and the derived tables rebuilt."""
+    before = Incident.query.count()
+    summary = generate_corpus(2000, users=4, admins=2, batch_size=700,
+                              near_duplicate_rate=0.2, override_rate=0.05, seed=3)
+
+    assert summary['incidents'] == 2000
+    assert Incident.query.count() == before + 2000
+    assert User.query.filter(User.username.like('synthetic_%')).count() == 6
+    assert 300 < summary['near_duplicates'] < 500
+    assert AuditLog.query.count() == summary['audit_logs'] > 0
+    assert Incident.query.filter_by(is_overridden=True).count() == summary['audit_logs']
+    assert {status for (status,) in db.session.query(Incident.status).distinct()} <= {
+        'Open', 'In Progress', 'Resolved', 'Closed'
+    }
+    assert IncidentCounters.totals()[0][-1] == before + 2000
+
+
+def test_generated_users_can_log_in(client, app):
+    """Test the shared password works for generated users."""
+    generate_corpus(10, users=1, admins=0, password='Synthetic123!')
+    user = User.query.filter(User.username.like('synthetic_user%')).first()
+
+    response = client.post('/auth/login', data={'username': user.username, 'password': 'Synthetic123!'})
+    assert response.status_code == 302
+
+
+def test_near_duplicates_are_detected(app):
+    """Test a near-duplicate re-report is found through the rebuilt token index."""
+    generate_corpus(300, near_duplicate_rate=0.3, seed=5)
+    duplicate = Incident.query.filter_by(duplicate_flag=True).first()
+
+    matches = DuplicateDetector.find_similar_incidents(
+        duplicate.title, duplicate.description, duplicate.platform, threshold=0.5
+    )
+    assert any(incident.id != duplicate.id for incident, _ in matches)
+
+
+def test_bulk_load_invalidates_cached_data(app):
+    """Test the core inserts bump the generations the flush hook would have bumped."""
+    names = [GENERATION] + [duplicate_generation_name(platform) for platform in ('Additiv', 'Avaloq')]
+    before = [current_generation(name) for name in names]
+
+    generate_corpus(50, users=1, admins=0, seed=11)
+
+    after = [current_generation(name) for name in names]
+    assert all(new is not None and new != old for old, new in zip(before, after))
@@ -0,0 +1,151 @@
+"""
+Test the live duplicate suggestions on the create form.
+Validates the JSON results, that growing text only loads new rows, that
+unchanged text is not re-scored, that cached state is never changed in
+place, the latency budget and invalidation when incident data changes.
+"""
+
+import pytest
+
+from app import db
+from app.models.incident import Incident
+from app.utils import duplicate_suggestions
+from app.utils.text_processor import TextProcessor
+from app.utils.token_index import TokenIndex
+
+TITLE = 'Test incident for unit testing'
+DESCRIPTION = 'This is a test incident created for automated testing purposes.'
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Record the token sets passed to TokenIndex.candidate_ids."""
+    calls = []
+    original = TokenIndex.candidate_ids
+
+    def recording(tokens, platform, limit=200):
+        calls.append(set(tokens))
+        return original(tokens, platform, limit=limit)
+
+    monkeypatch.setattr(TokenIndex, 'candidate_ids', staticmethod(recording))
+    return calls
+
+
+def login(client):
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+
+
+def suggest(client, title=TITLE, description=DESCRIPTION, platform='Additiv'):
+    response = client.post('/incidents/duplicates/suggest', json={
+        'title': title, 'description': description, 'platform': platform
+    })
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_suggestions_list_similar_incidents(client):
+    """Test matching text returns the seeded incident and other platforms return nothing."""
+    login(client)
+    data = suggest(client)
+    assert data['partial'] is False
+    assert [suggestion['title'] for suggestion in data['suggestions']] == [TITLE]
+    assert data['suggestions'][0]['url'].startswith('/incidents/')
+
+    assert suggest(client, platform='Avaloq')['suggestions'] == []
+    assert suggest(client, title='', description='')['suggestions'] == []
+
+
+def test_suggestions_validate_the_request(client):
+    """Test anonymous users are redirected and malformed bodies rejected."""
+    assert client.post('/incidents/duplicates/suggest', json={}).status_code == 302
+    login(client)
+    for body in ({'title': TITLE, 'platform': 'Other'}, {'title': 5, 'platform': 'Additiv'}, ['x']):
+        assert client.post('/incidents/duplicates/suggest', json=body).status_code == 400
+
+
+def test_full_description_fits(client):
+    """Test a description at the form's 2,000 character limit is accepted."""
+    login(client)
+    data = suggest(client, description=DESCRIPTION + ' ' + 'testing ' * 250)
+    assert data['partial'] is False
+
+
+def test_growing_text_only_loads_new_rows(client, lookups, monkeypatch):
+    """Test lookups rank against the whole text but cached rows are not loaded again."""
+    fetched = []
+    original = duplicate_suggestions._fetch_rows
+
+    def recording(incident_ids):
+        fetched.append(list(incident_ids))
+        return original(incident_ids)
+
+    monkeypatch.setattr(duplicate_suggestions, '_fetch_rows', recording)
+    login(client)
+    suggest(client, description='This is a test incident')
+    suggest(client, description='This is a test incident created for automated')
+    suggest(client, description='This is a test incident created for')
+
+    assert lookups == [
+        TokenIndex.tokens_for(TITLE, 'This is a test incident'),
+        TokenIndex.tokens_for(TITLE, 'This is a test incident created for automated'),
+    ]
+    assert len(fetched) == 1
+
+
+def test_cached_state_is_never_changed_in_place(client, app):
+    """Test a request stores a new state instead of mutating the one other requests read."""
+    login(client)
+    suggest(client, description='This is a test incident')
+    with client.session_transaction() as session:
+        key = f"{duplicate_suggestions.SESSION_KEY}:{session[duplicate_suggestions.SESSION_KEY]}"
+    cache = app.extensions['session_cache']
+    before = cache.get(key)
+    snapshot = dict(before, candidates=dict(before['candidates']))
+
+    suggest(client)
+
+    assert before == snapshot
+    assert cache.get(key) is not before
+
+
+def test_unchanged_text_is_not_rescored(client, monkeypatch):
+    """Test a repeated request (e.g. a platform toggled back) reuses the last ranking."""
+    login(client)
+    first = suggest(client)
+
+    scored = []
+    original = TextProcessor.weighted_similarity
+
+    def counting(fields, min_score=0.0):
+        scored.append(fields)
+        return original(fields, min_score=min_score)
+
+    monkeypatch.setattr(TextProcessor, 'weighted_similarity', staticmethod(counting))
+    assert suggest(client) == first
+    assert scored == []
+
+
+def test_exhausted_budget_returns_partial_results(client, app):
+    """Test scoring stops at the latency budget and says so."""
+    login(client)
+    app.config['DUPLICATE_SUGGEST_BUDGET_MS'] = 0
+    data = suggest(client)
+    assert data == {'partial': True, 'suggestions': []}
+
+    # A partial ranking is completed by the next request for the same text
+    app.config['DUPLICATE_SUGGEST_BUDGET_MS'] = 1000
+    assert len(suggest(client)['suggestions']) == 1
+
+
+def test_data_change_drops_cached_candidates(client, app, lookups):
+    """Test resolving an incident removes it from suggestions straight away."""
+    login(client)
+    assert len(suggest(client)['suggestions']) == 1
+
+    with app.app_context():
+        incident = Incident.query.filter_by(title=TITLE).first()
+        incident.status = 'Resolved'
+        db.session.commit()
+
+    assert suggest(client)['suggestions'] == []
+    assert len(lookups) == 2
@@ -0,0 +1,118 @@
+"""
+Test reuse of the duplicate check across the create/confirm round trip.
+Validates that confirming reuses the stored result, also across unrelated
+writes, and that edits, changes to the platform's incidents, forged tokens
+and other users' tokens all fall back to a new check.
+"""
+
+import re
+
+import pytest
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.incident import Incident
+from app.utils.duplicate_detector import DuplicateDetector
+
+DUPLICATE_FORM = {
+    'title': 'Test incident for unit testing',
+    'description': 'This is a test incident created for automated testing purposes.',
+    'platform': 'Additiv', 'journey': 'Login', 'clients_affected': 2,
+}
+
+
+@pytest.fixture
+def checks(monkeypatch):
+    """Count calls to DuplicateDetector.check_for_duplicates."""
+    calls = []
+    original = DuplicateDetector.check_for_duplicates
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs.get('title'))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(DuplicateDetector, 'check_for_duplicates', staticmethod(counting))
+    return calls
+
+
+def login(client, username='testuser', password='TestPass123!'):
+    client.post('/auth/login', data={'username': username, 'password': password})
+
+
+def warn(client, **fields):
+    """Submit the create form, expect the duplicate warning and return its token."""
+    response = client.post('/incidents/create', data=dict(DUPLICATE_FORM, **fields))
+    assert response.status_code == 200
+    match = re.search(rb'name="duplicate_token" value="([^"]+)"', response.data)
+    assert match, 'duplicate warning without a token'
+    return match.group(1).decode()
+
+
+def confirm(client, token, **fields):
+    response = client.post('/incidents/create', data=dict(
+        DUPLICATE_FORM, confirm_create='yes', duplicate_token=token, **fields
+    ))
+    assert response.status_code == 302
+    return response
+
+
+def test_confirm_reuses_the_check(client, app, checks):
+    """Test confirming runs no second duplicate check and still flags the incident."""
+    login(client)
+    confirm(client, warn(client))
+
+    assert len(checks) == 1
+    with app.app_context():
+        incident = Incident.query.order_by(Incident.id.desc()).first()
+        assert incident.duplicate_flag is True
+        assert incident.duplicate_score is not None
+
+
+def test_edited_form_is_checked_again(client, checks):
+    """Test a token only covers the exact title, description and platform it was issued for."""
+    login(client)
+    token = warn(client)
+    confirm(client, token, title='Test incident for unit testing again')
+    assert len(checks) == 2
+
+
+def test_data_change_forces_a_new_check(client, app, checks):
+    """Test a write between warning and confirmation invalidates the stored result."""
+    login(client)
+    token = warn(client)
+    with app.app_context():
+        incident = Incident.query.first()
+        incident.status = 'Resolved'
+        db.session.commit()
+
+    confirm(client, token)
+    assert len(checks) == 2
+
+
+def test_unrelated_writes_keep_the_check(client, app, checks, incident_factory):
+    """Test writes that cannot change the outcome (other platforms, priorities, audit logs) keep it."""
+    login(client)
+    token = warn(client)
+    with app.app_context():
+        incident = Incident.query.first()
+        incident.priority = 'Low'
+        db.session.add(AuditLog(incident_id=incident.id, field_changed='priority', old_priority='High',
+                                new_priority='Low', reason_code='other', changed_by_user_id=incident.created_by))
+        db.session.commit()
+        incident_factory(DUPLICATE_FORM['title'], DUPLICATE_FORM['description'], platform='Avaloq')
+
+    confirm(client, token)
+    assert len(checks) == 1
+
+
+def test_forged_or_foreign_tokens_are_ignored(client, app, checks):
+    """Test tampered tokens and tokens issued to another user trigger a new check."""
+    login(client)
+    token = warn(client)
+    confirm(client, token[:-2] + ('AA' if not token.endswith('AA') else 'BB'))
+    assert len(checks) == 2
+
+    other = app.test_client()
+    login(other, 'helpline_user', 'Helpline123!')
+    confirm(other, token)
+    assert len(checks) == 3
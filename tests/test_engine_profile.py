@@ -0,0 +1,57 @@
+"""
+Test the SQLite engine tuning profile.
+Validates that the configured PRAGMAs are applied to every new connection.
+"""
+
+from sqlalchemy import create_engine, text
+
+from app import create_app, db
+from app.utils.engine_profile import apply_sqlite_pragmas, pragma_statements
+from config import SQLITE_SERVER_PRAGMAS, ProductionConfig, config
+
+
+def pragma(connection, name):
+    return connection.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_pragma_statements_keep_order():
+    """Test the busy timeout is set before switching to WAL."""
+    statements = pragma_statements(SQLITE_SERVER_PRAGMAS)
+    assert statements[0].startswith('PRAGMA busy_timeout=')
+    assert 'PRAGMA journal_mode=WAL' in statements
+
+
+def test_every_connection_gets_the_profile(tmp_path):
+    """Test pooled connections all run with the profile."""
+    engine = create_engine(f'sqlite:///{tmp_path / "tuned.db"}')
+    apply_sqlite_pragmas(engine, SQLITE_SERVER_PRAGMAS)
+
+    with engine.connect() as first, engine.connect() as second:
+        for connection in (first, second):
+            assert pragma(connection, 'journal_mode') == 'wal'
+            assert pragma(connection, 'synchronous') == 1  # NORMAL
+            assert pragma(connection, 'busy_timeout') == SQLITE_SERVER_PRAGMAS['busy_timeout']
+            assert pragma(connection, 'temp_store') == 2  # MEMORY
+    engine.dispose()
+
+
+def test_production_config_applies_profile_and_pool_options(tmp_path, monkeypatch):
+    """Test the production config tunes its engine and sizes its pool."""
+    monkeypatch.setitem(config, 'tuned', type('TunedConfig', (ProductionConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "prod.db"}',
+        'TESTING': True  # No log file
+    }))
+    app = create_app('tuned')
+
+    with app.app_context():
+        assert db.engine.pool.size() == ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+        with db.engine.connect() as connection:
+            assert pragma(connection, 'journal_mode') == 'wal'
+            assert pragma(connection, 'mmap_size') == SQLITE_SERVER_PRAGMAS['mmap_size']
+        db.engine.dispose()
+
+
+def test_testing_config_keeps_sqlite_defaults(app):
+    """Test configs without a profile leave connections untouched."""
+    with db.engine.connect() as connection:
+        assert pragma(connection, 'journal_mode') == 'delete'
@@ -0,0 +1,131 @@
+"""
+Test the SQLite FTS5 full-text index and search endpoint.
+Validates trigger maintenance, ranking, fallback and the search route.
+"""
+
+from sqlalchemy import text
+
+from app import db
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.fts_index import FullTextIndex
+
+
+def login(client, username='testuser', password='TestPass123!'):
+    """Log in through the login form."""
+    return client.post('/auth/login', data={'username': username, 'password': password})
+
+
+def test_index_created_with_schema(app):
+    """Test create_all also creates the FTS5 table."""
+    assert FullTextIndex.is_available() is True
+
+
+def test_search_finds_by_description_terms(incident_factory):
+    """Test search matches description text and supports prefix on the last term."""
+    incident = incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+
+    assert incident in FullTextIndex.search('reconciliation')
+    assert incident in FullTextIndex.search('custodian reconcil')
+    assert FullTextIndex.search('reconciliation', platform='Additiv') == []
+
+
+def test_triggers_follow_updates_and_deletes(incident_factory):
+    """Test edits and deletes are reflected in the index."""
+    incident = incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+    incident_id = incident.id
+
+    incident.description = 'Dividend payment missing'
+    db.session.commit()
+    assert FullTextIndex.search('reconciliation') == []
+    assert [i.id for i in FullTextIndex.search('dividend')] == [incident_id]
+
+    db.session.delete(incident)
+    db.session.commit()
+    assert FullTextIndex.search('dividend') == []
+
+
+def test_search_ignores_query_syntax(incident_factory):
+    """Test FTS5 operators in user input cannot break the query."""
+    incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+
+    results = FullTextIndex.search('custody" * (')
+
+    assert [incident.title for incident in results] == ['Custody report late']
+    assert FullTextIndex.search('***') == []
+
+
+def test_search_splits_codes_like_the_index(incident_factory):
+    """Test error codes and hyphenated words from the seed data are found as typed."""
+    incident = incident_factory(
+        'Client cannot log into Additiv platform',
+        'Client reports login failure with error code AUTH_TIMEOUT. Resend the e-mail code.',
+        platform='Additiv'
+    )
+
+    assert FullTextIndex.query_terms('AUTH_TIMEOUT e-mail') == ['auth', 'timeout', 'e', 'mail']
+    assert incident in FullTextIndex.search('AUTH_TIMEOUT')
+    assert incident in FullTextIndex.search('e-mail')
+
+    # The LIKE fallback gets the same terms
+    db.session.execute(text('DROP TABLE incidents_fts'))
+    db.session.commit()
+    assert incident in FullTextIndex.search('AUTH_TIMEOUT')
+    assert incident in FullTextIndex.search('e-mail')
+
+
+def test_fallback_without_fts_table(incident_factory):
+    """Test search and candidates still work when the FTS5 table is missing."""
+    incident = incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+    db.session.execute(text('DROP TABLE incidents_fts'))
+    db.session.commit()
+
+    assert FullTextIndex.is_available() is False
+    assert incident in FullTextIndex.search('reconciliation')
+    assert incident.id in FullTextIndex.candidate_ids('Reconciliation', '', 'Avaloq')
+
+
+def test_fts_backend_finds_duplicate(incident_factory):
+    """Test the 'fts' DuplicateDetector backend only returns open incidents."""
+    open_incident = incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+    incident_factory('Custody report late', 'Custodian statement reconciliation delayed', status='Resolved')
+
+    result = DuplicateDetector.check_for_duplicates(
+        title='Custody report late',
+        description='Custodian statement reconciliation delayed',
+        platform='Avaloq',
+        backend='fts'
+    )
+
+    assert [incident.id for incident, _ in result['similar_incidents']] == [open_incident.id]
+
+
+def test_fts_backend_matches_codes_like_the_index(app, incident_factory):
+    """Test DUPLICATE_BACKEND='fts' finds an incident by an error code written with underscores."""
+    app.config['DUPLICATE_BACKEND'] = 'fts'
+    incident = incident_factory('AUTH_TIMEOUT failure', 'Login fails with AUTH_TIMEOUT')
+
+    assert FullTextIndex.candidate_ids('AUTH_TIMEOUT failure', 'See the e-mail', 'Avaloq') == [incident.id]
+    result = DuplicateDetector.check_for_duplicates(
+        title='AUTH_TIMEOUT failure',
+        description='Login fails with AUTH_TIMEOUT',
+        platform='Avaloq'
+    )
+    assert [match.id for match, _ in result['similar_incidents']] == [incident.id]
+
+
+def test_search_route_renders_results(client, incident_factory):
+    """Test the search page lists matching incidents for a logged-in user."""
+    incident_factory('Custody report late', 'Custodian statement reconciliation delayed')
+    login(client)
+
+    response = client.get('/incidents/search?q=reconciliation')
+
+    assert response.status_code == 200
+    assert b'Custody report late' in response.data
+
+
+def test_search_route_requires_login(client):
+    """Test anonymous users are redirected to login."""
+    response = client.get('/incidents/search?q=anything')
+
+    assert response.status_code == 302
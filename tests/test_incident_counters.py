@@ -0,0 +1,82 @@
+"""
+Test the write-maintained incident counters.
+Validates that every ORM change keeps the counters equal to a full recount.
+"""
+
+from sqlalchemy import func
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_counter import IncidentCounter
+from app.utils.incident_counters import IncidentCounters
+
+
+def counters():
+    """Current non-zero counters as {key: count}."""
+    return {
+        (row.priority, row.status, row.platform, row.assigned_team): row.count
+        for row in IncidentCounter.query.all() if row.count
+    }
+
+
+def recount():
+    """Counters computed directly from the incidents table."""
+    key_columns = [getattr(Incident, field) for field in IncidentCounters.KEY_FIELDS]
+    return {
+        tuple(row[:-1]): row[-1]
+        for row in db.session.query(*key_columns, func.count(Incident.id)).group_by(*key_columns)
+    }
+
+
+def test_create_edit_and_delete_keep_counters_exact(incident_factory):
+    """Test inserts, key changes and deletes all update the counters."""
+    # status=None leaves the status to the column default, which the counters must resolve
+    incident = incident_factory('Counter test incident', status=None)
+    assert counters()[('Low', 'Open', 'Avaloq', 'LCM')] == 1
+    assert counters() == recount()
+
+    incident.priority = 'High'
+    incident.assigned_team = 'DevOps'
+    db.session.commit()
+    assert ('Low', 'Open', 'Avaloq', 'LCM') not in counters()
+    assert counters()[('High', 'Open', 'Avaloq', 'DevOps')] == 1
+    assert counters() == recount()
+
+    # Modified then deleted in the same flush: the stored key is decremented
+    incident.status = 'Closed'
+    db.session.delete(incident)
+    db.session.commit()
+    assert counters() == recount()
+
+
+def test_unrelated_changes_leave_counters_alone(incident_factory):
+    """Test edits to non-key fields do not write counters."""
+    incident = incident_factory('Counter test incident', status=None)
+    before = counters()
+
+    incident.title = 'Renamed'
+    db.session.commit()
+
+    assert counters() == before
+
+
+def test_rollback_discards_counter_changes(incident_factory):
+    """Test counters share the incident transaction."""
+    before = counters()
+    incident_factory('Rolled back', platform='Additiv', priority='High', status=None, commit=False)
+    db.session.flush()
+    assert counters() != before
+
+    db.session.rollback()
+    assert counters() == before
+
+
+def test_rebuild_repairs_bulk_changes(incident_factory):
+    """Test a bulk update outside the ORM is fixed by a rebuild."""
+    incident_factory('Counter test incident', status=None)
+    Incident.query.update({Incident.status: 'Resolved'})
+    db.session.commit()
+    assert counters() != recount()
+
+    IncidentCounters.rebuild()
+    assert counters() == recount()
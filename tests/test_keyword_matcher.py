@@ -0,0 +1,108 @@
+"""
+Test the shared triage keyword matcher.
+Validates that both matching strategies agree with plain substring checks
+and that triage only checks the keyword categories its rules need.
+"""
+
+import random
+
+from app.models.incident import Incident
+from app.utils.classifier import predict_priority, triage_incident
+from app.utils.keyword_matcher import AhoCorasickAutomaton, KeywordMatcher
+from app.utils.router import assign_team
+from app.utils.triage_rules import get_rules, match_triage_keywords
+
+
+def expected_categories(categories, text):
+    """Reference result: the original any(keyword in text) check per category."""
+    text = text.lower()
+    return frozenset(
+        category for category, keywords in categories.items()
+        if any(keyword in text for keyword in keywords)
+    )
+
+
+def test_matches_every_category_in_one_scan():
+    """Test a description hitting several categories reports all of them."""
+    matches = match_triage_keywords('Payment timeout after password reset, balance incorrect')
+    assert matches == {'transaction', 'high_severity', 'performance', 'auth', 'data'}
+
+
+def test_matching_is_case_insensitive_substring():
+    """Test keywords match inside longer words and regardless of case."""
+    assert match_triage_keywords('Users cannot SIGN IN') == {'auth'}
+    assert match_triage_keywords('Metadata download stalled') == {'data', 'high_severity'}
+    assert match_triage_keywords('Nothing relevant here') == frozenset()
+    assert match_triage_keywords('') == frozenset()
+
+
+def test_automaton_agrees_with_substring_checks():
+    """Test the Aho-Corasick automaton finds exactly the overlapping matches substring checks do."""
+    rng = random.Random(7)
+    categories = {'a': ['he', 'she', 'hers'], 'b': ['his', 'sign in'], 'c': ['ersh', 'e']}
+    patterns = {}
+    for category, words in categories.items():
+        for word in words:
+            patterns.setdefault(word, set()).add(category)
+    automaton = AhoCorasickAutomaton(patterns)
+
+    for _ in range(500):
+        text = ''.join(rng.choice('hersign ') for _ in range(rng.randint(0, 20)))
+        assert automaton.search(text) == expected_categories(categories, text)
+
+
+def test_large_keyword_sets_use_automaton():
+    """Test the matcher switches to the automaton for large sets with identical results."""
+    rng = random.Random(3)
+    categories = {
+        f'cat{i}': [''.join(rng.choice('abcde') for _ in range(rng.randint(2, 6))) for _ in range(40)]
+        for i in range(5)
+    }
+    matcher = KeywordMatcher(categories)
+    assert matcher._automaton is not None
+
+    triage_keywords = get_rules().keywords
+    small = KeywordMatcher(triage_keywords)
+    assert small._automaton is None
+
+    for _ in range(200):
+        text = ''.join(rng.choice('abcdeABCDE ') for _ in range(rng.randint(0, 60)))
+        assert matcher.match(text) == expected_categories(categories, text)
+        assert small.match(text) == expected_categories(triage_keywords, text)
+
+
+def test_shared_matches_give_same_triage():
+    """Test passing precomputed matches gives the same result as scanning in each function."""
+    description = 'Transfer screen crash for several clients'
+    matches = match_triage_keywords(description)
+
+    assert predict_priority('Avaloq', 'Other', 6, description, keyword_matches=matches) == \
+        predict_priority('Avaloq', 'Other', 6, description) == 'High'
+    assert assign_team('Avaloq', 'Other', description, keyword_matches=matches) == \
+        assign_team('Avaloq', 'Other', description) == 'DevOps'
+
+
+def test_triage_checks_only_the_categories_rules_need(client, app, monkeypatch):
+    """Test triage skips keyword checks when no rule on its path uses them, and checks one category at a time."""
+    checked = []
+
+    class RecordingWords(dict):
+        def __getitem__(self, category):
+            checked.append(category)
+            return super().__getitem__(category)
+
+    matcher = get_rules().matcher
+    monkeypatch.setattr(matcher, 'category_words', RecordingWords(matcher.category_words))
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+    response = client.post('/incidents/create', data={
+        'title': 'Many clients locked out', 'description': 'Password reset timeout for everyone',
+        'platform': 'Avaloq', 'journey': 'Login', 'clients_affected': 20, 'confirm_create': 'yes'
+    })
+    assert response.status_code == 302
+    assert checked == []
+    with app.app_context():
+        incident = Incident.query.filter_by(title='Many clients locked out').first()
+        assert (incident.priority, incident.assigned_team) == ('High', 'LCM')
+
+    assert triage_incident('Avaloq', 'Other', 6, 'Transfer screen crash for several clients') == ('High', 'DevOps')
+    assert checked == ['high_severity', 'auth', 'data', 'performance']
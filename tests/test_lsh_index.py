@@ -0,0 +1,62 @@
+"""
+Test the MinHash/LSH index used for near-duplicate candidate retrieval.
+Validates signature storage and bucket maintenance.
+"""
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_lsh_bucket import IncidentLshBucket
+from app.utils.lsh_index import LshIndex
+
+
+def bucket_count(incident_id):
+    """Return the number of LSH buckets stored for an incident."""
+    return IncidentLshBucket.query.filter_by(incident_id=incident_id).count()
+
+
+def test_signature_stored_on_create(app, incident_factory):
+    """Test a new incident gets a packed signature and one bucket per band."""
+    incident = incident_factory('Transfer stuck in pending', 'Outbound transfer stuck pending since morning')
+
+    assert incident.minhash_signature is not None
+    assert len(incident.minhash_signature) == app.config['MINHASH_NUM_PERM'] * 4
+    assert bucket_count(incident.id) == app.config['MINHASH_BANDS']
+
+
+def test_signature_recomputed_only_when_text_changes(incident_factory):
+    """Test status-only changes keep the signature but drop the buckets."""
+    incident = incident_factory('Transfer stuck in pending', 'Outbound transfer stuck pending since morning')
+    signature = incident.minhash_signature
+
+    incident.status = 'Resolved'
+    db.session.commit()
+
+    assert incident.minhash_signature == signature
+    assert bucket_count(incident.id) == 0
+
+
+def test_candidates_include_near_duplicate(incident_factory):
+    """Test a reworded incident collides with the original in at least one band."""
+    original = incident_factory('Transfer stuck in pending', 'Outbound transfer stuck pending since morning')
+    unrelated = incident_factory('Quarterly report missing', 'Quarterly valuation report not generated')
+
+    candidates = LshIndex.candidate_ids(
+        'Transfer stuck in pending',
+        'Outbound transfer stuck pending since this morning',
+        'Avaloq'
+    )
+
+    assert original.id in candidates
+    assert unrelated.id not in candidates
+
+
+def test_rebuild_restores_buckets(app, incident_factory):
+    """Test a rebuild recreates buckets for open incidents."""
+    incident = incident_factory('Transfer stuck in pending', 'Outbound transfer stuck pending since morning')
+    db.session.execute(IncidentLshBucket.__table__.delete())
+    db.session.commit()
+
+    signed = LshIndex.rebuild()
+
+    assert signed == Incident.query.count()
+    assert bucket_count(incident.id) == app.config['MINHASH_BANDS']
@@ -0,0 +1,170 @@
+"""
+Test the Prometheus metrics registry and /metrics endpoint.
+Validates the exposition format, thread shards, multi-process merging and
+the endpoint's access controls.
+"""
+
+import os
+import threading
+
+import pytest
+
+from app.utils.classifier import predict_priority
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.metrics import ARCHIVE_FILE, REGISTRY, MetricsRegistry
+from config import DevelopmentConfig, ProductionConfig
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+    REGISTRY.multiproc_dir = None
+
+
+def sample_lines(text, name):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_histogram_exposition_is_cumulative():
+    """Test buckets are cumulative and end with +Inf, _sum and _count."""
+    registry = MetricsRegistry()
+    latency = registry.histogram('job_seconds', 'Job latency.', ('job',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, 'import')
+
+    lines = sample_lines(registry.render(), 'job_seconds')
+    assert lines == [
+        'job_seconds_bucket{job="import",le="0.1"} 1',
+        'job_seconds_bucket{job="import",le="1.0"} 3',
+        'job_seconds_bucket{job="import",le="+Inf"} 4',
+        'job_seconds_sum{job="import"} 4.05',
+        'job_seconds_count{job="import"} 4',
+    ]
+
+
+def test_counter_sums_thread_shards():
+    """Test increments from many threads are all counted."""
+    registry = MetricsRegistry()
+    calls = registry.counter('calls_total', 'Calls.', ('kind',))
+
+    def work():
+        for _ in range(1000):
+            calls.inc('a')
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'calls_total{kind="a"} 8000' in registry.render()
+
+
+def test_label_values_are_escaped():
+    """Test quotes, backslashes and newlines in labels are escaped."""
+    registry = MetricsRegistry()
+    registry.counter('odd_total', 'Odd labels.', ('value',)).inc('say "hi"\\\n')
+    assert 'odd_total{value="say \\"hi\\"\\\\\\n"} 1' in registry.render()
+
+
+def test_workers_are_merged(tmp_path):
+    """Test counters from every worker file add up, and dead workers' gauges are dropped."""
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    requests = registry.counter('requests_total', 'Requests.')
+    registry.gauge('busy', 'Busy connections.', collect=lambda: {(): 2})
+    requests.inc(amount=3)
+
+    # A second, already exited worker
+    (tmp_path / 'metrics-999999999-0f0f0f0f.json').write_text('[["requests_total", [], 4], ["busy", [], 7]]')
+
+    text = registry.render()
+    assert 'requests_total 7' in text
+    assert 'busy 2' in text
+    assert os.path.exists(tmp_path / f'metrics-{registry._file_id}.json')
+
+
+def test_dead_worker_files_are_archived(tmp_path):
+    """Test exited workers' files are folded into the archive once, keeping their counts."""
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    registry.counter('requests_total', 'Requests.').inc(amount=3)
+    for name in ('metrics-999999998-aaaaaaaa.json', 'metrics-999999999-bbbbbbbb.json'):
+        (tmp_path / name).write_text('[["requests_total", [], 4]]')
+
+    assert 'requests_total 11' in registry.render()
+    assert sorted(path.name for path in tmp_path.glob('metrics-*.json')) == [f'metrics-{registry._file_id}.json']
+    assert (tmp_path / ARCHIVE_FILE).exists()
+    assert 'requests_total 11' in registry.render()
+
+
+def test_reused_pid_keeps_its_own_file(tmp_path):
+    """Test a worker whose PID was used before does not overwrite the earlier file."""
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    registry.counter('requests_total', 'Requests.').inc(amount=3)
+    (tmp_path / f'metrics-{os.getpid()}-0f0f0f0f.json').write_text('[["requests_total", [], 4]]')
+
+    assert 'requests_total 7' in registry.render()
+
+
+def test_forked_worker_starts_empty(tmp_path):
+    """Test the at-fork hook drops inherited samples and picks a new file name."""
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    registry.counter('requests_total', 'Requests.').inc(amount=3)
+    file_id = registry._file_id
+
+    registry.after_fork()
+
+    assert registry._file_id != file_id
+    assert registry.snapshot() == {}
+
+
+def test_instrumented_calls_are_recorded(app):
+    """Test triage and duplicate checks feed their histograms and counters."""
+    predict_priority('Avaloq', 'Reporting', 1, 'report is slow')
+    DuplicateDetector.check_for_duplicates(
+        'Test incident for unit testing',
+        'This is a test incident created for automated testing purposes.',
+        'Additiv'
+    )
+    DuplicateDetector.check_for_duplicates('Printer', 'Paper jam on floor two', 'Additiv')
+
+    text = REGISTRY.render()
+    assert 'triage_call_duration_seconds_count{function="predict_priority"} 1' in text
+    assert 'duplicate_checks_total{result="duplicate"} 1' in text
+    assert 'duplicate_checks_total{result="unique"} 1' in text
+    assert 'duplicate_check_duration_seconds_count 2' in text
+    assert sample_lines(text, 'duplicate_check_candidates_count')
+
+
+def test_metrics_endpoint(client):
+    """Test /metrics serves request counts without a login."""
+    client.get('/')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{endpoint="main.index",method="GET",status="200"} 1' in text
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'db_pool_connections{bind="default",state="checked_out"}' in text
+
+
+def test_metrics_endpoint_can_be_disabled(client, app):
+    """Test METRICS_ENABLED=False hides the endpoint."""
+    app.config['METRICS_ENABLED'] = False
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_endpoint_requires_token_when_set(client, app):
+    """Test METRICS_TOKEN makes scrapers send a matching bearer token."""
+    app.config['METRICS_TOKEN'] = 's3cret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer s3cret'}).status_code == 200
+
+
+def test_metrics_are_opt_in_outside_tests():
+    """Test development and production do not expose /metrics unless METRICS_ENABLED is set."""
+    for config_class in (DevelopmentConfig, ProductionConfig):
+        assert config_class.METRICS_ENABLED is (os.environ.get('METRICS_ENABLED') == 'True')
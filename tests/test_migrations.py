@@ -0,0 +1,141 @@
+"""
+Test the schema migration runner.
+Validates that older databases are upgraded and fresh ones are left unchanged.
+"""
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import db
+from app.utils.migrations import (
+    MIGRATIONS, migration, pending_migrations, schema_migrations, upgrade
+)
+
+
+def index_names(table):
+    return {index['name'] for index in inspect(db.engine).get_indexes(table)}
+
+
+def column_names(table):
+    return {column['name'] for column in inspect(db.engine).get_columns(table)}
+
+
+def test_fresh_database_is_fully_migrated(app):
+    """Test every migration is recorded once and re-running is a no-op."""
+    db.session.execute(schema_migrations.delete())
+    db.session.commit()
+
+    assert upgrade() == [item.name for item in MIGRATIONS]
+    assert pending_migrations() == []
+    assert upgrade() == []
+
+
+def test_upgrade_restores_older_schema(app):
+    """Test a database missing later columns and indexes is brought up to date."""
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_incidents_platform_status_created'))
+        connection.execute(text('DROP INDEX ix_audit_logs_changed_at_id'))
+        connection.execute(text('ALTER TABLE incidents DROP COLUMN title_tokens'))
+        connection.execute(schema_migrations.delete())
+    db.session.remove()
+
+    assert len(pending_migrations()) == len(MIGRATIONS)
+    upgrade()
+
+    assert 'title_tokens' in column_names('incidents')
+    assert 'ix_incidents_platform_status_created' in index_names('incidents')
+    assert 'ix_audit_logs_changed_at_id' in index_names('audit_logs')
+    assert pending_migrations() == []
+
+
+def forget_migrations(*tables):
+    """Empty derived tables and schema_migrations, as on a database that predates them."""
+    with db.engine.begin() as connection:
+        for table in tables:
+            connection.execute(text(f'DELETE FROM {table}'))
+        connection.execute(schema_migrations.delete())
+    db.session.remove()
+
+
+def test_upgrade_backfills_incident_counters(app):
+    """Test a database whose incidents predate the counters gets them filled."""
+    from app.models.incident import Incident
+    from app.utils.incident_counters import IncidentCounters
+
+    forget_migrations('incident_counters')
+    upgrade()
+
+    assert IncidentCounters.totals() == [(Incident.query.count(),)]
+
+
+def test_upgrade_backfills_token_index(app):
+    """Test open incidents that predate the token index are indexed."""
+    from app.utils.duplicate_detector import DuplicateDetector
+
+    forget_migrations('incident_tokens')
+    upgrade()
+
+    result = DuplicateDetector.check_for_duplicates(
+        'Test incident for unit testing',
+        'This is a test incident created for automated testing purposes.',
+        'Additiv', backend='index'
+    )
+    assert result['is_duplicate']
+
+
+def test_upgrade_backfills_lsh_buckets(app):
+    """Test open incidents that predate the LSH buckets are signed and bucketed."""
+    from app.utils.duplicate_detector import DuplicateDetector
+
+    forget_migrations('incident_lsh_buckets')
+    upgrade()
+
+    result = DuplicateDetector.check_for_duplicates(
+        'Test incident for unit testing',
+        'This is a test incident created for automated testing purposes.',
+        'Additiv', backend='minhash'
+    )
+    assert result['is_duplicate']
+
+
+def test_upgrade_backfills_fts_index(app):
+    """Test a database created before the FTS5 index gets it built and filled."""
+    from app.utils.duplicate_detector import DuplicateDetector
+    from app.utils.fts_index import FullTextIndex
+
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP TABLE incidents_fts'))
+    forget_migrations()
+    upgrade()
+
+    assert FullTextIndex.is_available()
+    result = DuplicateDetector.check_for_duplicates(
+        'Test incident for unit testing',
+        'This is a test incident created for automated testing purposes.',
+        'Additiv', backend='fts'
+    )
+    assert result['is_duplicate']
+
+
+def test_failed_backfill_is_rolled_back_with_its_version(app, monkeypatch):
+    """Test a backfill that fails midway leaves neither its rows nor its version behind."""
+    from app.models.incident_counter import IncidentCounter
+    from app.utils import incident_counters
+
+    def fail(connection, name=None):
+        raise RuntimeError('backfill failed')
+
+    forget_migrations('incident_counters')
+    monkeypatch.setattr(incident_counters, 'bump_generation', fail)
+    with pytest.raises(RuntimeError):
+        upgrade()
+    db.session.remove()
+
+    assert IncidentCounter.query.count() == 0
+    assert 4 in {item.version for item in pending_migrations()}
+
+
+def test_duplicate_version_is_rejected():
+    """Test two migrations cannot share a version number."""
+    with pytest.raises(ValueError):
+        migration(MIGRATIONS[0].version, 'duplicate')(lambda connection: None)
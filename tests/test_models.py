@@ -60,4 +60,35 @@ def test_incident_timestamps(app):
     """Test incident has created_at timestamp."""
     incident = Incident.query.filter_by(title='Test incident for unit testing').first()
     
-    assert incident.created_at is not None
\ No newline at end of file
+    assert incident.created_at is not None
+
+def test_incident_tokens_cached_on_create(app):
+    """Test preprocessed tokens are stored when an incident is created."""
+    incident = Incident.query.filter_by(title='Test incident for unit testing').first()
+    
+    assert incident.title_tokens == 'test incident unit testing'
+    assert incident.description_token_list == ['test', 'incident', 'created', 'automated', 'testing', 'purposes']
+
+
+def test_incident_tokens_recomputed_when_text_changes(app):
+    """Test editing the description refreshes its cached tokens only."""
+    incident = Incident.query.filter_by(title='Test incident for unit testing').first()
+    
+    incident.title = 'Test incident for unit testing'  # Unchanged text
+    incident.description = 'Statement download broken'
+    db.session.commit()
+    
+    assert incident.title_tokens == 'test incident unit testing'
+    assert incident.description_tokens == 'statement download broken'
+
+
+def test_incident_token_list_falls_back_when_not_backfilled(app):
+    """Test rows without cached tokens are tokenised on the fly."""
+    incident = Incident.query.filter_by(title='Test incident for unit testing').first()
+    db.session.execute(
+        Incident.__table__.update().values(title_tokens=None).where(Incident.__table__.c.id == incident.id)
+    )
+    db.session.commit()
+    
+    assert incident.title_tokens is None
+    assert incident.title_token_list == ['test', 'incident', 'unit', 'testing']
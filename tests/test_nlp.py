@@ -3,8 +3,10 @@ Test NLP duplicate detection system.
 Validates text preprocessing, similarity calculation, and duplicate detection.
 """
 
+import random
+
 import pytest
-from app.utils.text_processor import TextProcessor
+from app.utils.text_processor import TextProcessor, MinHasher
 from app.utils.duplicate_detector import DuplicateDetector
 
 
@@ -108,6 +110,82 @@ class TestTextProcessor:
         
         assert is_dup is False
 
+    
+    def test_weighted_similarity_matches_calculate_similarity(self):
+        """Test the bounded scorer returns exactly the unbounded weighted score."""
+        pairs = [
+            ("Login timeout on Additiv", "Additiv login timeout"),
+            ("Multiple clients cannot login", "Clients experiencing login failure"),
+            ("Balance incorrect", ""),
+        ]
+        for (title1, title2), (desc1, desc2) in zip(pairs, reversed(pairs)):
+            expected = (0.25 * TextProcessor.calculate_similarity(title1, title2) +
+                        0.75 * TextProcessor.calculate_similarity(desc1, desc2))
+            
+            score = TextProcessor.weighted_similarity([
+                (0.25, title1, title2, TextProcessor.preprocess_text(title1), TextProcessor.preprocess_text(title2)),
+                (0.75, desc1, desc2, TextProcessor.preprocess_text(desc1), TextProcessor.preprocess_text(desc2)),
+            ])
+            
+            assert score == expected
+    
+    def test_weighted_similarity_prunes_only_below_min_score(self):
+        """Test early exit never discards a pair that reaches min_score."""
+        words = ['login', 'timeout', 'additiv', 'client', 'balance', 'sync', 'error', 'transfer']
+        rng = random.Random(7)
+        for _ in range(200):
+            text1 = ' '.join(rng.choices(words, k=rng.randint(1, 8)))
+            text2 = ' '.join(rng.choices(words, k=rng.randint(1, 8)))
+            min_score = rng.random()
+            
+            exact = TextProcessor.calculate_similarity(text1, text2)
+            bounded = TextProcessor.weighted_similarity([
+                (1.0, text1, text2, TextProcessor.preprocess_text(text1), TextProcessor.preprocess_text(text2)),
+            ], min_score=min_score)
+            
+            if exact >= min_score:
+                assert bounded == exact
+            else:
+                assert bounded is None or bounded == exact
+
+
+class TestMinHasher:
+    """Test MinHash signatures and LSH banding."""
+    
+    def test_signature_length_and_roundtrip(self):
+        """Test signatures have num_perm entries and survive byte packing."""
+        hasher = MinHasher(num_perm=32, bands=8)
+        signature = hasher.signature(['login', 'timeout', 'additiv'])
+        
+        assert len(signature) == 32
+        assert MinHasher.from_bytes(MinHasher.to_bytes(signature)) == signature
+    
+    def test_identical_sets_have_identical_signatures(self):
+        """Test identical token sets estimate similarity 1.0 and share every band."""
+        hasher = MinHasher()
+        tokens = TextProcessor.preprocess_text("Client cannot login to Additiv platform")
+        
+        sig1 = hasher.signature(tokens)
+        sig2 = hasher.signature(list(reversed(tokens)))
+        
+        assert MinHasher.estimate_similarity(sig1, sig2) == 1.0
+        assert hasher.band_keys(sig1) == hasher.band_keys(sig2)
+    
+    def test_estimate_tracks_jaccard(self):
+        """Test the estimate is close to the true Jaccard similarity."""
+        hasher = MinHasher(num_perm=256, bands=64)
+        tokens1 = {f'token{i}' for i in range(100)}
+        tokens2 = {f'token{i}' for i in range(50, 150)}  # Jaccard = 50/150
+        
+        estimate = MinHasher.estimate_similarity(hasher.signature(tokens1), hasher.signature(tokens2))
+        
+        assert abs(estimate - (50 / 150)) < 0.1
+    
+    def test_bands_must_divide_permutations(self):
+        """Test invalid band configuration is rejected."""
+        with pytest.raises(ValueError):
+            MinHasher(num_perm=64, bands=10)
+
 
 class TestDuplicateDetector:
     """Test duplicate incident detection functionality."""
@@ -198,4 +276,41 @@ class TestDuplicateDetector:
         )
         
         # Should return at most 3 results
-        assert len(result) <= 3
\ No newline at end of file
+        assert len(result) <= 3
+    
+    def test_minhash_backend_finds_near_duplicate(self, app, sample_incident):
+        """Test the MinHash/LSH backend finds a near-identical incident."""
+        result = DuplicateDetector.check_for_duplicates(
+            title="Test incident for unit testing",
+            description="This is a test incident created for automated testing purposes.",
+            platform="Additiv",
+            threshold=0.75,
+            backend='minhash'
+        )
+        
+        assert result['is_duplicate'] is True
+    
+    def test_unknown_backend_rejected(self, app):
+        """Test an unknown backend name raises a clear error."""
+        with pytest.raises(ValueError):
+            DuplicateDetector.check_for_duplicates(
+                title="Test incident",
+                description="Test description",
+                platform="Additiv",
+                backend='does-not-exist'
+            )
+    
+    def test_score_candidates_keeps_top_k(self, app, sample_incident):
+        """Test heap-based top-k keeps the best matches in descending order."""
+        candidates = [sample_incident] * 4
+        
+        result = DuplicateDetector.score_candidates(
+            title="Test incident for unit testing",
+            description="This is a test incident created for automated testing purposes.",
+            candidates=candidates,
+            threshold=0.5,
+            limit=2
+        )
+        
+        assert len(result) == 2
+        assert result[0][1] >= result[1][1]
@@ -0,0 +1,128 @@
+"""
+Test keyset pagination and server-side filtering of the incident list.
+Validates page walking in both directions, tie-breaking, filters and cursors.
+"""
+
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.incident import Incident
+from app.utils.pagination import (
+    decode_cursor, encode_cursor, incident_filters, paginate_incidents
+)
+
+
+BASE_TIME = datetime(2025, 3, 1, 9, 0, 0)
+
+
+def newest_first(query):
+    return query.order_by(Incident.created_at.desc(), Incident.id.desc()).all()
+
+
+def walk_forward(query, per_page):
+    """Follow next cursors from the first page, returning every page."""
+    pages = [paginate_incidents(query, per_page)]
+    while pages[-1].has_next:
+        pages.append(paginate_incidents(query, per_page, after=pages[-1].next_cursor))
+    return pages
+
+
+def test_forward_walk_covers_every_incident_once(incident_factory):
+    """Test walking older pages visits the full ordering without gaps or repeats."""
+    for i in range(11):
+        incident_factory(f'Paged incident {i}', created_at=BASE_TIME + timedelta(hours=i))
+
+    pages = walk_forward(Incident.query, per_page=4)
+
+    assert [len(page.items) for page in pages] == [4, 4, 4]
+    assert [i.id for page in pages for i in page.items] == [i.id for i in newest_first(Incident.query)]
+    assert not pages[0].has_prev
+    assert all(page.has_prev for page in pages[1:])
+    assert not pages[-1].has_next
+
+
+def test_backward_walk_returns_same_pages(incident_factory):
+    """Test prev cursors lead back to the same pages in newest-first order."""
+    for i in range(9):
+        incident_factory(f'Paged incident {i}', created_at=BASE_TIME + timedelta(hours=i))
+    pages = walk_forward(Incident.query, per_page=3)
+
+    page = pages[-1]
+    for expected in reversed(pages[:-1]):
+        page = paginate_incidents(Incident.query, 3, before=page.prev_cursor)
+        assert [i.id for i in page.items] == [i.id for i in expected.items]
+    assert not page.has_prev
+    assert page.has_next
+
+
+def test_identical_timestamps_are_split_by_id(incident_factory):
+    """Test rows sharing created_at are paged by id without loss."""
+    for incident in Incident.query.all():
+        db.session.delete(incident)
+    db.session.commit()
+    for i in range(7):
+        incident_factory(f'Paged incident {i}', created_at=BASE_TIME)
+
+    pages = walk_forward(Incident.query, per_page=2)
+    ids = [i.id for page in pages for i in page.items]
+
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == len(set(ids)) == 7
+
+
+def test_invalid_cursor_falls_back_to_first_page(incident_factory):
+    """Test a garbled cursor is ignored rather than raising."""
+    for i in range(3):
+        incident_factory(f'Paged incident {i}', created_at=BASE_TIME + timedelta(hours=i))
+
+    assert decode_cursor('not-a-cursor!') is None
+    page = paginate_incidents(Incident.query, 2, after='not-a-cursor!')
+    assert [i.id for i in page.items] == [i.id for i in newest_first(Incident.query)[:2]]
+
+
+def test_cursor_round_trip(app):
+    """Test a cursor decodes to the incident's sort key."""
+    incident = Incident.query.first()
+    assert decode_cursor(encode_cursor(incident.created_at, incident.id)) == (incident.created_at, incident.id)
+
+
+def test_filters_and_date_range(incident_factory):
+    """Test equality filters and the inclusive date range."""
+    for i in range(30):
+        incident_factory(f'Paged incident {i}', created_at=BASE_TIME + timedelta(hours=i), priority='High',
+                         assigned_team='DevOps', platform='Additiv')
+
+    filters, criteria = incident_filters({
+        'priority': 'High', 'team': 'DevOps', 'platform': '',
+        'date_from': '2025-03-01', 'date_to': '2025-03-01', 'status': ''
+    })
+    assert filters == {'priority': 'High', 'team': 'DevOps',
+                       'date_from': '2025-03-01', 'date_to': '2025-03-01'}
+
+    page = paginate_incidents(Incident.query.filter(*criteria), per_page=50)
+    # Created hourly from 09:00, so 15 fall on 1 March
+    assert len(page.items) == 15
+    assert all(i.priority == 'High' and i.assigned_team == 'DevOps' for i in page.items)
+    assert all(i.created_at.date() == BASE_TIME.date() for i in page.items)
+
+
+def test_malformed_date_filter_is_ignored(app):
+    """Test an unparseable date does not filter or error."""
+    filters, criteria = incident_filters({'date_from': '01/03/2025'})
+    assert filters == {}
+    assert criteria == []
+
+
+def test_list_route_renders_pages(client, app, incident_factory):
+    """Test the list view shows one page and links to the next."""
+    with app.app_context():
+        for i in range(app.config['INCIDENTS_PER_PAGE'] + 5):
+            incident_factory(f'Paged incident {i}', created_at=BASE_TIME + timedelta(hours=i), status='In Progress')
+
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+    response = client.get('/incidents/list?status=In+Progress')
+
+    assert response.status_code == 200
+    assert b'Older' in response.data
+    assert b'Paged incident 0' not in response.data  # Oldest is not on the first page
+    assert b'status: In Progress' in response.data
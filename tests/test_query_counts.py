@@ -0,0 +1,94 @@
+"""
+Test the SQL statement budget of the main views.
+Uses the X-Query-Count header added in testing mode, so an N+1 regression
+(one lazy load per row) fails here rather than in production.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.request_metrics import QUERY_COUNT_HEADER
+
+
+def add_admins(count):
+    """Add admin users and return their ids."""
+    start = User.query.count()
+    admins = [
+        User(username=f'auditor{i}', email=f'auditor{i}@example.com',
+             password_hash='x', is_admin=True)
+        for i in range(start, start + count)
+    ]
+    db.session.add_all(admins)
+    db.session.commit()
+    return [admin.id for admin in admins]
+
+
+def add_audit_logs(count):
+    """Add audit log entries, each by a different admin."""
+    incident = Incident.query.first()
+    start = datetime(2025, 3, 1)
+    for i, admin_id in enumerate(add_admins(count)):
+        db.session.add(AuditLog(
+            incident_id=incident.id, field_changed='priority',
+            old_priority='Low', new_priority='High', reason_code='edge_case',
+            changed_by_user_id=admin_id, changed_at=start + timedelta(minutes=i)
+        ))
+    db.session.commit()
+
+
+def query_count(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return int(response.headers[QUERY_COUNT_HEADER])
+
+
+@pytest.fixture
+def admin_client(client):
+    client.post('/auth/login', data={'username': 'admin', 'password': 'AdminPass123!'})
+    return client
+
+
+def test_audit_log_query_count_is_constant(admin_client, app):
+    """Test the audit log does not issue a query per row."""
+    with app.app_context():
+        add_audit_logs(1)
+    few = query_count(admin_client, '/incidents/audit-log')
+
+    with app.app_context():
+        add_audit_logs(20)
+    many = query_count(admin_client, '/incidents/audit-log')
+
+    assert few == many <= 2  # Logged-in user + one joined page query
+
+
+def test_audit_log_is_paginated(admin_client, app):
+    """Test the audit log shows one page and links to older entries."""
+    app.config['AUDIT_LOG_PER_PAGE'] = 5
+    with app.app_context():
+        add_audit_logs(12)
+
+    response = admin_client.get('/incidents/audit-log')
+    assert response.data.count(b'auditor') == 5
+    assert b'auditor15' in response.data  # Newest first (numbering continues from the 4 fixture users)
+    assert b'Older' in response.data
+
+
+def test_incident_detail_joins_creator(admin_client, app):
+    """Test the detail view loads the incident and creator in one query."""
+    with app.app_context():
+        incident_id = Incident.query.first().id
+
+    assert query_count(admin_client, f'/incidents/{incident_id}') <= 2
+
+
+def test_incident_list_query_budget(admin_client):
+    """Test the list view stays within its fixed budget."""
+    # Logged-in user, page query, data generation, counter totals (cache miss)
+    assert query_count(admin_client, '/incidents/list') <= 4
+    # The badge counts are then served from the response cache
+    assert query_count(admin_client, '/incidents/list') <= 3
@@ -0,0 +1,118 @@
+"""
+Test the read/write split with a SQLite read replica.
+Validates that read views use the replica, writes use the primary and a
+user who just wrote keeps reading from the primary.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models.incident import Incident
+from app.utils.replicas import read_replica, replica_engines, sync_sqlite_replica
+from app.utils.request_metrics import RequestMetrics
+from config import TestingConfig
+
+
+@pytest.fixture
+def replica_client(monkeypatch, tmp_path, request):
+    """Logged-in test client for an app with one SQLite replica, synced from the primary."""
+    replica_url = f'sqlite:///{tmp_path / "replica.db"}'
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_BINDS', {'replica_0': replica_url})
+    client = request.getfixturevalue('client')
+    app = client.application
+
+    with app.app_context():
+        primary_url = db.engine.url
+
+    def sync():
+        sync_sqlite_replica(primary_url, replica_url)
+
+    client.sync = sync
+    sync()
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+    return client
+
+
+def test_read_views_use_the_replica(replica_client, app, incident_factory):
+    """Test the list only shows a new incident once the replica is synced."""
+    with app.app_context():
+        incident_factory('Only on the primary')
+
+    assert b'Only on the primary' not in replica_client.get('/incidents/list').data
+    replica_client.sync()
+    assert b'Only on the primary' in replica_client.get('/incidents/list').data
+
+
+def test_writer_reads_own_writes(replica_client, app):
+    """Test a user who just created an incident sees it before the replica syncs."""
+    response = replica_client.post('/incidents/create', data={
+        'title': 'Created through the primary', 'description': 'Statement run failed overnight',
+        'platform': 'Avaloq', 'journey': 'Reporting', 'clients_affected': 1,
+        'confirm_create': 'yes'
+    })
+    assert response.status_code == 302
+
+    with app.app_context():
+        replica = replica_engines()[0]
+        with replica.connect() as connection:
+            assert connection.execute(
+                text("SELECT count(*) FROM incidents WHERE title = 'Created through the primary'")
+            ).scalar() == 0
+    assert b'Created through the primary' in replica_client.get('/incidents/list').data
+
+
+def test_stickiness_expires(replica_client, app):
+    """Test reads return to the replica once the sticky window has passed."""
+    app.config['READ_REPLICA_STICKY_SECONDS'] = 0
+    replica_client.post('/incidents/create', data={
+        'title': 'Sticky window test', 'description': 'Report download slow',
+        'platform': 'Avaloq', 'journey': 'Reporting', 'clients_affected': 1,
+        'confirm_create': 'yes'
+    })
+    assert b'Sticky window test' not in replica_client.get('/incidents/list').data
+
+
+def test_replica_connections_are_read_only(replica_client, app):
+    """Test a write routed to a replica connection by mistake fails."""
+    with app.app_context():
+        with replica_engines()[0].connect() as connection:
+            with pytest.raises(Exception, match='readonly|read-only|query_only'):
+                connection.execute(text("DELETE FROM incidents"))
+
+
+def test_flushes_in_read_views_use_the_primary(replica_client, app):
+    """Test ORM writes made while a replica is selected still go to the primary."""
+    @read_replica
+    def touch():
+        incident = Incident.query.first()
+        incident.status = 'In Progress'
+        db.session.commit()
+        return incident.id
+
+    with app.test_request_context():
+        incident_id = touch()
+    with app.app_context():
+        assert db.session.get(Incident, incident_id).status == 'In Progress'
+
+
+def test_replica_queries_are_measured(replica_client, monkeypatch):
+    """Test statements run on a replica are charged to the request and the pool gauge covers it."""
+    binds = []
+    original = RequestMetrics.record_query
+
+    def recording(self, statement, elapsed, bind='default'):
+        binds.append(bind)
+        return original(self, statement, elapsed, bind)
+
+    monkeypatch.setattr(RequestMetrics, 'record_query', recording)
+    response = replica_client.get('/incidents/list')
+
+    assert 'replica_0' in binds
+    assert int(response.headers['X-Query-Count']) == len(binds)
+    assert 'db_pool_connections{bind="replica_0",state="idle"}' in replica_client.get('/metrics').get_data(as_text=True)
+
+
+def test_without_replicas_everything_uses_the_primary(app):
+    """Test the decorator is a no-op when no replica is configured."""
+    assert replica_engines() == []
@@ -0,0 +1,80 @@
+"""
+Test the per-request instrumentation.
+Validates the structured log line, Server-Timing header and named spans.
+"""
+
+import json
+import logging
+
+import pytest
+from flask import g
+
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.request_metrics import RequestMetrics, request_span
+from config import TestingConfig
+
+
+@pytest.fixture
+def metrics_client(monkeypatch, request):
+    """Test client for an app built with REQUEST_METRICS in debug mode."""
+    monkeypatch.setattr(TestingConfig, 'REQUEST_METRICS', True)
+    monkeypatch.setattr(TestingConfig, 'DEBUG', True)
+    client = request.getfixturevalue('client')
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+    return client
+
+
+def metrics_records(caplog):
+    return [
+        json.loads(record.getMessage().split(' ', 1)[1])
+        for record in caplog.records if record.getMessage().startswith('request_metrics ')
+    ]
+
+
+def test_request_logs_structured_metrics(metrics_client, caplog):
+    """Test each request logs SQL, template and total timings as JSON."""
+    with caplog.at_level(logging.INFO):
+        response = metrics_client.get('/incidents/list')
+
+    assert response.status_code == 200
+    record = metrics_records(caplog)[-1]
+    assert record['endpoint'] == 'incidents.list_incidents'
+    assert record['status'] == 200
+    assert record['db_queries'] >= 2
+    assert record['slowest_sql'].startswith('SELECT')
+    assert 0 < record['template_ms'] <= record['total_ms']
+    assert record['db_ms'] <= record['total_ms']
+
+
+def test_debug_mode_adds_server_timing(metrics_client):
+    """Test the Server-Timing header breaks the request down."""
+    header = metrics_client.get('/incidents/list').headers['Server-Timing']
+
+    assert header.startswith('db;dur=')
+    assert 'template;dur=' in header
+    assert header.split(', ')[-1].startswith('total;dur=')
+
+
+def test_server_timing_is_opt_in(client):
+    """Test the default testing app adds no Server-Timing header."""
+    client.post('/auth/login', data={'username': 'testuser', 'password': 'TestPass123!'})
+    assert 'Server-Timing' not in client.get('/incidents/list').headers
+
+
+def test_duplicate_scoring_is_a_span(app):
+    """Test duplicate checks are timed as the 'duplicates' span."""
+    with app.test_request_context('/incidents/create'):
+        g.request_metrics = metrics = RequestMetrics()
+        DuplicateDetector.check_for_duplicates(
+            'Test incident for unit testing', 'Automated testing incident', 'Additiv'
+        )
+
+    assert metrics.spans['duplicates'] > 0
+    assert metrics.queries >= 1
+    assert metrics.db_time <= metrics.spans['duplicates']
+
+
+def test_span_outside_request_is_a_no_op():
+    """Test request_span can wrap code run outside a request."""
+    with request_span('duplicates'):
+        pass
@@ -0,0 +1,183 @@
+"""
+Test the versioned response cache.
+Validates the LRU and file backends, generation bumps on writes, the
+separate session store and that dashboards are served from the cache until
+the data changes.
+"""
+
+import pytest
+
+from app import db
+from app.models.audit_log import AuditLog
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.incident_counters import IncidentCounters
+from app.utils.request_metrics import QUERY_COUNT_HEADER
+from app.utils.response_cache import (
+    MISSING, FileCache, LruCache, current_generation, duplicate_generation_name
+)
+from config import TestingConfig
+
+
+def get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get_data(as_text=True), int(response.headers[QUERY_COUNT_HEADER])
+
+
+@pytest.fixture
+def admin_client(client):
+    client.post('/auth/login', data={'username': 'admin', 'password': 'AdminPass123!'})
+    return client
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test the oldest untouched entry is evicted first."""
+    cache = LruCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is MISSING
+    assert cache.get('c') == 3
+
+
+def test_file_cache_is_shared_and_pruned(tmp_path):
+    """Test two instances on one directory share entries, and old files are pruned."""
+    writer = FileCache(str(tmp_path), max_entries=3)
+    reader = FileCache(str(tmp_path), max_entries=3)
+    writer.set('stats:1', {'total': 5})
+    assert reader.get('stats:1') == {'total': 5}
+
+    for generation in range(2, 6):
+        writer.set(f'stats:{generation}', generation)
+    assert len(list(tmp_path.glob('*.pickle'))) == 3
+    assert reader.get('stats:5') == 5
+
+
+def test_file_cache_treats_corrupt_entries_as_missing(tmp_path):
+    """Test an unreadable file is a miss rather than an error."""
+    cache = FileCache(str(tmp_path))
+    cache.set('key', 1)
+    next(tmp_path.glob('*.pickle')).write_bytes(b'not a pickle')
+    assert cache.get('key') is MISSING
+
+
+def test_generation_is_bumped_by_writes(incident_factory):
+    """Test incident and audit log writes bump the generation, unrelated user edits do not."""
+    before = current_generation()
+    incident = incident_factory('Cached dashboard incident')
+    assert current_generation() > (before or 0)
+
+    generation = current_generation()
+    incident.status = 'Resolved'
+    db.session.commit()
+    assert current_generation() == generation + 1
+
+    admin = User.query.filter_by(username='admin').first()
+    db.session.add(AuditLog(incident_id=incident.id, field_changed='priority', old_priority='High',
+                            new_priority='Low', reason_code='other', changed_by_user_id=admin.id))
+    db.session.commit()
+    assert current_generation() == generation + 2
+
+    admin.email = 'admin2@example.com'
+    db.session.commit()
+    assert current_generation() == generation + 2
+
+    IncidentCounters.rebuild()
+    assert current_generation() == generation + 3
+
+
+def test_duplicate_generation_follows_platform_text(incident_factory):
+    """Test only text, status and platform changes bump the affected platforms' duplicate generation."""
+    def generations():
+        return [current_generation(duplicate_generation_name(platform)) for platform in ('Avaloq', 'Additiv')]
+
+    incident = incident_factory('Cached dashboard incident', priority='High')
+    avaloq, additiv = generations()
+
+    incident.priority = 'Low'
+    db.session.add(AuditLog(incident_id=incident.id, field_changed='priority', old_priority='High',
+                            new_priority='Low', reason_code='other', changed_by_user_id=incident.created_by))
+    db.session.commit()
+    assert generations() == [avaloq, additiv]
+
+    incident.description = 'Response cache test, edited'
+    db.session.commit()
+    assert generations() == [avaloq + 1, additiv]
+
+    incident.platform = 'Additiv'
+    db.session.commit()
+    assert generations() == [avaloq + 2, additiv + 1]
+
+
+def test_session_state_does_not_evict_dashboard_entries(app):
+    """Test per-session entries go to their own bounded store."""
+    cache, sessions = app.extensions['response_cache'], app.extensions['session_cache']
+    assert sessions is not cache
+    cache.set('dashboard:1', 'counts')
+    for number in range(app.config['RESPONSE_CACHE_MAX_ENTRIES'] + 1):
+        sessions.set(f'duplicate_check:{number}', {})
+    assert cache.get('dashboard:1') == 'counts'
+
+
+def test_dashboard_is_cached_until_a_write(admin_client, app, incident_factory):
+    """Test repeat views skip the counter query, and a new incident shows immediately."""
+    with app.app_context():
+        total = Incident.query.count()
+
+    _, cold = get(admin_client, '/dashboard')
+    page, warm = get(admin_client, '/dashboard')
+    assert warm < cold
+    assert f'>{total}</h2>' in page
+
+    with app.app_context():
+        incident_factory('Cached dashboard incident')
+    page, _ = get(admin_client, '/dashboard')
+    assert f'>{total + 1}</h2>' in page
+
+
+def test_admin_dashboard_is_cached(admin_client, app, incident_factory):
+    """Test the admin dashboard needs only the generation query once warm."""
+    with app.app_context():
+        incident_factory('Newest cached incident')
+
+    page, cold = get(admin_client, '/admin')
+    assert 'Newest cached incident' in page
+    page, warm = get(admin_client, '/admin')
+    assert 'Newest cached incident' in page
+    assert warm == cold - 3
+
+
+def test_file_backend_serves_every_app(monkeypatch, tmp_path, request):
+    """Test the file backend shares entries between app instances (workers)."""
+    monkeypatch.setattr(TestingConfig, 'RESPONSE_CACHE_BACKEND', 'file')
+    monkeypatch.setattr(TestingConfig, 'RESPONSE_CACHE_DIR', str(tmp_path))
+    client = request.getfixturevalue('client')
+    incident_factory = request.getfixturevalue('incident_factory')
+    client.post('/auth/login', data={'username': 'admin', 'password': 'AdminPass123!'})
+    with client.application.app_context():
+        incident_factory('Cached dashboard incident')
+
+    get(client, '/dashboard')
+    assert list(tmp_path.glob('*.pickle'))
+    assert client.application.extensions['session_cache'].directory == str(tmp_path / 'sessions')
+
+    from app import create_app
+    other = create_app('testing').test_client()
+    other.post('/auth/login', data={'username': 'admin', 'password': 'AdminPass123!'})
+    _, warm = get(other, '/dashboard')
+    assert warm == 2
+
+
+def test_cache_can_be_disabled(monkeypatch, request):
+    """Test RESPONSE_CACHE_BACKEND='none' computes every time without a generation query."""
+    monkeypatch.setattr(TestingConfig, 'RESPONSE_CACHE_BACKEND', 'none')
+    client = request.getfixturevalue('client')
+    client.post('/auth/login', data={'username': 'admin', 'password': 'AdminPass123!'})
+
+    assert client.application.extensions['response_cache'] is None
+    assert client.application.extensions['session_cache'] is None
+    assert get(client, '/dashboard')[1] == get(client, '/dashboard')[1]
@@ -0,0 +1,62 @@
+"""
+Test application startup and the init-db command.
+Validates that the app factory never connects to the database and that
+schema creation, migrations and seeding run from the explicit command.
+"""
+
+from sqlalchemy import event, inspect
+from sqlalchemy.pool import Pool
+
+from app import create_app, db
+from app.models.user import User
+from app.utils.migrations import MIGRATIONS, pending_migrations
+from config import config
+
+
+def count_connections(func):
+    connections = []
+    listener = lambda *args: connections.append(1)  # noqa: E731
+    event.listen(Pool, 'connect', listener)
+    try:
+        func()
+    finally:
+        event.remove(Pool, 'connect', listener)
+    return len(connections)
+
+
+def test_create_app_does_not_connect():
+    """Test the factory opens no database connection by default."""
+    assert count_connections(lambda: create_app('testing')) == 0
+
+
+def test_init_db_on_startup_option(monkeypatch):
+    """Test INIT_DB_ON_STARTUP restores schema setup inside the factory."""
+    monkeypatch.setattr(config['testing'], 'INIT_DB_ON_STARTUP', True)
+    assert count_connections(lambda: create_app('testing')) > 0
+
+
+def test_init_db_command_creates_and_seeds(app, runner):
+    """Test `flask init-db` creates the tables, migrates and seeds an empty database."""
+    db.session.remove()
+    db.drop_all(bind_key=None)
+
+    result = runner.invoke(args=['init-db'])
+
+    assert result.exit_code == 0
+    assert f'{len(MIGRATIONS)} migration(s) applied' in result.output
+    assert 'incidents' in inspect(db.engine).get_table_names()
+    assert pending_migrations() == []
+    assert {user.username for user in User.query} == {'admin', 'helpline_user'}
+
+
+def test_init_db_command_without_seed(app, runner):
+    """Test --no-seed leaves the new tables empty, and re-running is harmless."""
+    db.session.remove()
+    db.drop_all(bind_key=None)
+
+    assert runner.invoke(args=['init-db', '--no-seed']).exit_code == 0
+    assert User.query.count() == 0
+
+    result = runner.invoke(args=['init-db', '--no-seed'])
+    assert result.exit_code == 0
+    assert '0 migration(s) applied' in result.output
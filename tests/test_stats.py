@@ -0,0 +1,64 @@
+"""
+Test the aggregated dashboard statistics.
+Validates counts against per-value COUNT queries and the single-query guarantee.
+"""
+
+from sqlalchemy import event
+
+from app import db
+from app.models.incident import Incident
+from app.models.user import User
+from app.utils.stats import get_incident_stats, get_user_stats
+
+
+def count_statements(func):
+    """Run func and return (result, number of SQL statements it executed)."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return result, len(statements)
+
+
+def test_incident_stats_match_individual_counts(incident_factory):
+    """Test every grouped count equals the old filter_by(...).count() value."""
+    for priority, status in [('High', 'Open'), ('High', 'Closed'), ('Low', 'Resolved'),
+                             ('Low', 'In Progress'), ('Medium', 'Open')]:
+        incident_factory(f'{priority} {status} incident', priority=priority, status=status, commit=False)
+    db.session.commit()
+
+    stats, statements = count_statements(get_incident_stats)
+
+    assert statements == 1
+    assert stats.total == Incident.query.count()
+    for priority, value in [('High', stats.high), ('Medium', stats.medium), ('Low', stats.low)]:
+        assert value == Incident.query.filter_by(priority=priority).count()
+    for status, value in [('Open', stats.open), ('In Progress', stats.in_progress),
+                          ('Resolved', stats.resolved), ('Closed', stats.closed)]:
+        assert value == Incident.query.filter_by(status=status).count()
+
+
+def test_user_stats_single_query(app):
+    """Test user counts by role come from one query."""
+    stats, statements = count_statements(get_user_stats)
+
+    assert statements == 1
+    assert stats.total == User.query.count()
+    assert stats.admins == User.query.filter_by(is_admin=True).count()
+    assert stats.regular == User.query.filter_by(is_admin=False).count()
+
+
+def test_empty_tables_give_zero_counts(app):
+    """Test missing groups default to zero."""
+    for incident in Incident.query.all():
+        db.session.delete(incident)
+    db.session.commit()
+
+    stats = get_incident_stats()
+    assert (stats.total, stats.high, stats.open, stats.closed) == (0, 0, 0, 0)
@@ -0,0 +1,92 @@
+"""
+Test the vectorised TF-IDF similarity engine.
+Validates sparse scoring, batch queries and the DuplicateDetector backend.
+"""
+
+import pytest
+from app.utils.tfidf import TfidfIndex
+from app.utils.duplicate_detector import DuplicateDetector
+
+DOCUMENTS = [
+    (1, 'Login timeout on Additiv', 'Clients cannot login, authentication request times out'),
+    (2, 'Balance mismatch', 'Portfolio balance differs between Additiv and Avaloq'),
+    (3, 'Transfer rejected', 'Outbound transfer rejected by custodian with no reason'),
+]
+
+
+def test_identical_document_scores_one():
+    """Test a query identical to an indexed incident scores 1.0."""
+    index = TfidfIndex(DOCUMENTS)
+
+    matches = index.top_matches(DOCUMENTS[1][1], DOCUMENTS[1][2], threshold=0.5)
+
+    assert matches[0][0] == 2
+    assert matches[0][1] == pytest.approx(1.0)
+
+
+def test_unrelated_query_has_no_matches():
+    """Test a query sharing no terms scores nothing."""
+    index = TfidfIndex(DOCUMENTS)
+
+    assert index.top_matches('Printer jammed', 'Office printer paper jam', threshold=0.01) == []
+
+
+def test_batch_scores_every_query_in_one_matrix():
+    """Test batch scoring returns a (queries x incidents) matrix."""
+    index = TfidfIndex(DOCUMENTS)
+
+    scores = index.score_batch(
+        ['Login timeout', 'Transfer rejected'],
+        ['Authentication times out for clients', 'Custodian rejected outbound transfer']
+    )
+
+    assert scores.shape == (2, 3)
+    assert scores[0].toarray().argmax() == 0
+    assert scores[1].toarray().argmax() == 2
+
+
+def test_title_and_description_weighting():
+    """Test a title-only match contributes at most the title weight."""
+    index = TfidfIndex(DOCUMENTS)
+
+    matches = index.top_matches('Balance mismatch', 'Printer jammed', threshold=0.0)
+
+    assert matches[0][0] == 2
+    assert matches[0][1] == pytest.approx(TfidfIndex.TITLE_WEIGHT)
+
+
+def test_empty_index_returns_no_matches():
+    """Test an index with no documents returns empty results."""
+    index = TfidfIndex([])
+
+    assert index.top_matches_batch(['a', 'b'], ['c', 'd']) == [[], []]
+
+
+def test_tfidf_backend_finds_sample_incident(app, sample_incident):
+    """Test the TF-IDF backend finds the sample incident via DuplicateDetector."""
+    result = DuplicateDetector.check_for_duplicates(
+        title='Test incident for unit testing',
+        description='This is a test incident created for automated testing purposes.',
+        platform='Additiv',
+        threshold=0.75,
+        backend='tfidf'
+    )
+
+    assert result['is_duplicate'] is True
+    assert result['similar_incidents'][0][0].title == 'Test incident for unit testing'
+
+
+def test_find_similar_batch_one_result_per_query(app, sample_incident):
+    """Test batch detection returns one result list per query."""
+    results = DuplicateDetector.find_similar_batch(
+        [
+            ('Test incident for unit testing', 'Test incident created for automated testing'),
+            ('Unrelated printer problem', 'Office printer paper jam'),
+        ],
+        platform='Additiv',
+        threshold=0.5
+    )
+
+    assert len(results) == 2
+    assert len(results[0]) == 1
+    assert results[1] == []
@@ -0,0 +1,103 @@
+"""
+Test the inverted token index used for duplicate candidate retrieval.
+Validates index maintenance on create, edit, resolve and delete.
+"""
+
+from app import db
+from app.models.incident import Incident
+from app.models.incident_token import IncidentToken
+from app.utils.duplicate_detector import DuplicateDetector
+from app.utils.token_index import TokenIndex
+
+
+def indexed_tokens(incident_id):
+    """Return the set of tokens indexed for an incident."""
+    return {
+        posting.token
+        for posting in IncidentToken.query.filter_by(incident_id=incident_id).all()
+    }
+
+
+def test_new_incident_is_indexed(incident_factory):
+    """Test creating an incident writes its title and description tokens."""
+    incident = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+
+    assert indexed_tokens(incident.id) == {'portfolio', 'valuation', 'stale', 'job', 'stuck', 'overnight'}
+
+
+def test_edit_reindexes_changed_text(incident_factory):
+    """Test editing the text replaces stale postings."""
+    incident = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+
+    incident.description = 'Statement generation delayed'
+    db.session.commit()
+
+    tokens = indexed_tokens(incident.id)
+    assert 'statement' in tokens
+    assert 'overnight' not in tokens
+    assert 'portfolio' in tokens
+
+
+def test_resolve_removes_incident_from_index(incident_factory):
+    """Test incidents leaving Open status are no longer candidates."""
+    incident = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+
+    incident.status = 'Resolved'
+    db.session.commit()
+
+    assert indexed_tokens(incident.id) == set()
+
+
+def test_delete_removes_postings(incident_factory):
+    """Test deleting an incident deletes its postings."""
+    incident = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+    incident_id = incident.id
+
+    db.session.delete(incident)
+    db.session.commit()
+
+    assert indexed_tokens(incident_id) == set()
+
+
+def test_candidates_filtered_by_platform(incident_factory):
+    """Test candidate lookup only returns incidents on the requested platform."""
+    additiv = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+    avaloq = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Avaloq')
+
+    candidates = TokenIndex.candidate_ids({'valuation'}, 'Avaloq')
+
+    assert avaloq.id in candidates
+    assert additiv.id not in candidates
+
+
+def test_rebuild_restores_postings(incident_factory):
+    """Test a full rebuild recreates postings for every open incident."""
+    incident = incident_factory('Portfolio valuation stale', 'Valuation job stuck overnight', platform='Additiv')
+    db.session.execute(IncidentToken.__table__.delete())
+    db.session.commit()
+
+    indexed = TokenIndex.rebuild()
+
+    assert indexed == Incident.query.filter_by(status='Open').count()
+    assert 'valuation' in indexed_tokens(incident.id)
+
+
+def test_duplicates_found_beyond_recent_window(incident_factory):
+    """Test an old duplicate is still found behind more than 50 newer incidents."""
+    original = incident_factory(
+        'Quarterly statement PDF download broken',
+        'Quarterly statement PDF download returns blank page for clients',
+        platform='Additiv'
+    )
+    for i in range(60):
+        incident_factory(f'Unrelated incident number {i}', f'Filler description number {i} for padding',
+                         platform='Additiv')
+
+    result = DuplicateDetector.check_for_duplicates(
+        title='Quarterly statement PDF download broken',
+        description='Quarterly statement PDF download returns blank page for clients',
+        platform='Additiv',
+        threshold=0.75
+    )
+
+    assert original.id in [incident.id for incident, _ in result['similar_incidents']]